@@ -0,0 +1,28 @@
+"""Add time entry check_in indexes
+
+Revision ID: 5f2c8e1a9d40
+Revises: 35492a576030
+Create Date: 2026-10-18 09:12:44.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f2c8e1a9d40'
+down_revision: Union[str, None] = '35492a576030'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_time_entries_employee_id_check_in', 'time_entries', ['employee_id', 'check_in'], unique=False)
+    op.create_index('ix_time_entries_check_in', 'time_entries', ['check_in'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_time_entries_check_in', table_name='time_entries')
+    op.drop_index('ix_time_entries_employee_id_check_in', table_name='time_entries')
@@ -0,0 +1,29 @@
+"""Add dedup_key to warnings
+
+Revision ID: a6c4e9d27f80
+Revises: f1b3e8a05c62
+Create Date: 2026-10-18 19:02:44.187320
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6c4e9d27f80'
+down_revision: Union[str, None] = 'f1b3e8a05c62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Bestehende Warnungen behalten NULL - der Index lässt beliebig viele NULL zu
+    op.add_column('warnings', sa.Column('dedup_key', sa.String(), nullable=True))
+    op.create_index('ix_warnings_dedup_key', 'warnings', ['dedup_key'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_warnings_dedup_key', table_name='warnings')
+    op.drop_column('warnings', 'dedup_key')
@@ -0,0 +1,43 @@
+"""Add job_runs for the embedded job scheduler
+
+Revision ID: b2d7f5a14e93
+Revises: a6c4e9d27f80
+Create Date: 2026-10-18 19:41:09.652318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2d7f5a14e93'
+down_revision: Union[str, None] = 'a6c4e9d27f80'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'job_runs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('job_name', sa.String(), nullable=False),
+        sa.Column('scheduled_for', sa.DateTime(), nullable=False),
+        sa.Column('trigger', sa.String(), nullable=True),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('duration_ms', sa.Float(), nullable=True),
+        sa.Column('result', sa.Text(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'uq_job_runs_job_name_scheduled_for', 'job_runs', ['job_name', 'scheduled_for'], unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_job_runs_job_name_scheduled_for', table_name='job_runs')
+    op.drop_table('job_runs')
@@ -0,0 +1,75 @@
+"""Add unique partial index for open time entries
+
+Revision ID: b7e41d03c6a2
+Revises: 5f2c8e1a9d40
+Create Date: 2026-10-18 10:03:27.551093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e41d03c6a2'
+down_revision: Union[str, None] = '5f2c8e1a9d40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Doppelte offene Stempelungen schließen, bevor der Unique-Index greift:
+    # offen bleibt die mit dem spätesten Check-in (nicht die höchste id -
+    # Einträge mit now()/utcnow()/manuell nachgetragen sind nicht nach id
+    # sortiert). Die übrigen enden beim nächsten späteren Check-in eines
+    # offenen Eintrags; gibt es keinen (gleicher Check-in), bei ihrem eigenen
+    # Check-in - Dauer 0, nie negativ.
+    op.execute("""
+        UPDATE time_entries t
+        SET check_out = COALESCE(
+                (
+                    SELECT MIN(n.check_in)
+                    FROM time_entries n
+                    WHERE n.employee_id = t.employee_id
+                      AND n.check_out IS NULL
+                      AND n.check_in > t.check_in
+                ),
+                t.check_in
+            ),
+            notes = COALESCE(t.notes || ' ', '') || '[Doppelte Stempelung geschlossen]'
+        WHERE t.check_out IS NULL
+          AND t.check_in IS NOT NULL
+          AND EXISTS (
+                SELECT 1
+                FROM time_entries n
+                WHERE n.employee_id = t.employee_id
+                  AND n.check_out IS NULL
+                  AND (n.check_in, n.id) > (t.check_in, t.id)
+            )
+    """)
+    # Offene Einträge ohne Check-in (Altdaten) neben einem anderen offenen Eintrag
+    op.execute("""
+        UPDATE time_entries t
+        SET check_out = COALESCE(t.created_at, now()),
+            notes = COALESCE(t.notes || ' ', '') || '[Doppelte Stempelung geschlossen]'
+        WHERE t.check_out IS NULL
+          AND t.check_in IS NULL
+          AND EXISTS (
+                SELECT 1
+                FROM time_entries n
+                WHERE n.employee_id = t.employee_id
+                  AND n.check_out IS NULL
+                  AND n.id <> t.id
+                  AND (n.check_in IS NOT NULL OR n.id > t.id)
+            )
+    """)
+    op.create_index(
+        'uq_time_entries_open_employee', 'time_entries', ['employee_id'],
+        unique=True,
+        postgresql_where=sa.text('check_out IS NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_time_entries_open_employee', table_name='time_entries')
@@ -0,0 +1,64 @@
+"""Add daily_employee_hours rollup table
+
+Revision ID: c3d9a5f71e28
+Revises: b7e41d03c6a2
+Create Date: 2026-10-18 15:20:11.804512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d9a5f71e28'
+down_revision: Union[str, None] = 'b7e41d03c6a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'daily_employee_hours',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('employee_id', sa.Integer(), nullable=False),
+        sa.Column('object_id', sa.Integer(), nullable=True),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('service_type', sa.String(), nullable=True),
+        sa.Column('minutes', sa.Float(), nullable=True),
+        sa.Column('amount', sa.Float(), nullable=True),
+        sa.Column('entries', sa.Integer(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], ),
+        sa.ForeignKeyConstraint(['object_id'], ['objects.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'uq_daily_employee_hours_key', 'daily_employee_hours',
+        ['employee_id', 'date', 'object_id', 'service_type'],
+        unique=True
+    )
+    # Erstbefüllung aus allen abgeschlossenen Stempelungen
+    # (später neu aufbauen: scripts/rebuild_rollups.py)
+    op.execute("""
+        INSERT INTO daily_employee_hours
+            (employee_id, object_id, date, service_type, minutes, amount, entries, updated_at)
+        SELECT employee_id,
+               object_id,
+               date(check_in),
+               service_type,
+               SUM(EXTRACT(EPOCH FROM (check_out - check_in))) / 60.0,
+               SUM(EXTRACT(EPOCH FROM (check_out - check_in)) * COALESCE(hourly_rate, 0)) / 3600.0,
+               COUNT(*),
+               now()
+        FROM time_entries
+        WHERE check_out IS NOT NULL
+          AND employee_id IS NOT NULL
+        GROUP BY employee_id, object_id, date(check_in), service_type
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('uq_daily_employee_hours_key', table_name='daily_employee_hours')
+    op.drop_table('daily_employee_hours')
@@ -0,0 +1,54 @@
+"""Make the daily_employee_hours key unique for NULL object/service type
+
+Revision ID: c8e2f4a91d36
+Revises: b2d7f5a14e93
+Create Date: 2026-10-19 09:12:40.218734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8e2f4a91d36'
+down_revision: Union[str, None] = 'b2d7f5a14e93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Durch parallele Neuberechnungen doppelt angelegte Zeilen: neu aufbauen
+    op.execute("DELETE FROM daily_employee_hours")
+    op.execute("""
+        INSERT INTO daily_employee_hours
+            (employee_id, object_id, date, service_type, minutes, amount, entries, updated_at)
+        SELECT employee_id,
+               object_id,
+               date(check_in),
+               service_type,
+               SUM(EXTRACT(EPOCH FROM (check_out - check_in))) / 60.0,
+               SUM(EXTRACT(EPOCH FROM (check_out - check_in)) * COALESCE(hourly_rate, 0)) / 3600.0,
+               COUNT(*),
+               now()
+        FROM time_entries
+        WHERE check_out IS NOT NULL
+          AND employee_id IS NOT NULL
+        GROUP BY employee_id, object_id, date(check_in), service_type
+    """)
+    op.drop_index('uq_daily_employee_hours_key', table_name='daily_employee_hours')
+    op.create_index(
+        'uq_daily_employee_hours_key', 'daily_employee_hours',
+        ['employee_id', 'date', sa.text('COALESCE(object_id, 0)'), sa.text("COALESCE(service_type, '')")],
+        unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_daily_employee_hours_key', table_name='daily_employee_hours')
+    op.create_index(
+        'uq_daily_employee_hours_key', 'daily_employee_hours',
+        ['employee_id', 'date', 'object_id', 'service_type'],
+        unique=True
+    )
@@ -0,0 +1,33 @@
+"""Add status and replacement_for to schedules
+
+Revision ID: d8f2b6c40a17
+Revises: c3d9a5f71e28
+Create Date: 2026-10-18 15:41:52.117390
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8f2b6c40a17'
+down_revision: Union[str, None] = 'c3d9a5f71e28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # IF NOT EXISTS: auf bestehenden Installationen können die Spalten schon von Hand angelegt sein
+    op.execute("ALTER TABLE schedules ADD COLUMN IF NOT EXISTS status VARCHAR DEFAULT 'normal'")
+    op.execute(
+        "ALTER TABLE schedules ADD COLUMN IF NOT EXISTS replacement_for INTEGER "
+        "REFERENCES employees (id)"
+    )
+    op.execute("UPDATE schedules SET status = 'normal' WHERE status IS NULL")
+
+
+def downgrade() -> None:
+    op.drop_column('schedules', 'replacement_for')
+    op.drop_column('schedules', 'status')
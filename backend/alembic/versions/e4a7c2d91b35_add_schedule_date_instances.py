@@ -0,0 +1,47 @@
+"""Add date to schedules for dated shift instances
+
+Revision ID: e4a7c2d91b35
+Revises: d8f2b6c40a17
+Create Date: 2026-10-18 17:12:08.443107
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a7c2d91b35'
+down_revision: Union[str, None] = 'd8f2b6c40a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # quick_booking hat schedules.date schon abgefragt - evtl. von Hand angelegt
+    op.execute("ALTER TABLE schedules ADD COLUMN IF NOT EXISTS date DATE")
+    # Doppelte datierte Schichten entfernen, bevor der Unique-Index greift
+    op.execute("""
+        DELETE FROM schedules s
+        USING schedules d
+        WHERE s.date IS NOT NULL
+          AND d.date = s.date
+          AND d.employee_id = s.employee_id
+          AND d.object_id = s.object_id
+          AND d.start_time = s.start_time
+          AND d.id < s.id
+    """)
+    op.create_index('ix_schedules_date_employee_id', 'schedules', ['date', 'employee_id'])
+    op.create_index(
+        'uq_schedules_instance', 'schedules',
+        ['employee_id', 'object_id', 'date', 'start_time'],
+        unique=True,
+        postgresql_where=sa.text('date IS NOT NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_schedules_instance', table_name='schedules')
+    op.drop_index('ix_schedules_date_employee_id', table_name='schedules')
+    op.drop_column('schedules', 'date')
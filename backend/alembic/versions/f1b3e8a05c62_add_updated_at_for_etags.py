@@ -0,0 +1,32 @@
+"""Add updated_at to schedules, employees, objects and customers
+
+Revision ID: f1b3e8a05c62
+Revises: e4a7c2d91b35
+Create Date: 2026-10-18 18:03:27.510944
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1b3e8a05c62'
+down_revision: Union[str, None] = 'e4a7c2d91b35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('schedules', 'employees', 'objects', 'customers')
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(), nullable=True))
+        # Die App schreibt UTC (datetime.utcnow) - Bestand ebenso
+        op.execute(f"UPDATE {table} SET updated_at = timezone('utc', now())")
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.drop_column(table, 'updated_at')
@@ -1,20 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException, Header, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import and_, or_
 from datetime import date, datetime, timedelta, time
 from typing import List, Optional
-from jose import jwt
-from app.db.database import get_db
-from app.models.models import User, Employee, TimeEntry, Schedule, Object, Customer
-import os
+from app.db.database import get_db, SessionLocal
+from app.models.models import User, Employee, Schedule, Object, Customer, JobRun
+import json
 from dotenv import load_dotenv
 from app.api.v1.endpoints.auth import get_current_user
 from collections import defaultdict
 from app.api.v1.endpoints.auth import get_password_hash
+from app.core.schedule_service import (
+    bulk_upsert_schedules, copy_weeks, normalize_schedule, realized_shifts, week_start,
+    ScheduleValidationError
+)
+from app.core.schedule_conflicts import find_conflicts, make_shift, validate_shift
+from app.core.etag import make_etag, table_fingerprint, etag_matches, not_modified, set_etag
+from app.core.live_status import live_status
+from app.core.geofence import geofence
+from app.core.deps import user_from_token
+from app.core.security import create_stream_token, STREAM_TOKEN_EXPIRE_SECONDS
+from app.core.scheduler import scheduler
+from app.core.auto_checkout import auto_checkout
+from app.core.import_service import ImportValidationError, import_objects, import_schedules, read_rows
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 
 load_dotenv()
 router = APIRouter()
 
+LIVE_STREAM_SCOPE = "live-status"
+
 # Weekday Mappings für Integer-basierte Speicherung
 WEEKDAY_MAP = {
     'Montag': 0,
@@ -36,43 +52,60 @@ WEEKDAY_NAMES = {
     6: 'Sonntag'
 }
 
-def verify_admin(authorization: str = Header(None), db: Session = Depends(get_db)):
-    if not authorization:
-        raise HTTPException(status_code=401)
-    token = authorization.split(" ")[1]
-    payload = jwt.decode(token, os.getenv("SECRET_KEY"), algorithms=["HS256"])
-    user = db.query(User).filter(User.email == payload.get("sub")).first()
-    if user.role != "admin":
+def verify_admin(current_user: User = Depends(get_current_user)):
+    if current_user.role != "admin":
         raise HTTPException(status_code=403)
-    return user
+    return current_user
 
 @router.get("/dashboard/stats")
 def get_stats(db: Session = Depends(get_db), admin = Depends(verify_admin)):
-    total = db.query(Employee).join(User).filter(User.role != "admin").count()
-    active = db.query(TimeEntry).filter(
-        TimeEntry.check_out == None,
-        func.date(TimeEntry.check_in) == date.today()
-    ).count()
-    
-    today_seconds = db.query(
-        func.sum(
-            func.extract('epoch', func.coalesce(TimeEntry.check_out, func.now()) - TimeEntry.check_in)
-        )
-    ).filter(
-        func.date(TimeEntry.check_in) == date.today()
-    ).scalar() or 0
-    
-    return {
-        "active_employees": active,
-        "paused_employees": 0,
-        "offline_employees": total - active,
-        "total_employees": total,
-        "total_hours_today": round(today_seconds / 3600, 1)
-    }
+    """Kennzahlen aus dem Live-Status im Speicher (DB nur, wenn der Stand veraltet ist)"""
+    live_status.ensure(db)
+    return live_status.stats()
 
 @router.get("/live-status")
 def get_live(db: Session = Depends(get_db), admin = Depends(verify_admin)):
-    return []
+    live_status.ensure(db)
+    return live_status.entries()
+
+@router.post("/live-status/stream-token")
+def issue_live_stream_token(admin = Depends(verify_admin)):
+    """Kurzlebiges Token für den EventSource-Stream (statt des Login-Tokens in der URL)"""
+    return {
+        "token": create_stream_token(admin.email, LIVE_STREAM_SCOPE),
+        "expires_in": STREAM_TOKEN_EXPIRE_SECONDS
+    }
+
+@router.get("/live-status/stream")
+async def stream_live_status(request: Request, token: Optional[str] = Query(None)):
+    """Live-Status als Server-Sent Events: "snapshot", danach "update" mit Diffs
+
+    EventSource kann keine Header setzen - daher ?token=... mit einem Token
+    von /live-status/stream-token, oder wie sonst per Authorization-Header.
+    """
+    scope = LIVE_STREAM_SCOPE
+    if not token:
+        auth = request.headers.get("authorization", "")
+        token = auth[7:] if auth.lower().startswith("bearer ") else None
+        scope = None
+    
+    def prepare():
+        # Eigene kurze Session: die Verbindung bleibt sonst für die Dauer des Streams belegt
+        db = SessionLocal()
+        try:
+            user = user_from_token(db, token, scope)
+            if user.role != "admin":
+                raise HTTPException(status_code=403)
+            live_status.ensure(db)
+        finally:
+            db.close()
+    
+    await run_in_threadpool(prepare)
+    return StreamingResponse(
+        live_status.stream(request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @router.get("/employees-with-categories")
 def get_employees_with_categories(db: Session = Depends(get_db), admin = Depends(verify_admin)):
@@ -166,16 +199,29 @@ def update_employee(employee_id: int, data: dict, db: Session = Depends(get_db),
     return {"status": "ok", "message": "Mitarbeiter aktualisiert"}
 
 @router.get("/schedules")
-def get_all_schedules(db: Session = Depends(get_db), admin = Depends(verify_admin)):
-    schedules = db.query(Schedule).all()
+def get_all_schedules(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    admin = Depends(verify_admin)
+):
+    etag = make_etag(table_fingerprint(db, Schedule, Employee, Object))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    # Nur Wochenvorlagen - datierte Schichten liefert /schedules/week pro Woche
+    schedules = db.query(Schedule).options(
+        joinedload(Schedule.employee),
+        joinedload(Schedule.object)
+    ).filter(Schedule.date == None).all()
     result = []
     for s in schedules:
         emp = s.employee
-        obj = db.query(Object).filter(Object.id == s.object_id).first()
+        obj = s.object
         result.append({
             "id": s.id,
             "employee_id": s.employee_id,
-            "employee_name": f"{emp.first_name} {emp.last_name}",
+            "employee_name": f"{emp.first_name} {emp.last_name}" if emp else f"Mitarbeiter {s.employee_id}",
             "object_id": s.object_id,
             "object_name": obj.name if obj else f"Objekt {s.object_id}",
             "weekday": s.weekday,
@@ -183,6 +229,7 @@ def get_all_schedules(db: Session = Depends(get_db), admin = Depends(verify_admi
             "end_time": s.end_time.strftime("%H:%M") if s.end_time else "",
             "planned_hours": s.planned_hours
         })
+    set_etag(response, etag)
     return result
 
 @router.post("/schedules")
@@ -246,18 +293,33 @@ def delete_schedule(schedule_id: int, db: Session = Depends(get_db), admin = Dep
 
 @router.get("/schedules/week")
 def get_week_schedule(
+    request: Request,
+    response: Response,
     week_offset: int = Query(0, description="Wochen-Offset (0=aktuelle Woche)"),
     db: Session = Depends(get_db),
     admin = Depends(verify_admin)
 ):
-    """Hole Dienstplan für eine komplette Woche"""
+    """Hole Dienstplan für eine komplette Woche
+
+    Vier Abfragen (Schichten, Vorlagen, Mitarbeiter, Objekte mit Kunde),
+    davor ein Fingerabdruck der Tabellen für das ETag - unverändert: 304.
+    """
     today = date.today()
     start_of_week = today - timedelta(days=today.weekday())
     start_of_week += timedelta(weeks=week_offset)
     
-    schedules = db.query(Schedule).all()
-    employees = db.query(Employee).filter(Employee.personal_nr != 'A0001').all()
-    objects = db.query(Object).all()
+    etag = make_etag(table_fingerprint(db, Schedule, Employee, Object, Customer), start_of_week)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    shifts = realized_shifts(db, start_of_week, start_of_week + timedelta(days=6))
+    employees_by_id = {emp.id: emp for emp in db.query(Employee).all()}
+    objects = db.query(Object).options(joinedload(Object.customer)).all()
+    objects_by_id = {obj.id: obj for obj in objects}
+    
+    shifts_by_day = defaultdict(list)
+    for day, schedule in shifts:
+        shifts_by_day[day].append(schedule)
     
     week_data = {
         'week_start': start_of_week.isoformat(),
@@ -270,7 +332,7 @@ def get_week_schedule(
                 'name': f"{emp.first_name} {emp.last_name}",
                 'personal_nr': emp.personal_nr,
                 'category': getattr(emp, 'tracking_mode', 'C')
-            } for emp in employees
+            } for emp in employees_by_id.values() if emp.personal_nr != 'A0001'
         ],
         'objects': [
             {
@@ -286,7 +348,6 @@ def get_week_schedule(
     for i in range(7):
         current_date = start_of_week + timedelta(days=i)
         day_name = WEEKDAY_NAMES[i]
-        day_schedules = [s for s in schedules if s.weekday == i]
         
         day_data = {
             'date': current_date.isoformat(),
@@ -295,25 +356,27 @@ def get_week_schedule(
             'schedules': []
         }
         
-        for schedule in day_schedules:
-            emp = schedule.employee
-            obj = db.query(Object).filter(Object.id == schedule.object_id).first()
+        for schedule in shifts_by_day[current_date]:
+            emp = employees_by_id.get(schedule.employee_id)
+            obj = objects_by_id.get(schedule.object_id)
             
             day_data['schedules'].append({
                 'id': schedule.id,
                 'employee_id': schedule.employee_id,
-                'employee_name': f"{emp.first_name} {emp.last_name}",
+                'employee_name': f"{emp.first_name} {emp.last_name}" if emp else f"Mitarbeiter {schedule.employee_id}",
                 'object_id': schedule.object_id,
                 'object_name': obj.name if obj else f"Objekt {schedule.object_id}",
                 'start_time': schedule.start_time.strftime("%H:%M") if schedule.start_time else "06:00",
                 'end_time': schedule.end_time.strftime("%H:%M") if schedule.end_time else "14:00",
                 'planned_hours': schedule.planned_hours,
+                'date': schedule.date.isoformat() if schedule.date else None,
                 'status': getattr(schedule, 'status', 'normal'),
                 'replacement_for': getattr(schedule, 'replacement_for', None)
             })
         
         week_data['days'].append(day_data)
     
+    set_etag(response, etag)
     return week_data
 
 @router.post("/schedules/bulk-update")
@@ -322,48 +385,18 @@ def bulk_update_schedules(
     db: Session = Depends(get_db),
     admin = Depends(verify_admin)
 ):
-    """Mehrere Schichten auf einmal aktualisieren"""
-    results = []
-    
-    for update in updates:
-        schedule_id = update.get('id')
-        
-        if schedule_id:
-            schedule = db.query(Schedule).filter(Schedule.id == schedule_id).first()
-            if not schedule:
-                results.append({'id': schedule_id, 'status': 'not_found'})
-                continue
-        else:
-            schedule = Schedule()
-            db.add(schedule)
-        
-        if 'employee_id' in update:
-            schedule.employee_id = update['employee_id']
-        if 'object_id' in update:
-            schedule.object_id = update['object_id']
-        if 'weekday' in update:
-            weekday = update['weekday']
-            if isinstance(weekday, str):
-                schedule.weekday = WEEKDAY_MAP.get(weekday, 0)
-            else:
-                schedule.weekday = weekday
-        if 'start_time' in update:
-            parts = update['start_time'].split(':')
-            schedule.start_time = time(int(parts[0]), int(parts[1]))
-        if 'end_time' in update:
-            parts = update['end_time'].split(':')
-            schedule.end_time = time(int(end_parts[0]), int(end_parts[1]))
-        if 'planned_hours' in update:
-            schedule.planned_hours = update['planned_hours']
-        if 'status' in update:
-            schedule.status = update['status']
-        if 'replacement_for' in update:
-            schedule.replacement_for = update['replacement_for']
-        
-        results.append({'id': schedule.id, 'status': 'updated'})
+    """Mehrere Schichten auf einmal anlegen/aktualisieren (ein Transaktion, wenige Roundtrips)
+
+    Elemente mit id werden aktualisiert, ohne id neu angelegt.
+    Ergebnis pro Element in derselben Reihenfolge wie der Payload.
+    """
+    try:
+        outcome = bulk_upsert_schedules(db, updates)
+    except ScheduleValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     db.commit()
-    return {'status': 'ok', 'results': results}
+    return {'status': 'ok', 'results': outcome['results'], 'counts': outcome['counts']}
 
 @router.post("/schedules/copy-week")
 def copy_week_schedule(
@@ -371,46 +404,49 @@ def copy_week_schedule(
     db: Session = Depends(get_db),
     admin = Depends(verify_admin)
 ):
-    """Kopiere Dienstplan von einer Woche in eine andere"""
+    """Kopiere Dienstplan von einer Woche in eine (oder mehrere) andere
+
+    Optional: weeks (Blocklänge), every (Abstand in Wochen, z.B. 2 für
+    vierzehntägig) und repeat oder until (letzte Zielwoche).
+    """
     source_week = data.get('source_week')
     target_week = data.get('target_week')
     
     if not source_week or not target_week:
         raise HTTPException(status_code=400, detail="source_week und target_week erforderlich")
     
-    source_date = datetime.fromisoformat(source_week).date()
-    target_date = datetime.fromisoformat(target_week).date()
-    
-    schedules = db.query(Schedule).all()
-    copied_count = 0
-    
-    for schedule in schedules:
-        existing = db.query(Schedule).filter(
-            and_(
-                Schedule.employee_id == schedule.employee_id,
-                Schedule.object_id == schedule.object_id,
-                Schedule.weekday == schedule.weekday
-            )
-        ).first()
-        
-        if not existing:
-            new_schedule = Schedule(
-                employee_id=schedule.employee_id,
-                object_id=schedule.object_id,
-                weekday=schedule.weekday,
-                start_time=schedule.start_time,
-                end_time=schedule.end_time,
-                planned_hours=schedule.planned_hours,
-                status='normal'
-            )
-            db.add(new_schedule)
-            copied_count += 1
+    try:
+        # Frontend schickt ISO-Zeitstempel, nur der Tag zählt
+        source_date = date.fromisoformat(str(source_week)[:10])
+        target_date = date.fromisoformat(str(target_week)[:10])
+        until = date.fromisoformat(str(data['until'])[:10]) if data.get('until') else None
+        weeks = int(data.get('weeks') or 1)
+        every = int(data.get('every') or weeks)
+        repeat = int(data.get('repeat') or 1)
+        employee_ids = [int(e) for e in data['employee_ids']] if data.get('employee_ids') else None
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Ungültige Angaben zum Kopieren")
+    
+    if until:
+        span = (week_start(until) - week_start(target_date)).days // 7
+        if span < 0:
+            raise HTTPException(status_code=400, detail="until liegt vor target_week")
+        repeat = span // every + 1
+    
+    try:
+        copied_count = copy_weeks(db, source_date, target_date, weeks, repeat, every, employee_ids)
+    except ScheduleValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     db.commit()
     
     return {
         'status': 'ok',
         'copied_count': copied_count,
+        'target_weeks': [
+            (week_start(target_date) + timedelta(weeks=r * every + w)).isoformat()
+            for r in range(repeat) for w in range(weeks)
+        ],
         'message': f'{copied_count} Schichten kopiert'
     }
 
@@ -435,6 +471,7 @@ def create_replacement(
         employee_id=replacement_employee_id,
         object_id=original.object_id,
         weekday=original.weekday,
+        date=original.date,
         start_time=original.start_time,
         end_time=original.end_time,
         planned_hours=original.planned_hours,
@@ -481,7 +518,8 @@ def quick_assign_schedule(
         and_(
             Schedule.employee_id == employee_id,
             Schedule.object_id == object_id,
-            Schedule.weekday == weekday
+            Schedule.weekday == weekday,
+            Schedule.date == None  # nur die Wochenvorlage, keine datierte Schicht
         )
     ).first()
     
@@ -509,47 +547,173 @@ def quick_assign_schedule(
 
 @router.get("/schedules/conflicts")
 def check_schedule_conflicts(
+    request: Request,
+    response: Response,
     week_offset: int = Query(0),
     db: Session = Depends(get_db),
     admin = Depends(verify_admin)
 ):
-    """Prüfe auf Konflikte im Dienstplan"""
-    conflicts = []
-    schedules = db.query(Schedule).all()
+    """Prüfe auf Konflikte im Dienstplan (Überschneidungen und zu knappe Fahrzeiten)"""
+    start_of_week = week_start(date.today()) + timedelta(weeks=week_offset)
     
-    employee_schedules = defaultdict(list)
+    etag = make_etag(table_fingerprint(db, Schedule, Employee, Object), start_of_week)
+    if etag_matches(request, etag):
+        return not_modified(etag)
     
-    for schedule in schedules:
-        key = f"{schedule.employee_id}_{schedule.weekday}"
-        employee_schedules[key].append(schedule)
+    conflicts = find_conflicts(db, start_of_week, start_of_week + timedelta(days=6))
     
-    for key, schichten in employee_schedules.items():
-        if len(schichten) > 1:
-            schichten.sort(key=lambda s: s.start_time or time(0, 0))
-            
-            for i in range(len(schichten) - 1):
-                current = schichten[i]
-                next_shift = schichten[i + 1]
-                
-                if current.end_time and next_shift.start_time:
-                    if current.end_time > next_shift.start_time:
-                        emp = current.employee
-                        conflicts.append({
-                            'type': 'zeitüberschneidung',
-                            'employee': f"{emp.first_name} {emp.last_name}",
-                            'weekday': WEEKDAY_NAMES.get(current.weekday, str(current.weekday)),
-                            'shift1': {
-                                'object': current.object_id,
-                                'time': f"{current.start_time.strftime('%H:%M')}-{current.end_time.strftime('%H:%M')}"
-                            },
-                            'shift2': {
-                                'object': next_shift.object_id,
-                                'time': f"{next_shift.start_time.strftime('%H:%M')}-{next_shift.end_time.strftime('%H:%M')}"
-                            }
-                        })
+    set_etag(response, etag)
+    return {
+        'status': 'ok',
+        'conflict_count': len(conflicts),
+        'conflicts': conflicts
+    }
+
+@router.post("/schedules/validate")
+def validate_schedule_shift(
+    data: dict,
+    db: Session = Depends(get_db),
+    admin = Depends(verify_admin)
+):
+    """Eine Schicht vor dem Speichern prüfen (nur Vortag/Tag/Folgetag des Mitarbeiters)
+
+    Felder wie bei bulk-update plus date; mit id werden fehlende Felder
+    aus der gespeicherten Schicht übernommen.
+    """
+    existing = None
+    if data.get('id'):
+        existing = db.query(Schedule).filter(Schedule.id == data['id']).first()
+        if not existing:
+            raise HTTPException(status_code=404, detail="Schicht nicht gefunden")
+    
+    try:
+        values = normalize_schedule(data)
+        day = date.fromisoformat(str(data['date'])[:10]) if data.get('date') else (existing.date if existing else None)
+    except ScheduleValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Ungültiges Datum")
+    if day is None:
+        raise HTTPException(status_code=400, detail="date erforderlich")
+    
+    def field(name):
+        return values[name] if name in values else getattr(existing, name, None)
+    
+    candidate = make_shift(
+        existing.id if existing else None, field('employee_id'), field('object_id'),
+        day, field('start_time'), field('end_time')
+    )
+    if candidate is None:
+        raise HTTPException(status_code=400, detail="employee_id, start_time und end_time erforderlich")
     
+    conflicts = validate_shift(db, candidate)
     return {
         'status': 'ok',
+        'valid': not conflicts,
         'conflict_count': len(conflicts),
         'conflicts': conflicts
-    }
\ No newline at end of file
+    }
+
+@router.post("/import/schedules")
+def import_schedule_file(
+    file: UploadFile = File(...),
+    replace: bool = False,
+    dry_run: bool = True,
+    db: Session = Depends(get_db),
+    admin = Depends(verify_admin)
+):
+    """Dienstplan aus CSV/XLSX importieren - standardmäßig nur Vorschau (Diff)
+
+    Spalten: Mitarbeiter (E-Mail oder Personalnummer), Objekt (Name),
+    Wochentag oder Datum, Beginn, Ende, optional Sollstunden und Status.
+    Mit dry_run=false wird nur geschrieben, wenn keine Zeile fehlerhaft ist.
+    """
+    try:
+        result = import_schedules(db, read_rows(file.file, file.filename or ''), replace=replace, dry_run=dry_run)
+    except (ImportValidationError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=400, detail=f"Datei ungültig: {e}")
+    if result['applied']:
+        db.commit()
+    return result
+
+@router.post("/import/objects")
+def import_object_file(
+    file: UploadFile = File(...),
+    dry_run: bool = True,
+    db: Session = Depends(get_db),
+    admin = Depends(verify_admin)
+):
+    """Kunden und Objekte aus CSV/XLSX importieren - standardmäßig nur Vorschau (Diff)
+
+    Spalten: Kunde, Objekt, optional Adresse, Lat, Lng, Radius, Reinigungsart.
+    """
+    try:
+        result = import_objects(db, read_rows(file.file, file.filename or ''), dry_run=dry_run)
+    except (ImportValidationError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=400, detail=f"Datei ungültig: {e}")
+    if result['applied']:
+        db.commit()
+        # Core-INSERT/UPDATE lösen keine Mapper-Events aus
+        geofence.invalidate()
+        live_status.invalidate()
+    return result
+
+@router.post("/auto-checkout")
+def run_auto_checkout(
+    dry_run: bool = True,
+    db: Session = Depends(get_db),
+    admin = Depends(verify_admin)
+):
+    """Vergessene Ausstempelungen schließen - standardmäßig nur Vorschau
+
+    Mit dry_run=false wird der Plan ausgeführt (wie der Job um 23:59).
+    """
+    entries = auto_checkout(db, dry_run=dry_run)
+    return {
+        'dry_run': dry_run,
+        'count': len(entries),
+        'entries': [{key: value for key, value in item.items() if key != 'notes'} for item in entries]
+    }
+
+@router.get("/jobs")
+def list_jobs(admin = Depends(verify_admin)):
+    """Registrierte Jobs mit Zeitplan, nächstem Lauf und Laufzeiten seit dem Start"""
+    return scheduler.info()
+
+@router.get("/jobs/runs")
+def list_job_runs(
+    job: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    admin = Depends(verify_admin)
+):
+    """Letzte Läufe aus job_runs (neueste zuerst)"""
+    query = db.query(JobRun)
+    if job:
+        query = query.filter(JobRun.job_name == job)
+    if status:
+        query = query.filter(JobRun.status == status)
+    runs = query.order_by(JobRun.id.desc()).limit(limit).all()
+    return [{
+        'id': run.id,
+        'job': run.job_name,
+        'trigger': run.trigger,
+        'status': run.status,
+        'scheduled_for': run.scheduled_for,
+        'started_at': run.started_at,
+        'finished_at': run.finished_at,
+        'duration_ms': run.duration_ms,
+        'result': json.loads(run.result) if run.result else None,
+        'error': run.error
+    } for run in runs]
+
+@router.post("/jobs/{name}/run")
+async def run_job(name: str, admin = Depends(verify_admin)):
+    """Job sofort ausführen"""
+    if name not in scheduler.jobs:
+        raise HTTPException(status_code=404, detail="Job nicht gefunden")
+    run = await scheduler.run_now(name)
+    if run is None:
+        raise HTTPException(status_code=409, detail="Job läuft bereits")
+    return run
@@ -1,8 +1,7 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from jose import JWTError, jwt
+from sqlalchemy.orm import Session, joinedload
+from datetime import datetime
 import os
 from dotenv import load_dotenv
 
@@ -10,17 +9,21 @@ from dotenv import load_dotenv
 from app.db.database import get_db
 from app.models.models import User, Employee
 from app.schemas import user_schema as schemas
-from app.core.security import verify_password, get_password_hash, create_access_token, get_current_user
-from app.models.models import Schedule
+from fastapi.concurrency import run_in_threadpool
+from app.core.security import (
+    verify_password_async, dummy_verify, PasswordPoolBusy,
+    get_password_hash, create_access_token
+)
+from app.core.deps import get_current_user, get_current_employee
+from app.core.schedule_service import realized_shifts
 
 # Lade Umgebungsvariablen
 load_dotenv()
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM")
 
-# Definiere Router und Security Scheme
+# Definiere Router
 router = APIRouter()
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 @router.post("/register", response_model=schemas.UserResponse)
 def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
@@ -35,68 +38,71 @@ def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
     db.refresh(db_user)
     return db_user
 
+def _find_login_user(db: Session, email: str):
+    return db.query(User).options(
+        joinedload(User.employee)
+    ).filter(User.email == email).first()
+
+def _store_password_hash(db: Session, user: User, new_hash: str):
+    user.password_hash = new_hash
+    db.commit()
+
 @router.post("/login", response_model=schemas.Token)
-def login(user_credentials: schemas.UserLogin, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == user_credentials.email).first()
+async def login(user_credentials: schemas.UserLogin, db: Session = Depends(get_db)):
+    # DB-Zugriffe im Threadpool, bcrypt im eigenen Pool - der Event-Loop bleibt frei
+    user = await run_in_threadpool(_find_login_user, db, user_credentials.email)
+
+    try:
+        if user and user.password_hash:
+            valid, new_hash = await verify_password_async(user_credentials.password, user.password_hash)
+        else:
+            valid, new_hash = await dummy_verify(user_credentials.password)
+    except PasswordPoolBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Zu viele Anmeldungen gleichzeitig, bitte gleich nochmal versuchen",
+            headers={"Retry-After": "2"},
+        )
 
-    if not user or not verify_password(user_credentials.password, user.password_hash):
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    employee = db.query(Employee).filter(Employee.user_id == user.id).first()
+    employee = user.employee
     access_token = create_access_token(data={"sub": user.email})
     
     user_name = f"{employee.first_name} {employee.last_name}" if employee else user.email.split('@')[0]
     personal_nr = employee.personal_nr if employee else "N/A"
+    role = user.role
+
+    # Alter Hash mit weniger Runden: transparent neu speichern
+    if new_hash:
+        await run_in_threadpool(_store_password_hash, db, user, new_hash)
 
     return {
         "access_token": access_token,
         "token_type": "bearer",
         "user_name": user_name,
         "personal_nr": personal_nr,
-        "role": user.role
+        "role": role
     }
 
-# get_current_user Funktion bleibt wie sie war
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Token ungültig",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-    
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
-        raise credentials_exception
-    
-    return user
-
 @router.get("/time-entries/my-objects-this-week")
 async def get_my_scheduled_objects_this_week(
     db: Session = Depends(get_db),
-# current_employee: Employee = Depends(get_current_active_employee)
+    current_employee: Employee = Depends(get_current_employee)
 ):
     """
     Gibt alle geplanten Objekte für den aktuellen Mitarbeiter für den aktuellen Wochentag zurück.
     """
-    # Aktueller Wochentag (Montag=0, ... Sonntag=6)
-    today_weekday = datetime.now().weekday()
-
-    schedules = db.query(Schedule).filter(
-        Schedule.employee_id == current_employee.id,
-        Schedule.weekday == today_weekday
-    ).all()
+    # Vorlage bzw. datierte Schicht von heute
+    today = datetime.now().date()
+    schedules = [
+        s for _, s in realized_shifts(db, today, today, [current_employee.id])
+    ]
 
     if not schedules:
         return []
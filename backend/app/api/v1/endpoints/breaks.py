@@ -6,6 +6,8 @@ from app.db.database import get_db
 from app.models.models import BreakEntry, TimeEntry
 from app.schemas.break_schema import BreakStart, BreakEnd, BreakResponse
 from app.api.v1.endpoints.auth import get_current_user
+from app.db.repository import get_open_entry
+from app.core.events import emit, BreakStarted, BreakEnded
 
 router = APIRouter()
 
@@ -16,10 +18,7 @@ def start_break(
     current_user = Depends(get_current_user)
 ):
     # Aktive Stempelung finden
-    active_entry = db.query(TimeEntry).filter(
-        TimeEntry.employee_id == current_user.employee.id,
-        TimeEntry.check_out == None
-    ).first()
+    active_entry = get_open_entry(db, current_user.employee.id)
     
     if not active_entry:
         raise HTTPException(status_code=400, detail="Keine aktive Stempelung")
@@ -41,6 +40,8 @@ def start_break(
     )
     
     db.add(new_break)
+    db.flush()
+    emit(db, BreakStarted(active_entry.employee_id, active_entry.id, new_break.id, new_break.start_time))
     db.commit()
     db.refresh(new_break)
     
@@ -64,6 +65,10 @@ def end_break(
     # Pause beenden
     break_entry.end_time = datetime.utcnow()
     duration = (break_entry.end_time - break_entry.start_time).total_seconds() / 60
+    emit(db, BreakEnded(
+        break_entry.time_entry.employee_id, break_entry.time_entry_id, break_entry.id,
+        break_entry.start_time, break_entry.end_time
+    ))
     
     db.commit()
     db.refresh(break_entry)
@@ -86,10 +91,7 @@ def get_current_break(
     current_user = Depends(get_current_user)
 ):
     # Aktive Stempelung finden
-    active_entry = db.query(TimeEntry).filter(
-        TimeEntry.employee_id == current_user.employee.id,
-        TimeEntry.check_out == None
-    ).first()
+    active_entry = get_open_entry(db, current_user.employee.id)
     
     if not active_entry:
         return {"active_break": None}
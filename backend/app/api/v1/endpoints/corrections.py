@@ -11,6 +11,8 @@ from app.schemas.correction_schema import (
     CorrectionRequestList
 )
 from app.api.v1.endpoints.auth import get_current_user
+from app.core.rollup_service import entry_day
+from app.core.events import emit, CorrectionApproved
 
 router = APIRouter()
 
@@ -23,7 +25,7 @@ def create_correction_request(
     """Mitarbeiter erstellt Korrektur-Anfrage"""
     
     # Hole Employee-Daten
-    employee = db.query(Employee).filter(Employee.user_id == current_user.id).first()
+    employee = current_user.employee
     if not employee:
         raise HTTPException(status_code=404, detail="Mitarbeiter nicht gefunden")
     
@@ -84,7 +86,7 @@ def get_all_corrections(
     
     # Wenn nicht Admin, nur eigene anzeigen
     if current_user.role != "admin":
-        employee = db.query(Employee).filter(Employee.user_id == current_user.id).first()
+        employee = current_user.employee
         if employee:
             query = query.filter(CorrectionRequest.employee_id == employee.id)
     
@@ -155,6 +157,8 @@ def process_correction(
     # Wenn genehmigt, führe die Änderung durch
     if update.status == "approved":
         time_entry = correction.time_entry
+        # Alter und ggf. neuer Tag müssen in der Tagessumme neu gerechnet werden
+        touched_days = [entry_day(time_entry)]
         
         if correction.correction_type == "check_in":
             time_entry.check_in = datetime.fromisoformat(correction.new_value)
@@ -164,6 +168,13 @@ def process_correction(
             time_entry.object_id = int(correction.new_value)
         elif correction.correction_type == "delete":
             db.delete(time_entry)
+        
+        if correction.correction_type != "delete":
+            touched_days.append(entry_day(time_entry))
+        emit(db, CorrectionApproved(
+            correction.id, correction.employee_id, correction.time_entry_id,
+            correction.correction_type, tuple(set(touched_days))
+        ))
     
     db.commit()
     db.refresh(correction)
@@ -181,7 +192,7 @@ def get_my_corrections(
 ):
     """Mitarbeiter sieht nur eigene Korrekturen"""
     
-    employee = db.query(Employee).filter(Employee.user_id == current_user.id).first()
+    employee = current_user.employee
     if not employee:
         return []
     
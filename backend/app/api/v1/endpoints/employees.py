@@ -13,10 +13,8 @@ def get_my_category(
 ):
     """Gibt die Tracking-Kategorie des eingeloggten Mitarbeiters zurück"""
     
-    # Suche Employee über user_id
-    employee = db.query(Employee).filter(
-        Employee.user_id == current_user.id
-    ).first()
+    # Employee kommt bereits mit dem User aus get_current_user
+    employee = current_user.employee
     
     if not employee:
         # Fallback
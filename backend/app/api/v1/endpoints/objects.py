@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 import math
 from app.db.database import get_db
 from app.models.models import Object
-from app.schemas.object_schema import ObjectCreate, ObjectResponse, GPSValidation, GPSValidationResponse
-from app.models.models import Employee, Schedule, TimeEntry
+from app.schemas.object_schema import (
+    ObjectCreate, ObjectUpdate, ObjectResponse, GPSValidation, GPSValidationResponse,
+    LocateRequest, LocatedObject, LocateBatchRequest, LocateBatchItem
+)
+from app.models.models import User, Employee, Schedule, TimeEntry
+from app.core.geofence import geofence
 from datetime import datetime, timedelta
 from sqlalchemy import and_
 from app.api.v1.endpoints.auth import get_current_user
@@ -13,40 +17,56 @@ from app.api.v1.endpoints.auth import get_current_user
 
 router = APIRouter()
 
-def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    R = 6371000  # Erdradius in Metern
-    phi1 = math.radians(lat1)
-    phi2 = math.radians(lat2)
-    delta_phi = math.radians(lat2 - lat1)
-    delta_lambda = math.radians(lon2 - lon1)
-    
-    a = math.sin(delta_phi/2)**2 + math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda/2)**2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-    return R * c
-    
+def _require_admin(current_user: User):
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Nur für Admins")
+
 @router.get("/", response_model=List[ObjectResponse])
-d@router.get("/")
-def get_objects(db: Session = Depends(get_db)):
+def get_objects(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
     objects = db.query(Object).filter(Object.is_active == True).all()
     return objects
 
 @router.post("/", response_model=ObjectResponse)
-def create_object(obj: ObjectCreate, db: Session = Depends(get_db)):
+def create_object(
+    obj: ObjectCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    _require_admin(current_user)
     db_object = Object(**obj.dict())
     db.add(db_object)
     db.commit()
     db.refresh(db_object)
     return db_object
 
+@router.put("/{object_id}", response_model=ObjectResponse)
+def update_object(
+    object_id: int,
+    update: ObjectUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    _require_admin(current_user)
+    db_object = db.query(Object).filter(Object.id == object_id).first()
+    if not db_object:
+        raise HTTPException(status_code=404, detail="Objekt nicht gefunden")
+    
+    for field, value in update.dict(exclude_unset=True).items():
+        setattr(db_object, field, value)
+    db.commit()
+    db.refresh(db_object)
+    return db_object
+
 @router.get("/my-today")
 def get_my_objects_today(
     current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     # Hole Employee
-    employee = db.query(Employee).filter(
-        Employee.user_id == current_user.id
-    ).first()
+    employee = current_user.employee
     
     if not employee:
         return []
@@ -85,19 +105,75 @@ def get_my_objects_today(
     return result
 
 @router.post("/validate-gps", response_model=GPSValidationResponse)
-def validate_gps(validation: GPSValidation, db: Session = Depends(get_db)):
-    obj = db.query(Object).filter(Object.id == validation.object_id).first()
-    if not obj:
-        raise HTTPException(status_code=404, detail="Objekt nicht gefunden")
+def validate_gps(
+    validation: GPSValidation,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    result = geofence.distance_to(db, validation.object_id, validation.current_lat, validation.current_lng)
+    if not result:
+        raise HTTPException(status_code=404, detail="Objekt nicht gefunden oder ohne GPS")
     
-    distance = calculate_distance(
-        validation.current_lat, validation.current_lng,
-        obj.gps_lat, obj.gps_lng
+    return GPSValidationResponse(
+        is_valid=result["inside"],
+        distance_meters=result["distance_meters"],
+        object_name=result["name"],
+        allowed_radius=result["radius_m"]
     )
+
+@router.post("/locate", response_model=List[LocatedObject])
+def locate(
+    fix: LocateRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Nächste Objekte zu einem GPS-Punkt, mit Angabe ob innerhalb des Radius"""
+    return geofence.locate(db, fix.lat, fix.lng, fix.limit)
+
+@router.get("/nearby", response_model=List[LocatedObject])
+def nearby(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius_m: Optional[float] = Query(None, gt=0, le=50000),
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Objekte im Umkreis (Gitter-Index)
+
+    Ohne radius_m: die Objekte, in deren Geofence der Punkt liegt -
+    damit schlägt die App beim Öffnen das passende Objekt vor.
+    """
+    return geofence.nearby(db, lat, lng, radius_m, limit)
+
+@router.post("/locate-batch", response_model=List[LocateBatchItem])
+def locate_batch(
+    request: LocateBatchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Admin: viele GPS-Punkte auf einmal prüfen (z.B. alte Check-ins nachprüfen)"""
+    _require_admin(current_user)
     
-    return GPSValidationResponse(
-        is_valid=distance <= obj.radius_meters,
-        distance_meters=round(distance, 2),
-        object_name=obj.name,
-        allowed_radius=obj.radius_meters
+    with_objects = any(fix.object_id is not None for fix in request.fixes)
+    result = geofence.locate_many(
+        db,
+        [fix.lat for fix in request.fixes],
+        [fix.lng for fix in request.fixes],
+        [fix.object_id for fix in request.fixes] if with_objects else None
     )
+    
+    items = []
+    for i in range(len(request.fixes)):
+        found = result["nearest_object_id"][i] >= 0
+        item = {
+            "nearest_object_id": int(result["nearest_object_id"][i]) if found else None,
+            "nearest_distance_meters": round(float(result["nearest_distance_m"][i]), 2) if found else None,
+            "nearest_inside": bool(result["nearest_inside"][i])
+        }
+        if with_objects:
+            distance = result["object_distance_m"][i]
+            item["object_distance_meters"] = None if math.isnan(distance) else round(float(distance), 2)
+            item["object_inside"] = bool(result["object_inside"][i])
+        items.append(item)
+    return items
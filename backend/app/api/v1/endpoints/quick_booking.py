@@ -3,8 +3,10 @@ from sqlalchemy.orm import Session
 from datetime import datetime, date, time, timedelta
 import random
 from app.db.database import get_db
-from app.models.models import Employee, Schedule, TimeEntry, Object
+from app.models.models import User, Employee, Schedule, TimeEntry, Object
 from app.core.deps import get_current_user
+from app.core.events import emit, EntryBooked
+from app.core.schedule_service import realized_shifts
 
 router = APIRouter()
 
@@ -13,15 +15,13 @@ async def quick_booking(
     object_id: int,
     with_partner: bool = False,
     partner_id: int = None,
-    current_user: dict = Depends(get_current_user),
+    current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Kategorie B: War da Button - nimmt Sollstunden aus Dienstplan"""
     
     # Hole Mitarbeiter
-    employee = db.query(Employee).filter(
-        Employee.user_id == current_user["id"]
-    ).first()
+    employee = current_user.employee
     
     if not employee:
         raise HTTPException(status_code=404, detail="Mitarbeiter nicht gefunden")
@@ -32,11 +32,10 @@ async def quick_booking(
     
     # Hole heutigen Dienstplan
     today = date.today()
-    schedule = db.query(Schedule).filter(
-        Schedule.employee_id == employee.id,
-        Schedule.object_id == object_id,
-        Schedule.date == today
-    ).first()
+    schedule = next((
+        s for _, s in realized_shifts(db, today, today, [employee.id])
+        if s.object_id == object_id
+    ), None)
     
     if not schedule:
         raise HTTPException(status_code=404, detail="Kein Dienstplan für heute")
@@ -71,7 +70,13 @@ async def quick_booking(
             notes=f"War da - Partner von {employee.first_name}"
         )
         db.add(partner_entry)
+        db.flush()
+        emit(db, EntryBooked(
+            partner_id, partner_entry.id, object_id, check_in_time, check_out_time, "quick_booking_partner"
+        ))
     
+    db.flush()
+    emit(db, EntryBooked(employee.id, time_entry.id, object_id, check_in_time, check_out_time, "quick_booking"))
     db.commit()
     
     return {
@@ -1,13 +1,19 @@
+import os
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta, date
-from app.db.database import get_db
+from app.db.database import get_db, SessionLocal
 from app.models.models import User, TimeEntry, Employee, Object
-from sqlalchemy import func
+from sqlalchemy import DateTime, func, literal, tuple_
 from app.api.v1.endpoints.auth import get_current_user
-import pandas as pd
-from io import BytesIO
+from app.core.periods import day_period, range_period, month_period, week_period
+from app.db.sql import duration_seconds
+from app.core.report_service import ReportService
+from app.core.rollup_service import daily_totals
+from app.core.excel_export import build_timesheet_file, iter_file_chunks
+from app.core.pdf_batch import build_month_pdf_zip, iter_zip_chunks
 from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from typing import List, Optional
 from pydantic import BaseModel
 
@@ -30,10 +36,26 @@ class HistoryEntry(BaseModel):
 
 class HistoryResponse(BaseModel):
     entries: List[HistoryEntry]
-    total_hours: float
-    total_amount: float
+    # Summen über den ganzen Zeitraum - nur auf der ersten Seite
+    total_hours: Optional[float] = None
+    total_amount: Optional[float] = None
+    total_entries: Optional[int] = None
     period_start: date
     period_end: date
+    # Für die nächste Seite als ?cursor=... mitschicken; None = letzte Seite
+    next_cursor: Optional[str] = None
+
+HISTORY_PAGE_SIZE = 50
+HISTORY_MAX_PAGE_SIZE = 200
+
+
+def _parse_history_cursor(cursor: str):
+    """Cursor "<check_in ISO>_<id>" -> (check_in, id)"""
+    try:
+        check_in, entry_id = cursor.rsplit("_", 1)
+        return datetime.fromisoformat(check_in), int(entry_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Ungültiger Cursor")
 
 # ========== BESTEHENDE ENDPOINTS ==========
 
@@ -46,7 +68,7 @@ def get_my_today_report(
     print(f"User: {current_user.email}")  # DEBUG
     
     # Employee für current_user finden
-    employee = db.query(Employee).filter(Employee.user_id == current_user.id).first()
+    employee = current_user.employee
     
     if not employee:
         print("KEIN EMPLOYEE!")  # DEBUG
@@ -60,7 +82,7 @@ def get_my_today_report(
     # Einträge von heute
     entries = db.query(TimeEntry).filter(
         TimeEntry.employee_id == employee.id,
-        func.date(TimeEntry.check_in) == today
+        day_period(today).filter(TimeEntry.check_in)
     ).all()
     
     print(f"Einträge gefunden: {len(entries)}")  # DEBUG
@@ -82,34 +104,35 @@ def get_my_today_report(
 
 @router.get("/my/week")
 def get_my_week_hours(
+    week: Optional[int] = Query(default=None, description="ISO-Kalenderwoche (Standard: aktuelle)"),
+    year: Optional[int] = Query(default=None, description="ISO-Jahr der Woche"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Wochenstunden"""
+    iso_year, iso_week, _ = datetime.now().isocalendar()
+    try:
+        period = week_period(
+            year if year is not None else iso_year,
+            week if week is not None else iso_week
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     if not current_user.employee:
         return {"total_hours": 0, "entries": []}
     
-    today = datetime.now().date()
-    monday = today - timedelta(days=today.weekday())
+    monday = period.start.date()
     sunday = monday + timedelta(days=6)
     
-    entries = db.query(TimeEntry).filter(
-        TimeEntry.employee_id == current_user.employee.id,
-        TimeEntry.check_in >= monday,
-        TimeEntry.check_in <= sunday + timedelta(days=1)
-    ).all()
-    
-    total_hours = 0
-    for entry in entries:
-        if entry.check_out:
-            diff = entry.check_out - entry.check_in
-            total_hours += diff.total_seconds() / 3600
+    # Höchstens 7 Zeilen aus der Tagessummen-Tabelle statt aller Stempelungen
+    days = daily_totals(db, current_user.employee.id, monday, sunday)
     
     return {
-        "total_hours": round(total_hours, 2),
+        "total_hours": round(sum(minutes for _, minutes, _, _ in days) / 60, 2),
         "week_start": monday.isoformat(),
         "week_end": sunday.isoformat(),
-        "entries": len(entries)
+        "entries": int(sum(count for _, _, _, count in days))
     }
 
 @router.get("/my/month")
@@ -122,30 +145,18 @@ def get_my_month_hours(
         return {"total_hours": 0, "entries": []}
     
     today = datetime.now().date()
-    first_day = today.replace(day=1)
-    
-    if today.month == 12:
-        last_day = today.replace(day=31)
-    else:
-        last_day = today.replace(month=today.month+1, day=1) - timedelta(days=1)
-    
-    entries = db.query(TimeEntry).filter(
-        TimeEntry.employee_id == current_user.employee.id,
-        TimeEntry.check_in >= first_day,
-        TimeEntry.check_in <= last_day + timedelta(days=1)
-    ).all()
     
-    total_hours = 0
-    for entry in entries:
-        if entry.check_out:
-            diff = entry.check_out - entry.check_in
-            total_hours += diff.total_seconds() / 3600
+    period = month_period(today.year, today.month)
+    days = daily_totals(
+        db, current_user.employee.id,
+        period.start.date(), period.end.date() - timedelta(days=1)
+    )
     
     return {
-        "total_hours": round(total_hours, 2),
+        "total_hours": round(sum(minutes for _, minutes, _, _ in days) / 60, 2),
         "month": today.month,
         "year": today.year,
-        "entries": len(entries)
+        "entries": int(sum(count for _, _, _, count in days))
     }
 
 # ========== NEUER HISTORY ENDPOINT ==========
@@ -153,82 +164,95 @@ def get_my_month_hours(
 @router.get("/my/history", response_model=HistoryResponse)
 def get_my_history(
     days: int = Query(default=30, ge=1, le=365),
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    limit: int = Query(default=HISTORY_PAGE_SIZE, ge=1, le=HISTORY_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Gibt die Historie der letzten X Tage für den eingeloggten Mitarbeiter zurück
+    Historie des eingeloggten Mitarbeiters, neueste zuerst und seitenweise
+
+    Zeitraum: date_from/date_to oder die letzten X Tage. Weitere Seiten mit
+    cursor=next_cursor der vorherigen Antwort (Keyset auf check_in, id).
+    Stunden und Beträge rechnet die Datenbank; die Summen über den ganzen
+    Zeitraum kommen nur mit der ersten Seite (ohne cursor).
     """
-    # Employee für current_user finden
-    employee = db.query(Employee).filter(Employee.user_id == current_user.id).first()
-    
+    end_date = date_to or datetime.now().date()
+    start_date = date_from or end_date - timedelta(days=days)
+    if start_date > end_date:
+        raise HTTPException(status_code=400, detail="Startdatum liegt nach dem Enddatum")
+
+    employee = current_user.employee
     if not employee:
         return HistoryResponse(
             entries=[],
             total_hours=0,
             total_amount=0,
-            period_start=date.today(),
-            period_end=date.today()
+            total_entries=0,
+            period_start=start_date,
+            period_end=end_date
         )
-    
-    # Zeitraum berechnen
-    end_date = datetime.now().date()
-    start_date = end_date - timedelta(days=days)
-    
-    # TimeEntry-Einträge mit Object-Namen abrufen
-    entries = db.query(
-        TimeEntry,
-        Object.name.label('object_name')
-    ).join(
-        Object, TimeEntry.object_id == Object.id
-    ).filter(
+
+    # Laufende Stempelungen zählen bis jetzt
+    hours = duration_seconds(
+        TimeEntry.check_in, func.coalesce(TimeEntry.check_out, literal(datetime.now(), DateTime))
+    ) / 3600.0
+    hourly_rate = func.coalesce(func.nullif(TimeEntry.hourly_rate, 0), employee.hourly_rate or 0)
+    criteria = [
         TimeEntry.employee_id == employee.id,
-        func.date(TimeEntry.check_in) >= start_date,
-        func.date(TimeEntry.check_in) <= end_date
-    ).order_by(
-        TimeEntry.check_in.desc()
-    ).all()
-    
-    # Daten aufbereiten
-    history_entries = []
-    total_hours = 0
-    total_amount = 0
-    
-    for entry, object_name in entries:
-        # Stunden berechnen
-        if entry.check_out:
-            delta = entry.check_out - entry.check_in
-            hours = delta.total_seconds() / 3600
-        else:
-            # Laufende Zeit bis jetzt
-            delta = datetime.now() - entry.check_in
-            hours = delta.total_seconds() / 3600
-        
-        # Betrag berechnen (hourly_rate aus TimeEntry oder Employee)
-        hourly_rate = entry.hourly_rate if entry.hourly_rate else (employee.hourly_rate or 0)
-        amount = hours * hourly_rate
-        
-        total_hours += hours
-        total_amount += amount
-        
-        history_entries.append(HistoryEntry(
-            id=entry.id,
-            date=entry.check_in.date(),
-            object_name=object_name,
-            check_in=entry.check_in,
-            check_out=entry.check_out,
-            hours=round(hours, 2),
-            service_type=entry.service_type,
-            hourly_rate=hourly_rate,
-            amount=round(amount, 2)
-        ))
-    
+        range_period(start_date, end_date).filter(TimeEntry.check_in)
+    ]
+
+    query = db.query(
+        TimeEntry.id,
+        TimeEntry.check_in,
+        TimeEntry.check_out,
+        TimeEntry.service_type,
+        func.coalesce(Object.name, 'Unbekannt').label('object_name'),
+        hours.label('hours'),
+        hourly_rate.label('hourly_rate')
+    ).outerjoin(
+        Object, TimeEntry.object_id == Object.id
+    ).filter(*criteria)
+    if cursor:
+        query = query.filter(tuple_(TimeEntry.check_in, TimeEntry.id) < tuple_(*_parse_history_cursor(cursor)))
+    rows = query.order_by(TimeEntry.check_in.desc(), TimeEntry.id.desc()).limit(limit + 1).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    total_entries = total_hours = total_amount = None
+    if not cursor:
+        total_entries, total_hours, total_amount = db.query(
+            func.count(TimeEntry.id),
+            func.coalesce(func.sum(hours), 0),
+            func.coalesce(func.sum(hours * hourly_rate), 0)
+        ).filter(*criteria).one()
+        total_hours, total_amount = round(total_hours, 2), round(total_amount, 2)
+
     return HistoryResponse(
-        entries=history_entries,
-        total_hours=round(total_hours, 2),
-        total_amount=round(total_amount, 2),
+        entries=[
+            HistoryEntry(
+                id=row.id,
+                date=row.check_in.date(),
+                object_name=row.object_name,
+                check_in=row.check_in,
+                check_out=row.check_out,
+                hours=round(row.hours, 2),
+                service_type=row.service_type,
+                hourly_rate=row.hourly_rate,
+                amount=round(row.hours * row.hourly_rate, 2)
+            )
+            for row in rows
+        ],
+        total_hours=total_hours,
+        total_amount=total_amount,
+        total_entries=total_entries,
         period_start=start_date,
-        period_end=end_date
+        period_end=end_date,
+        next_cursor=f"{rows[-1].check_in.isoformat()}_{rows[-1].id}" if has_more else None
     )
 
 # ========== EXCEL EXPORT (BESTEHEND) ==========
@@ -244,62 +268,87 @@ def export_excel(
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Nur für Admins")
     
-    start_date = datetime(year, month, 1)
-    if month == 12:
-        end_date = datetime(year + 1, 1, 1)
-    else:
-        end_date = datetime(year, month + 1, 1)
+    period = month_period(year, month)
     
-    employees = db.query(Employee).all()
-    excel_data = []
-    
-    for emp in employees:
-        entries = db.query(TimeEntry).filter(
-            TimeEntry.employee_id == emp.id,
-            TimeEntry.check_in >= start_date,
-            TimeEntry.check_in < end_date
-        ).all()
-        
-        for entry in entries:
-            if entry.check_out:
-                diff = entry.check_out - entry.check_in
-                hours = diff.total_seconds() / 3600
-                
-                excel_data.append({
-                    'Personal-Nr': emp.personal_nr,
-                    'Name': f"{emp.first_name} {emp.last_name}",
-                    'Datum': entry.check_in.strftime('%d.%m.%Y'),
-                    'Check-In': entry.check_in.strftime('%H:%M'),
-                    'Check-Out': entry.check_out.strftime('%H:%M'),
-                    'Stunden': round(hours, 2),
-                    'Stundensatz': emp.hourly_rate,
-                    'Lohn': round(hours * emp.hourly_rate, 2)
-                })
+    # Sortierte Join-Abfrage -> xlsx im constant_memory Modus -> Datei in Blöcken
+    rows = ReportService(db).iter_export_rows(period)
+    path = build_timesheet_file(rows)
+    filename = f"SEDA24_Zeiterfassung_{year}_{month:02d}.xlsx"
     
-    if not excel_data:
-        excel_data = [{'Info': 'Keine Daten für diesen Monat'}]
+    return StreamingResponse(
+        iter_file_chunks(path),
+        media_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+        background=BackgroundTask(os.remove, path)
+    )
     
-    df = pd.DataFrame(excel_data)
-    output = BytesIO()
+# ========== CSV EXPORT (STREAMING) ==========
+
+def _stream_csv(**filters):
+    """Eigene Session: der Body wird erst nach Ende des Endpoints gelesen"""
+    db = SessionLocal()
+    try:
+        yield from ReportService(db).iter_csv(**filters)
+    finally:
+        db.close()
+
+@router.get("/export/csv")
+def export_csv(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    employee_id: Optional[int] = None,
+    customer_id: Optional[int] = None,
+    current_user: User = Depends(get_current_user)
+):
+    """CSV-Export, optional gefiltert nach Zeitraum, Mitarbeiter und Kunde"""
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Nur für Admins")
     
-    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-        df.to_excel(writer, sheet_name='Zeiterfassung', index=False)
+    period = None
+    if start_date or end_date:
+        period = range_period(start_date or date.min, end_date or date.today())
     
-    output.seek(0)
-    filename = f"SEDA24_Zeiterfassung_{year}_{month:02d}.xlsx"
+    filename = f"SEDA24_Zeiterfassung_{start_date or 'alle'}_{end_date or date.today()}.csv"
     
     return StreamingResponse(
-        output,
-        media_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        _stream_csv(period=period, employee_id=employee_id, customer_id=customer_id),
+        media_type="text/csv; charset=utf-8",
         headers={"Content-Disposition": f"attachment; filename={filename}"}
     )
+
+# ========== PDF-ZEITNACHWEISE (ALLE MITARBEITER) ==========
+
+@router.get("/export/pdf/{year}/{month}")
+def export_month_pdfs(
+    year: int,
+    month: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Zeitnachweise aller Mitarbeiter eines Monats als ZIP"""
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Nur für Admins")
     
+    archive, report = build_month_pdf_zip(db, year, month)
+    filename = f"SEDA24_Zeitnachweise_{year}_{month:02d}.zip"
+    
+    return StreamingResponse(
+        iter_zip_chunks(archive),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}",
+            "X-PDF-Count": str(report["pdf_count"]),
+            "X-PDF-Seconds": str(report["total_seconds"]),
+            "X-PDF-Per-Second": str(report["pdfs_per_second"])
+        }
+    )
+
 @router.get("/my/tacho")
 def get_my_tacho(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    employee = db.query(Employee).filter(Employee.user_id == current_user.id).first()
+    employee = current_user.employee
     if not employee:
         return {"total_hours_since_start": 0, "start_hours": 0}
     
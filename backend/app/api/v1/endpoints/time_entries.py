@@ -1,51 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from sqlalchemy.exc import IntegrityError
 from datetime import datetime, timedelta, date
 from typing import List
-import math
 
 from app.db.database import get_db
-from app.models.models import TimeEntry, Employee, Object, User, Schedule
+from app.models.models import TimeEntry, Employee, Object, User
 from app.schemas.time_entry_schema import CheckIn, CheckOut, TimeEntryResponse
-from app.core.validation_service import ValidationService
 from app.api.v1.endpoints.auth import get_current_user
+from app.core.periods import day_period
+from app.db.repository import get_open_entry
+from app.core.events import emit, CheckedIn, CheckedOut, ObjectSwitched, EntryBooked
+from app.core.geofence import geofence
+from app.core.schedule_service import realized_shifts
 
 router = APIRouter()
 
-def calculate_distance(lat1, lng1, lat2, lng2):
-    """Berechnet Distanz zwischen zwei GPS-Punkten in Metern"""
-    R = 6371000  # Erdradius in Metern
-    lat1_rad = math.radians(lat1)
-    lat2_rad = math.radians(lat2)
-    delta_lat = math.radians(lat2 - lat1)
-    delta_lng = math.radians(lng2 - lng1)
-    
-    a = math.sin(delta_lat/2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lng/2)**2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-    distance = R * c
-    return distance
-
-def get_hourly_rate_for_object(employee, object_name):
-    """Ermittelt Stundensatz basierend auf Objektname"""
-    if not object_name:
-        return employee.hourly_rate_standard if hasattr(employee, 'hourly_rate_standard') else 15.00
-        
-    object_upper = object_name.upper()
-    
-    # Fensterreinigung
-    if "FENSTER" in object_upper or "WINDOW" in object_upper:
-        return employee.hourly_rate_window if hasattr(employee, 'hourly_rate_window') else 20.00
-    # Grundreinigung
-    elif "GRUND" in object_upper or "BASIC" in object_upper:
-        return employee.hourly_rate_basic if hasattr(employee, 'hourly_rate_basic') else 20.00
-    # Büro/Zentrale (für Drazen)
-    elif "BÜRO" in object_upper or "ZENTRALE" in object_upper:
-        return employee.hourly_rate_window if hasattr(employee, 'hourly_rate_window') else 20.00
-    # Standard
-    else:
-        return employee.hourly_rate_standard if hasattr(employee, 'hourly_rate_standard') else 15.00
-
 @router.post("/check-in")
 def check_in(
     data: dict,
@@ -53,7 +23,7 @@ def check_in(
     current_user: User = Depends(get_current_user)
 ):
     # Employee finden oder erstellen
-    employee = db.query(Employee).filter(Employee.user_id == current_user.id).first()
+    employee = current_user.employee
     if not employee:
         employee = Employee(
             user_id=current_user.id,
@@ -66,29 +36,49 @@ def check_in(
         db.commit()
         db.refresh(employee)
     
-    # WICHTIG: Alte offene Einträge IMMER schließen
-    old_entries = db.query(TimeEntry).filter(
-        TimeEntry.employee_id == employee.id,
-        TimeEntry.check_out == None
-    ).all()
-    
-    for entry in old_entries:
-        entry.check_out = datetime.utcnow()
-    
-    if old_entries:
-        db.commit()
+    # Objekt: ausgewählt oder per GPS das Objekt, an dem der MA gerade steht
+    object_id = data.get("object_id")
+    gps_lat, gps_lng = data.get("gps_lat"), data.get("gps_lng")
+    if not object_id and gps_lat is not None and gps_lng is not None:
+        here = geofence.nearby(db, gps_lat, gps_lng, limit=1)
+        if here:
+            object_id = here[0]["object_id"]
+    if not object_id:
+        raise HTTPException(status_code=400, detail="Kein Objekt in der Nähe gefunden - bitte Objekt auswählen")
+    
+    # WICHTIG: Alten offenen Eintrag IMMER schließen
+    old_entry = get_open_entry(db, employee.id, for_update=True)
+    if old_entry:
+        old_entry.check_out = datetime.utcnow()
+        db.flush()
+        emit(db, CheckedOut(
+            employee.id, old_entry.id, old_entry.object_id,
+            old_entry.check_in, old_entry.check_out, automatic=True
+        ))
         
     # Neuer Eintrag
     try:
         time_entry = TimeEntry(
             employee_id=employee.id,
-            object_id=data.get("object_id", 1),
-            check_in=datetime.utcnow()
+            object_id=object_id,
+            check_in=datetime.utcnow(),
+            gps_lat=gps_lat,
+            gps_lng=gps_lng
         )
         db.add(time_entry)
+        db.flush()
+        emit(db, CheckedIn(employee.id, time_entry.id, object_id, time_entry.check_in, gps_lat, gps_lng))
         db.commit()
         db.refresh(time_entry)
         return time_entry
+    except IntegrityError:
+        # Paralleler Check-in (Doppelklick, Retry) war schneller -
+        # der Unique-Index lässt nur eine offene Stempelung zu
+        db.rollback()
+        current_entry = get_open_entry(db, employee.id)
+        if current_entry:
+            return current_entry
+        raise HTTPException(status_code=409, detail="Check-in parallel erfolgt, bitte erneut versuchen")
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
@@ -99,17 +89,12 @@ def check_out(
     db: Session = Depends(get_db)
 ):
     # Hole Employee
-    employee = db.query(Employee).filter(Employee.user_id == current_user.id).first()
+    employee = current_user.employee
     if not employee:
         raise HTTPException(status_code=404, detail="Mitarbeiter nicht gefunden")
     
     # Finde aktiven Eintrag
-    active_entry = db.query(TimeEntry).filter(
-        and_(
-            TimeEntry.employee_id == employee.id,
-            TimeEntry.check_out == None
-        )
-    ).first()
+    active_entry = get_open_entry(db, employee.id)
     
     if not active_entry:
         raise HTTPException(status_code=400, detail="Kein aktiver Check-in gefunden!")
@@ -117,6 +102,10 @@ def check_out(
     # Setze check_out Zeit
     active_entry.check_out = datetime.utcnow()
     # GPS beim Ausstempeln ist optional - lassen wir weg
+    emit(db, CheckedOut(
+        employee.id, active_entry.id, active_entry.object_id,
+        active_entry.check_in, active_entry.check_out
+    ))
     
     db.commit()
     db.refresh(active_entry)
@@ -132,17 +121,12 @@ def switch_object(
     """Wechselt von einem Objekt zum anderen - beendet aktuellen und startet neuen"""
     
     # Hole Employee
-    employee = db.query(Employee).filter(Employee.user_id == current_user.id).first()
+    employee = current_user.employee
     if not employee:
         raise HTTPException(status_code=404, detail="Mitarbeiter nicht gefunden")
     
     # Finde und beende aktiven Eintrag
-    active_entry = db.query(TimeEntry).filter(
-        and_(
-            TimeEntry.employee_id == employee.id,
-            TimeEntry.check_out == None
-        )
-    ).first()
+    active_entry = get_open_entry(db, employee.id, for_update=True)
     
     if not active_entry:
         raise HTTPException(status_code=400, detail="Kein aktiver Check-in zum Wechseln!")
@@ -152,6 +136,7 @@ def switch_object(
     active_entry.check_out_lat = data.gps_lat
     active_entry.check_out_lng = data.gps_lng
     active_entry.notes = (active_entry.notes or "") + f" | Wechsel zu Objekt {data.object_id}"
+    db.flush()
     
     # Erstelle neuen Eintrag am neuen Objekt
     new_entry = TimeEntry(
@@ -164,6 +149,11 @@ def switch_object(
     )
     
     db.add(new_entry)
+    db.flush()
+    emit(db, ObjectSwitched(
+        employee.id, active_entry.id, active_entry.object_id, active_entry.check_in,
+        new_entry.id, new_entry.object_id, new_entry.check_in
+    ))
     db.commit()
     db.refresh(new_entry)
     
@@ -174,17 +164,12 @@ def get_current_status(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    employee = db.query(Employee).filter(Employee.user_id == current_user.id).first()
+    employee = current_user.employee
     if not employee:
         return {"is_working": False}
     
-    # WICHTIG: NUR den NEUESTEN offenen Eintrag nehmen!
-    # Sortiert nach ID absteigend, nimmt nur den ersten
-    current_entry = db.query(TimeEntry)\
-        .filter(TimeEntry.employee_id == employee.id)\
-        .filter(TimeEntry.check_out == None)\
-        .order_by(TimeEntry.id.desc())\
-        .first()  # NUR DER NEUESTE!
+    # Höchstens ein offener Eintrag pro Mitarbeiter (Unique-Index)
+    current_entry = get_open_entry(db, employee.id)
     
     if current_entry:
         # Zombie-Check: Wenn älter als 14 Stunden, ignorieren!
@@ -192,6 +177,10 @@ def get_current_status(
         if datetime.now() - current_entry.check_in > timedelta(hours=14):
             # Zombie-Eintrag automatisch schließen
             current_entry.check_out = datetime.now()
+            emit(db, CheckedOut(
+                employee.id, current_entry.id, current_entry.object_id,
+                current_entry.check_in, current_entry.check_out, automatic=True
+            ))
             db.commit()
             return {"is_working": False}
         
@@ -214,9 +203,7 @@ def war_anwesend_booking(
     Kategorie B: Bucht Sollstunden für den Tag mit einem Klick
     """
     # Prüfe ob MA Kategorie B hat
-    employee = db.query(Employee).filter(
-        Employee.user_id == current_user.id
-    ).first()
+    employee = current_user.employee
     
     if not employee:
         raise HTTPException(status_code=404, detail="Mitarbeiter nicht gefunden")
@@ -240,7 +227,7 @@ def war_anwesend_booking(
     existing = db.query(TimeEntry).filter(
         TimeEntry.employee_id == employee.id,
         TimeEntry.object_id == object_id,  # WICHTIG: Pro Objekt prüfen!
-        func.date(TimeEntry.check_in) == today
+        day_period(today).filter(TimeEntry.check_in)
     ).first()
     
     if existing:
@@ -251,11 +238,10 @@ def war_anwesend_booking(
     
 
 # Hole Sollstunden aus Dienstplan
-    schedule = db.query(Schedule).filter(
-        Schedule.employee_id == employee.id,
-        Schedule.object_id == object_id,
-        Schedule.weekday == datetime.now().weekday()
-    ).first()
+    schedule = next((
+        s for _, s in realized_shifts(db, today, today, [employee.id])
+        if s.object_id == object_id
+    ), None)
     
     if not schedule:
         # Fallback: Standard-Stunden für Kategorie B
@@ -287,6 +273,8 @@ def war_anwesend_booking(
     )
     
     db.add(time_entry)
+    db.flush()
+    emit(db, EntryBooked(employee.id, time_entry.id, object_id, check_in, check_out, "war_anwesend"))
     db.commit()
     
     return {
@@ -308,32 +296,23 @@ def get_my_scheduled_objects(
     from datetime import date, timedelta
     
     today = date.today()
-    weekday = today.weekday()  # 0=Montag, 6=Sonntag
     
     # Hole den Mitarbeiter
-    employee = db.query(Employee).filter(Employee.user_id == current_user.id).first()
+    employee = current_user.employee
     if not employee:
         return []
     
     # Basis: Heutiger Dienstplan
-    schedules = db.query(Schedule).filter(
-        Schedule.employee_id == employee.id,
-        Schedule.weekday == weekday
-    ).all()
-    
     # Kategorie B und C: 2 Tage Puffer (gestern und morgen auch erlaubt)
-    if current_user.category in ["B", "C"]:
-        yesterday = (weekday - 1) % 7
-        tomorrow = (weekday + 1) % 7
-        
-        extra_schedules = db.query(Schedule).filter(
-            Schedule.employee_id == employee.id,
-            Schedule.weekday.in_([yesterday, tomorrow])
-        ).all()
-        schedules.extend(extra_schedules)
+    buffer = 1 if current_user.category in ["B", "C"] else 0
+    shifts = realized_shifts(
+        db, today - timedelta(days=buffer), today + timedelta(days=buffer), [employee.id]
+    )
+    # Heutige Schichten zuerst, damit sie pro Objekt Vorrang haben
+    shifts.sort(key=lambda item: item[0] != today)
     
     # Hole die Objekt-Details
-    object_ids = list(set([s.object_id for s in schedules]))  # Unique IDs
+    object_ids = list(set([s.object_id for _, s in shifts]))  # Unique IDs
     
     if not object_ids:
         return []
@@ -344,7 +323,7 @@ def get_my_scheduled_objects(
     result = []
     for obj in objects:
         # Finde die passende Schedule für dieses Objekt
-        obj_schedule = next((s for s in schedules if s.object_id == obj.id), None)
+        obj_day, obj_schedule = next(((d, s) for d, s in shifts if s.object_id == obj.id), (None, None))
         
         result.append({
             "id": obj.id,
@@ -356,7 +335,7 @@ def get_my_scheduled_objects(
             "planned_hours": obj_schedule.planned_hours if obj_schedule else 8,
             "start_time": obj_schedule.start_time.strftime("%H:%M") if obj_schedule and obj_schedule.start_time else "06:00",
             "end_time": obj_schedule.end_time.strftime("%H:%M") if obj_schedule and obj_schedule.end_time else "14:00",
-            "is_scheduled_today": obj_schedule.weekday == weekday if obj_schedule else False
+            "is_scheduled_today": obj_day == today
         })
     
     return result
@@ -369,17 +348,15 @@ def check_if_working_today(
 ):
     """Prüft ob der Mitarbeiter heute laut Dienstplan arbeitet"""
     today = date.today()
-    weekday = today.weekday()
     
-    employee = db.query(Employee).filter(Employee.user_id == current_user.id).first()
+    employee = current_user.employee
     if not employee:
         return {"has_work": False, "category": current_user.category}
     
     # Prüfe Dienstplan
-    schedule_today = db.query(Schedule).filter(
-        Schedule.employee_id == employee.id,
-        Schedule.weekday == weekday
-    ).first()
+    schedule_today = next(
+        (s for _, s in realized_shifts(db, today, today, [employee.id])), None
+    )
     
     return {
         "has_work": schedule_today is not None,
@@ -6,7 +6,7 @@ from app.db.database import get_db
 from app.models.models import Warning, Employee
 from app.schemas.warning_schema import WarningResponse
 from app.api.v1.endpoints.auth import get_current_user
-from app.core.validation_service import ValidationService
+from app.core.warning_engine import run_checks
 
 router = APIRouter()
 
@@ -35,7 +35,7 @@ def get_my_warnings(
     current_user = Depends(get_current_user)
 ):
     """Eigene Warnungen abrufen"""
-    employee = db.query(Employee).filter(Employee.user_id == current_user.id).first()
+    employee = current_user.employee
     if not employee:
         return []
     
@@ -55,10 +55,7 @@ def run_all_checks(
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Nur Admins")
     
-    results = {
-        "missing_checkouts": ValidationService.check_missing_checkout(db),
-        "no_shows": ValidationService.check_no_show(db)
-    }
+    results = run_checks(db)
     
     return {"message": "Prüfungen durchgeführt", "results": results}
 
@@ -0,0 +1,157 @@
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional
+from sqlalchemy import DateTime, Integer, literal, select, union_all, update
+from sqlalchemy.orm import Session
+from app.models.models import TimeEntry, Employee, Object
+from app.db.repository import open_entries_query
+from app.core.periods import day_period
+from app.core.schedule_service import realized_shifts
+from app.core.rollup_service import rebuild
+from app.core.warning_engine import insert_warnings
+from app.core.live_status import live_status
+
+# Ohne passende Schicht: 20 Uhr (bzw. 8 h nach Beginn), höchstens 14 h, nie nach jetzt
+DEFAULT_CHECKOUT_HOUR = 20
+LATE_CHECK_IN_HOURS = timedelta(hours=8)
+MAX_WORK_TIME = timedelta(hours=14)
+AUTO_CHECKOUT_NOTE = "[AUTO-CHECKOUT: Vergessen auszustempeln]"
+# Zeilen pro UPDATE (SQLite erlaubt höchstens 500 Teile in einem UNION ALL)
+UPDATE_CHUNK = 500
+
+
+def _shift_end(day: date, schedule) -> datetime:
+    end = datetime.combine(day, schedule.end_time)
+    if schedule.end_time <= schedule.start_time:
+        end += timedelta(days=1)   # Nachtschicht
+    return end
+
+
+def _close_time(check_in: datetime, shifts: list, now: datetime):
+    """(Ausstempelzeit, Regel) für eine offene Stempelung
+
+    Schichtende der Schicht am selben Objekt, die am nächsten am Check-in
+    beginnt - sofern sie nach dem Check-in endet. Sonst die Standardregel.
+    """
+    candidates = [
+        (abs((datetime.combine(day, s.start_time) - check_in).total_seconds()), _shift_end(day, s))
+        for day, s in shifts
+    ]
+    candidates = [c for c in candidates if c[1] > check_in]
+    if candidates:
+        return min(candidates)[1], "schedule"
+
+    default = datetime.combine(check_in.date(), time(DEFAULT_CHECKOUT_HOUR))
+    rule = f"{DEFAULT_CHECKOUT_HOUR}:00"
+    if default <= check_in:
+        default, rule = check_in + LATE_CHECK_IN_HOURS, "8h"
+    return min((default, rule), (check_in + MAX_WORK_TIME, "14h"), (now, "now"))
+
+
+def plan_auto_checkout(db: Session, now: Optional[datetime] = None) -> List[dict]:
+    """Offene Stempelungen bis einschließlich heute, die jetzt geschlossen würden
+
+    Eine Abfrage über den partiellen Index der offenen Stempelungen plus die
+    Schichten der betroffenen Tage (realized_shifts). Stempelungen, deren
+    Schicht noch läuft, bleiben offen. Ändert nichts an der Datenbank.
+    """
+    now = now or datetime.now()
+    rows = open_entries_query(db).with_entities(
+        TimeEntry.id, TimeEntry.employee_id, TimeEntry.object_id, TimeEntry.check_in, TimeEntry.notes,
+        Employee.first_name, Employee.last_name, Object.name
+    ).join(
+        Employee, Employee.id == TimeEntry.employee_id
+    ).outerjoin(
+        Object, Object.id == TimeEntry.object_id
+    ).filter(
+        TimeEntry.check_in < day_period(now.date()).end
+    ).order_by(TimeEntry.check_in).all()
+    if not rows:
+        return []
+
+    shifts_by_key = {}
+    first_day = min(row.check_in.date() for row in rows)
+    for day, schedule in realized_shifts(db, first_day, now.date(), {row.employee_id for row in rows}):
+        if schedule.start_time and schedule.end_time:
+            shifts_by_key.setdefault((schedule.employee_id, schedule.object_id, day), []).append((day, schedule))
+
+    plan = []
+    for row in rows:
+        check_out, rule = _close_time(
+            row.check_in, shifts_by_key.get((row.employee_id, row.object_id, row.check_in.date()), []), now
+        )
+        if check_out > now or check_out <= row.check_in:
+            continue   # Schicht läuft noch
+        plan.append({
+            "time_entry_id": row.id,
+            "employee_id": row.employee_id,
+            "employee": f"{row.first_name} {row.last_name}",
+            "object_id": row.object_id,
+            "object": row.name or "Unbekannt",
+            "check_in": row.check_in,
+            "check_out": check_out,
+            "rule": rule,
+            "hours_worked": round((check_out - row.check_in).total_seconds() / 3600, 2),
+            "notes": f"{row.notes} {AUTO_CHECKOUT_NOTE}" if row.notes else AUTO_CHECKOUT_NOTE,
+        })
+    return plan
+
+
+def _apply(db: Session, plan: List[dict]) -> set:
+    """Ausstempelzeiten per UPDATE ... FROM (Konstantentabelle) setzen, gibt die ids zurück"""
+    updated = set()
+    for offset in range(0, len(plan), UPDATE_CHUNK):
+        rows = [
+            select(
+                literal(item["time_entry_id"], Integer).label('id'),
+                literal(item["check_out"], DateTime).label('check_out'),
+                literal(item["notes"]).label('notes')
+            )
+            for item in plan[offset:offset + UPDATE_CHUNK]
+        ]
+        closes = union_all(*rows).subquery('closes') if len(rows) > 1 else rows[0].subquery('closes')
+        updated.update(db.execute(
+            update(TimeEntry).where(
+                TimeEntry.id == closes.c.id,
+                # Inzwischen selbst ausgestempelt -> nicht überschreiben
+                TimeEntry.check_out.is_(None)
+            ).values(
+                check_out=closes.c.check_out,
+                notes=closes.c.notes
+            ).returning(TimeEntry.id).execution_options(synchronize_session=False)
+        ).scalars())
+    return updated
+
+
+def auto_checkout(db: Session, now: Optional[datetime] = None, dry_run: bool = False) -> List[dict]:
+    """Vergessene Ausstempelungen schließen (Job "auto_checkout", 23:59)
+
+    Ein UPDATE für alle Stempelungen, ein INSERT für die Warnungen
+    (dedup_key AUTO_CHECKOUT:<Eintrag>), Tagessummen mengenbasiert - alles
+    in einer Transaktion und beliebig oft ausführbar. dry_run liefert nur
+    den Plan.
+    """
+    now = now or datetime.now()
+    plan = plan_auto_checkout(db, now)
+    if dry_run or not plan:
+        return plan
+
+    closed = _apply(db, plan)
+    plan = [item for item in plan if item["time_entry_id"] in closed]
+    if not plan:
+        db.rollback()
+        return []
+    insert_warnings(db, [{
+        "employee_id": item["employee_id"],
+        "warning_type": "forgotten_checkout",
+        "description": f"Vergessen auszustempeln am {item['check_in'].strftime('%d.%m.%Y')}. Automatisch ausgestempelt um {item['check_out'].strftime('%H:%M')} Uhr.",
+        "dedup_key": f"AUTO_CHECKOUT:{item['time_entry_id']}",
+    } for item in plan])
+    rebuild(
+        db,
+        min(item["check_in"] for item in plan).date(),
+        max(item["check_in"] for item in plan).date(),
+        {item["employee_id"] for item in plan}
+    )
+    db.commit()
+    live_status.invalidate()
+    return plan
@@ -0,0 +1,178 @@
+import random
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+from sqlalchemy import Date, Integer, and_, case, exists, insert, literal, or_, select, union_all
+from sqlalchemy.orm import Session, aliased
+from app.models.models import TimeEntry, Employee, User, Schedule
+from app.db.sql import day_time
+from app.core.rollup_service import rebuild
+from app.core.live_status import live_status
+
+# Kategorie A: Stempelung nach Dienstplan, mit kleiner Variation (DSGVO)
+JITTER_MINUTES = 3
+# So kurz vor Schichtende wird schon gebucht
+STAMP_BEFORE_END = timedelta(minutes=30)
+# Vorhandene Stempelung ab so lange vor Schichtbeginn zählt als "schon gestempelt"
+EARLY_CHECK_IN = 60
+# Tage pro Abfrage/Transaktion beim Nachbuchen
+BACKFILL_CHUNK_DAYS = 31
+
+
+def _days(start_date: date, end_date: date):
+    """Tage des Zeitraums als kleine Konstantentabelle (wie week_pairs in copy_weeks)"""
+    rows = []
+    day = start_date
+    while day <= end_date:
+        rows.append(select(
+            literal(day, Date).label('day'),
+            literal(day + timedelta(days=1), Date).label('next_day'),
+            literal(day.weekday(), Integer).label('weekday')
+        ))
+        day += timedelta(days=1)
+    return union_all(*rows).subquery('days') if len(rows) > 1 else rows[0].subquery('days')
+
+
+def due_shifts(db: Session, start_date: date, end_date: date):
+    """Schichten von Kategorie-A-Mitarbeitern im Zeitraum, für die noch nicht gestempelt ist
+
+    Eine Abfrage: Tage x (datierte Schichten bzw. Wochenvorlage, wie
+    realized_shifts) x aktive Kategorie-A-Mitarbeiter, ohne die Schichten,
+    zu denen es schon eine Stempelung gibt (Anti-Join über den Index
+    employee_id, check_in). Ergebnis: Zeilen mit day, employee_id,
+    object_id, start_time, end_time, planned_hours.
+    """
+    days = _days(start_date, end_date)
+    planned = aliased(Schedule)
+
+    dated = Schedule.date == days.c.day
+    template = and_(
+        Schedule.date == None,
+        Schedule.weekday == days.c.weekday,
+        # ersetzt durch eine datierte Schicht am selben Objekt und Tag
+        ~exists().where(
+            planned.employee_id == Schedule.employee_id,
+            planned.object_id == Schedule.object_id,
+            planned.date == days.c.day
+        )
+    )
+    shift_end = case(
+        (Schedule.end_time > Schedule.start_time, day_time(days.c.day, Schedule.end_time, 0)),
+        else_=day_time(days.c.next_day, Schedule.end_time, 0)
+    )
+    stamped = exists().where(
+        TimeEntry.employee_id == Schedule.employee_id,
+        TimeEntry.check_in >= day_time(days.c.day, Schedule.start_time, -EARLY_CHECK_IN),
+        TimeEntry.check_in < shift_end
+    )
+
+    return db.execute(
+        select(
+            days.c.day,
+            Schedule.employee_id,
+            Schedule.object_id,
+            Schedule.start_time,
+            Schedule.end_time,
+            Schedule.planned_hours
+        ).join_from(
+            Schedule, days, or_(dated, template)
+        ).join(
+            Employee, Employee.id == Schedule.employee_id
+        ).join(
+            User, User.id == Employee.user_id
+        ).where(
+            User.category == 'A',
+            User.is_active == True,
+            Schedule.start_time != None,
+            Schedule.end_time != None,
+            or_(Schedule.status == None, Schedule.status.in_(('normal', 'vertretung'))),
+            ~stamped
+        ).order_by(days.c.day, Schedule.start_time, Schedule.employee_id)
+    ).all()
+
+
+def _entry(shift, note: str) -> dict:
+    start_var = random.randint(-JITTER_MINUTES, JITTER_MINUTES)
+    end_var = random.randint(-JITTER_MINUTES, JITTER_MINUTES)
+    check_in = datetime.combine(shift.day, shift.start_time) + timedelta(minutes=start_var)
+    check_out = datetime.combine(shift.day, shift.end_time) + timedelta(minutes=end_var)
+    if shift.end_time <= shift.start_time:
+        check_out += timedelta(days=1)   # Nachtschicht
+    actual_hours = (check_out - check_in).total_seconds() / 3600
+    planned_hours = shift.planned_hours or actual_hours
+
+    if abs(actual_hours - planned_hours) > 0.1:
+        notes = f"{note} | Gestempelt: {actual_hours:.2f}h | Gebucht: {planned_hours:.1f}h (Sollstunden)"
+    else:
+        notes = f"{note} | {actual_hours:.2f}h (Var: {start_var:+d}/{end_var:+d}min)"
+    return {
+        "employee_id": shift.employee_id,
+        "object_id": shift.object_id,
+        "check_in": check_in,
+        "check_out": check_out,
+        "is_manual_entry": False,
+        "notes": notes,
+    }
+
+
+def _summary(entry: dict) -> dict:
+    return {
+        "employee_id": entry["employee_id"],
+        "object_id": entry["object_id"],
+        "date": entry["check_in"].date().isoformat(),
+        "check_in": entry["check_in"].strftime("%H:%M"),
+        "check_out": entry["check_out"].strftime("%H:%M"),
+    }
+
+
+def _stamp(db: Session, start_date: date, end_date: date, now: datetime, note: str) -> List[dict]:
+    entries = []
+    for shift in due_shifts(db, start_date, end_date):
+        end_dt = datetime.combine(shift.day, shift.end_time)
+        if shift.end_time <= shift.start_time:
+            end_dt += timedelta(days=1)
+        if now >= end_dt - STAMP_BEFORE_END:
+            entries.append(_entry(shift, note))
+    if not entries:
+        return []
+
+    db.execute(insert(TimeEntry), entries)
+    # Tagessummen in derselben Transaktion (Nachtschichten zählen am Vortag)
+    rebuild(db, start_date, end_date, {entry["employee_id"] for entry in entries})
+    return entries
+
+
+def stamp_category_a(db: Session, now: Optional[datetime] = None) -> List[dict]:
+    """Beendete (bzw. fast beendete) Schichten von Kategorie-A-Mitarbeitern stempeln
+
+    Job "category_a_stamping": heute (und gestern, für Nachtschichten und
+    verpasste Läufe). Alle fälligen Einträge in einem INSERT und einer
+    Transaktion; abgerechnet werden die Sollstunden der Schicht.
+    """
+    now = now or datetime.now()
+    today = now.date()
+    entries = _stamp(db, today - timedelta(days=1), today, now, "Auto-Kat.A")
+    db.commit()
+    if entries:
+        live_status.invalidate()
+    return [_summary(entry) for entry in entries]
+
+
+def backfill_category_a(db: Session, start_date: date, end_date: date, now: Optional[datetime] = None) -> List[dict]:
+    """Vergangene Tage nachbuchen (scripts/auto_stamp_past.py)
+
+    Pro BACKFILL_CHUNK_DAYS Tage eine Abfrage, ein INSERT und ein commit.
+    Bereits gestempelte Schichten bleiben unberührt - mehrfach ausführbar.
+    """
+    now = now or datetime.now()
+    end_date = min(end_date, now.date())
+    stamped = []
+    chunk_start = start_date
+    while chunk_start <= end_date:
+        chunk_end = min(end_date, chunk_start + timedelta(days=BACKFILL_CHUNK_DAYS - 1))
+        stamped += _stamp(db, chunk_start, chunk_end, now, "Auto-Kat.A (rückwirkend)")
+        db.commit()
+        chunk_start = chunk_end + timedelta(days=1)
+    if stamped:
+        live_status.invalidate()
+    return [_summary(entry) for entry in stamped]
+
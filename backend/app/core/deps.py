@@ -1,44 +1,139 @@
+import os
+import threading
+import time
+from typing import Optional
 from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy import event
+from sqlalchemy.orm import Session, joinedload
 from app.db.database import get_db
-from app.models.models import User
-import os
+from app.models.models import User, Employee
 from dotenv import load_dotenv
 
 load_dotenv()
 
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM")
+# Wie lange ein aufgelöster User (inkl. Employee) im Prozess gecacht wird
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", "30"))
 
-security = HTTPBearer()
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
+
+# sub (E-Mail) -> (gültig bis, losgelöster User mit geladenem Employee)
+_user_cache = {}
+# user_id -> sub, damit Updates den richtigen Eintrag verwerfen
+_user_index = {}
+_cache_lock = threading.Lock()
+
+
+def invalidate_user(user_id) -> None:
+    """Cache-Eintrag eines Users verwerfen"""
+    with _cache_lock:
+        sub = _user_index.pop(user_id, None)
+        if sub is not None:
+            _user_cache.pop(sub, None)
+
+
+def clear_user_cache() -> None:
+    with _cache_lock:
+        _user_cache.clear()
+        _user_index.clear()
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_changed(mapper, connection, target):
+    invalidate_user(target.id)
+
+
+@event.listens_for(Employee, "after_insert")
+@event.listens_for(Employee, "after_update")
+@event.listens_for(Employee, "after_delete")
+def _employee_changed(mapper, connection, target):
+    invalidate_user(target.user_id)
+
+
+def _cached_user(sub: str):
+    with _cache_lock:
+        hit = _user_cache.get(sub)
+        if hit is None:
+            return None
+        expires_at, user = hit
+        if expires_at < time.monotonic():
+            _user_cache.pop(sub, None)
+            _user_index.pop(user.id, None)
+            return None
+        return user
+
+
+def _load_user(db: Session, sub: str):
+    """User + Employee in EINER Abfrage laden und für den Cache ablegen"""
+    user = db.query(User).options(
+        joinedload(User.employee)
+    ).filter(User.email == sub).first()
+    if user is None:
+        return None
+
+    # Losgelöste Kopie in den Cache; die Session bekommt per merge eine eigene
+    db.expunge(user)
+    if user.employee is not None:
+        db.expunge(user.employee)
+    with _cache_lock:
+        _user_cache[sub] = (time.monotonic() + AUTH_CACHE_TTL, user)
+        _user_index[user.id] = sub
+    return user
+
+
+def user_from_token(db: Session, token: Optional[str], scope: Optional[str] = None) -> User:
+    """User zu einem JWT, 401 wenn ungültig
+
+    Ohne scope nur normale Login-Tokens; mit scope nur Stream-Tokens genau
+    dieses Endpoints (create_stream_token), so taugt keines für das andere.
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Token ungültig",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    if not token:
+        raise credentials_exception
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    token = credentials.credentials
-    
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
-        if email is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication credentials",
-            )
+        if email is None or payload.get("scope") != scope:
+            raise credentials_exception
     except JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials",
-        )
-    
-    user = db.query(User).filter(User.email == email).first()
+        raise credentials_exception
+
+    user = _cached_user(email) if AUTH_CACHE_TTL > 0 else None
     if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-        )
-    
-    return user
+        user = _load_user(db, email)
+        if user is None:
+            raise credentials_exception
+
+    return db.merge(user, load=False)
+
+
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> User:
+    """Aktuellen User aus dem JWT holen, Employee ist bereits geladen
+
+    FastAPI löst die Dependency pro Request nur einmal auf (auch wenn
+    verify_admin und der Endpoint sie beide nutzen). Zwischen Requests
+    hält ein kurzer Prozess-Cache den User; bei einem Treffer wird er
+    per merge(load=False) ohne SELECT an die Request-Session gehängt.
+    Änderungen über das ORM verwerfen den Eintrag sofort, Bulk-Updates
+    (query.update) erst nach Ablauf von AUTH_CACHE_TTL.
+    """
+    return user_from_token(db, token)
+
+
+def get_current_employee(current_user: User = Depends(get_current_user)) -> Employee:
+    """Employee des eingeloggten Users, 404 wenn keiner angelegt ist"""
+    if current_user.employee is None:
+        raise HTTPException(status_code=404, detail="Mitarbeiter nicht gefunden")
+    return current_user.employee
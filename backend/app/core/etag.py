@@ -0,0 +1,47 @@
+import hashlib
+from fastapi import Request, Response
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+# Browser fragt bei jedem Abruf nach (If-None-Match), nutzt aber den Cache
+CACHE_CONTROL = "private, no-cache"
+
+
+def table_fingerprint(db: Session, *models) -> str:
+    """Stand mehrerer Tabellen in einer Abfrage: Anzahl, höchste id, letzte Änderung
+
+    Anzahl/id erkennen Löschungen und Neuanlagen, updated_at Änderungen.
+    """
+    columns = []
+    for model in models:
+        columns += [
+            select(func.count(model.id)).scalar_subquery(),
+            select(func.max(model.id)).scalar_subquery(),
+            select(func.max(model.updated_at)).scalar_subquery(),
+        ]
+    return "|".join(str(value) for value in db.execute(select(*columns)).one())
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'W/"{digest[:24]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match gegen das aktuelle ETag prüfen (schwacher Vergleich)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
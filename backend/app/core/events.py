@@ -0,0 +1,175 @@
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import date, datetime
+from typing import NamedTuple, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+# Ereignisse rund um Stempelungen
+#
+# Endpoints rufen emit(db, Ereignis) VOR dem commit auf; verteilt wird erst
+# nach erfolgreichem commit (Session-Event unten), bei rollback verworfen.
+# Abonnenten laufen danach nacheinander im Hintergrund-Worker des Busses,
+# nicht mehr im Request. Ohne laufenden Bus (Skripte, Tests ohne Startup)
+# werden synchrone Abonnenten direkt ausgeführt.
+
+
+class CheckedIn(NamedTuple):
+    employee_id: int
+    time_entry_id: int
+    object_id: Optional[int]
+    check_in: datetime
+    gps_lat: Optional[float] = None
+    gps_lng: Optional[float] = None
+
+
+class CheckedOut(NamedTuple):
+    employee_id: int
+    time_entry_id: int
+    object_id: Optional[int]
+    check_in: datetime
+    check_out: datetime
+    automatic: bool = False      # vom System geschlossen (neuer Check-in, Zombie)
+
+
+class ObjectSwitched(NamedTuple):
+    employee_id: int
+    from_entry_id: int
+    from_object_id: Optional[int]
+    from_check_in: datetime
+    to_entry_id: int
+    to_object_id: Optional[int]
+    switched_at: datetime
+
+
+class BreakStarted(NamedTuple):
+    employee_id: int
+    time_entry_id: int
+    break_id: int
+    start_time: datetime
+
+
+class BreakEnded(NamedTuple):
+    employee_id: int
+    time_entry_id: int
+    break_id: int
+    start_time: datetime
+    end_time: datetime
+
+
+class CorrectionApproved(NamedTuple):
+    correction_id: int
+    employee_id: int
+    time_entry_id: int
+    correction_type: str
+    days: Tuple[Tuple[int, date], ...]   # betroffene (Mitarbeiter, Tag), alt und neu
+
+
+class EntryBooked(NamedTuple):
+    """Abgeschlossene Stempelung in einem Schritt (War-da-Buttons)"""
+    employee_id: int
+    time_entry_id: int
+    object_id: Optional[int]
+    check_in: datetime
+    check_out: datetime
+    source: str
+
+
+class EventBus:
+    def __init__(self):
+        self._handlers = defaultdict(list)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def subscribe(self, *event_types):
+        """Decorator: Funktion (sync oder async) für diese Ereignistypen registrieren"""
+        def register(handler):
+            for event_type in event_types:
+                self._handlers[event_type].append(handler)
+            return handler
+        return register
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    def publish(self, evt) -> None:
+        """Ereignis einreihen (threadsicher); ohne Worker direkt ausführen"""
+        if self.running:
+            try:
+                self._loop.call_soon_threadsafe(self._queue.put_nowait, evt)
+                return
+            except RuntimeError:
+                # Event-Loop schon beendet (Shutdown)
+                pass
+        self.dispatch_sync(evt)
+
+    def dispatch_sync(self, evt) -> None:
+        for handler in self._handlers.get(type(evt), ()):
+            try:
+                if asyncio.iscoroutinefunction(handler):
+                    asyncio.run(handler(evt))
+                else:
+                    handler(evt)
+            except Exception:
+                logger.exception("Abonnent %s für %s fehlgeschlagen", handler.__name__, type(evt).__name__)
+
+    async def _dispatch(self, evt) -> None:
+        for handler in self._handlers.get(type(evt), ()):
+            try:
+                if asyncio.iscoroutinefunction(handler):
+                    await handler(evt)
+                else:
+                    await run_in_threadpool(handler, evt)
+            except Exception:
+                logger.exception("Abonnent %s für %s fehlgeschlagen", handler.__name__, type(evt).__name__)
+
+    async def _run(self) -> None:
+        while True:
+            evt = await self._queue.get()
+            try:
+                await self._dispatch(evt)
+            finally:
+                self._queue.task_done()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Offene Ereignisse noch abarbeiten (höchstens timeout Sekunden), dann beenden"""
+        if not self.running:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Event-Bus beendet mit %d offenen Ereignissen", self._queue.qsize())
+        self._worker.cancel()
+        self._worker = None
+
+
+bus = EventBus()
+
+
+def emit(db: Session, evt) -> None:
+    """Ereignis für nach dem commit dieser Session vormerken"""
+    db.info.setdefault("pending_events", []).append(evt)
+
+
+@event.listens_for(Session, "after_commit")
+def _session_committed(session):
+    for evt in session.info.pop("pending_events", ()):
+        bus.publish(evt)
+
+
+@event.listens_for(Session, "after_rollback")
+def _session_rolled_back(session):
+    session.info.pop("pending_events", None)
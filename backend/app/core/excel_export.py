@@ -0,0 +1,69 @@
+import os
+import tempfile
+import xlsxwriter
+
+EXCEL_COLUMNS = ['Personal-Nr', 'Name', 'Datum', 'Check-In', 'Check-Out', 'Stunden', 'Stundensatz', 'Lohn']
+CHUNK_SIZE = 64 * 1024
+
+
+def write_timesheet_workbook(rows, path: str) -> int:
+    """Schreibt Export-Zeilen in eine xlsx-Datei, Zeile für Zeile
+
+    constant_memory: xlsxwriter hält immer nur die aktuelle Zeile im
+    Speicher und schreibt den Rest direkt in temporäre Dateien.
+    Gibt die Anzahl der geschriebenen Einträge zurück.
+    """
+    workbook = xlsxwriter.Workbook(path, {'constant_memory': True})
+    try:
+        sheet = workbook.add_worksheet('Zeiterfassung')
+        sheet.write_row(0, 0, EXCEL_COLUMNS)
+
+        count = 0
+        for row in rows:
+            hours = (row.check_out - row.check_in).total_seconds() / 3600
+            rate = row.employee_rate or 0
+            count += 1
+            sheet.write_row(count, 0, [
+                row.personal_nr,
+                f"{row.first_name} {row.last_name}",
+                row.check_in.strftime('%d.%m.%Y'),
+                row.check_in.strftime('%H:%M'),
+                row.check_out.strftime('%H:%M'),
+                round(hours, 2),
+                rate,
+                round(hours * rate, 2)
+            ])
+
+        if count == 0:
+            sheet.write_row(1, 0, ['Keine Daten für diesen Monat'])
+    finally:
+        workbook.close()
+
+    return count
+
+
+def build_timesheet_file(rows) -> str:
+    """Export in eine temporäre Datei schreiben, Pfad zurückgeben"""
+    fd, path = tempfile.mkstemp(prefix="seda24_export_", suffix=".xlsx")
+    os.close(fd)
+    try:
+        write_timesheet_workbook(rows, path)
+    except Exception:
+        os.remove(path)
+        raise
+    return path
+
+
+def iter_file_chunks(path: str, chunk_size: int = CHUNK_SIZE):
+    """Datei in Blöcken ausliefern (für StreamingResponse)
+
+    Das Löschen übernimmt der Aufrufer per BackgroundTask - ein Generator,
+    der nach einem Verbindungsabbruch nie weiterläuft, erreicht sein
+    finally nicht zuverlässig.
+    """
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
@@ -0,0 +1,297 @@
+import math
+import os
+import threading
+import time
+from typing import List, NamedTuple, Optional, Sequence
+import numpy as np
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from app.models.models import Object
+
+EARTH_RADIUS_M = 6371000.0
+# Spätestens nach dieser Zeit neu laden (Änderungen aus Skripten/anderen Prozessen)
+GEOFENCE_MAX_AGE = float(os.getenv("GEOFENCE_MAX_AGE", "300"))
+# Zeilen pro Block bei Batch-Abfragen (Speicher: Block x Objekte x 8 Byte)
+BATCH_CHUNK = 2048
+# Kantenlänge einer Gitterzelle in Grad (0.01° ~ 1,1 km Nord-Süd)
+GEOFENCE_CELL_DEG = float(os.getenv("GEOFENCE_CELL_DEG", "0.01"))
+# Mehr Zellen als das abzusuchen lohnt nicht - dann linear über alle Objekte
+MAX_GRID_CELLS = 400
+METERS_PER_DEG_LAT = 111320.0
+
+
+class _Snapshot(NamedTuple):
+    ids: np.ndarray
+    names: List[str]
+    lat: np.ndarray          # Bogenmaß
+    lng: np.ndarray          # Bogenmaß
+    cos_lat: np.ndarray
+    radius_m: np.ndarray
+    positions: dict          # object_id -> Index in den Arrays
+    grid: dict               # (Zeile, Spalte) -> Indizes der Objekte in dieser Zelle
+    cell_deg: float
+    max_radius_m: float
+    loaded_at: float
+
+
+def _cell(lat: float, lng: float, cell_deg: float):
+    return math.floor(lat / cell_deg), math.floor(lng / cell_deg)
+
+
+def build_snapshot(rows, cell_deg: float = GEOFENCE_CELL_DEG) -> _Snapshot:
+    """Arrays + Gitter aus (id, name, gps_lat, gps_lng, radius_m)-Zeilen bauen"""
+    rows = list(rows)
+    lat_deg = np.array([r[2] for r in rows], dtype=np.float64)
+    lng_deg = np.array([r[3] for r in rows], dtype=np.float64)
+    radius = np.array([r[4] or 100 for r in rows], dtype=np.float64)
+
+    buckets = {}
+    for i in range(len(rows)):
+        buckets.setdefault(_cell(float(lat_deg[i]), float(lng_deg[i]), cell_deg), []).append(i)
+
+    lat = np.radians(lat_deg)
+    return _Snapshot(
+        ids=np.array([r[0] for r in rows], dtype=np.int64),
+        names=[r[1] for r in rows],
+        lat=lat,
+        lng=np.radians(lng_deg),
+        cos_lat=np.cos(lat),
+        radius_m=radius,
+        positions={r[0]: i for i, r in enumerate(rows)},
+        grid={key: np.array(idx, dtype=np.int64) for key, idx in buckets.items()},
+        cell_deg=cell_deg,
+        max_radius_m=float(radius.max()) if len(rows) else 0.0,
+        loaded_at=time.monotonic()
+    )
+
+
+def _empty_snapshot() -> _Snapshot:
+    snapshot = build_snapshot([])
+    return snapshot._replace(loaded_at=0.0)
+
+
+def grid_candidates(snap: _Snapshot, lat: float, lng: float, radius_m: float) -> Optional[np.ndarray]:
+    """Indizes aller Objekte in Gitterzellen, die den Kreis berühren können
+
+    None, wenn der Kreis zu viele Zellen überdeckt (dann linear suchen).
+    """
+    dlat = radius_m / METERS_PER_DEG_LAT
+    dlng = radius_m / (METERS_PER_DEG_LAT * max(math.cos(math.radians(lat)), 0.01))
+    row_min, col_min = _cell(lat - dlat, lng - dlng, snap.cell_deg)
+    row_max, col_max = _cell(lat + dlat, lng + dlng, snap.cell_deg)
+    if (row_max - row_min + 1) * (col_max - col_min + 1) > MAX_GRID_CELLS:
+        return None
+
+    found = [
+        snap.grid[key]
+        for key in (
+            (row, col)
+            for row in range(row_min, row_max + 1)
+            for col in range(col_min, col_max + 1)
+        )
+        if key in snap.grid
+    ]
+    if not found:
+        return np.empty(0, dtype=np.int64)
+    return np.concatenate(found) if len(found) > 1 else found[0]
+
+
+def haversine_m(lat, lng, lat_rad, lng_rad, cos_lat):
+    """Haversine-Distanz in Metern, numpy-broadcastend
+
+    lat/lng in Grad (Skalar oder Spalte), Objekte als Bogenmaß-Arrays.
+    """
+    phi = np.radians(lat)
+    lam = np.radians(lng)
+    a = np.sin((lat_rad - phi) / 2) ** 2 + np.cos(phi) * cos_lat * np.sin((lng_rad - lam) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class GeofenceIndex:
+    """Alle aktiven Objekte mit GPS als NumPy-Arrays
+
+    Der Snapshot wird als Ganzes ausgetauscht, Leser brauchen daher kein
+    Lock. Nach einem commit, der Objekte angelegt/geändert/gelöscht hat,
+    wird er als veraltet markiert und beim nächsten Zugriff neu geladen.
+    """
+
+    def __init__(self):
+        self._snapshot = _empty_snapshot()
+        self._dirty = True
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        self._dirty = True
+
+    def load(self, db: Session) -> _Snapshot:
+        rows = db.query(
+            Object.id, Object.name, Object.gps_lat, Object.gps_lng, Object.radius_m
+        ).filter(
+            Object.is_active == True,
+            Object.gps_lat != None,
+            Object.gps_lng != None
+        ).order_by(Object.id).all()
+
+        snapshot = build_snapshot(rows)
+        self._snapshot = snapshot
+        return snapshot
+
+    def snapshot(self, db: Session) -> _Snapshot:
+        snapshot = self._snapshot
+        if self._dirty or time.monotonic() - snapshot.loaded_at > GEOFENCE_MAX_AGE:
+            with self._lock:
+                if self._dirty or time.monotonic() - self._snapshot.loaded_at > GEOFENCE_MAX_AGE:
+                    # Flag vor dem Laden zurücksetzen: ein paralleler commit markiert erneut
+                    self._dirty = False
+                    snapshot = self.load(db)
+                else:
+                    snapshot = self._snapshot
+        return snapshot
+
+    def locate(self, db: Session, lat: float, lng: float, limit: int = 5) -> List[dict]:
+        """Die nächsten Objekte zu einem GPS-Punkt, mit Innerhalb-Radius-Flag"""
+        snap = self.snapshot(db)
+        if not len(snap.ids):
+            return []
+
+        distances = haversine_m(lat, lng, snap.lat, snap.lng, snap.cos_lat)
+        limit = min(limit, len(distances))
+        nearest = np.argpartition(distances, limit - 1)[:limit]
+        nearest = nearest[np.argsort(distances[nearest])]
+
+        return [{
+            "object_id": int(snap.ids[i]),
+            "name": snap.names[i],
+            "distance_meters": round(float(distances[i]), 2),
+            "radius_m": int(snap.radius_m[i]),
+            "inside": bool(distances[i] <= snap.radius_m[i])
+        } for i in nearest]
+
+    def nearby(self, db: Session, lat: float, lng: float, radius_m: Optional[float] = None, limit: int = 10) -> List[dict]:
+        """Objekte im Umkreis, nach Distanz sortiert (über das Gitter)
+
+        Ohne radius_m: alle Objekte, in deren eigenem radius_m der Punkt
+        liegt ("wo stehe ich gerade?").
+        """
+        snap = self.snapshot(db)
+        if not len(snap.ids):
+            return []
+
+        search_radius = radius_m if radius_m is not None else snap.max_radius_m
+        candidates = grid_candidates(snap, lat, lng, search_radius)
+        if candidates is None:
+            candidates = np.arange(len(snap.ids))
+        if not len(candidates):
+            return []
+
+        distances = haversine_m(lat, lng, snap.lat[candidates], snap.lng[candidates], snap.cos_lat[candidates])
+        limits = snap.radius_m[candidates] if radius_m is None else radius_m
+        hits = np.nonzero(distances <= limits)[0]
+        hits = hits[np.argsort(distances[hits])][:limit]
+
+        return [{
+            "object_id": int(snap.ids[candidates[h]]),
+            "name": snap.names[candidates[h]],
+            "distance_meters": round(float(distances[h]), 2),
+            "radius_m": int(snap.radius_m[candidates[h]]),
+            "inside": bool(distances[h] <= snap.radius_m[candidates[h]])
+        } for h in hits]
+
+    def distance_to(self, db: Session, object_id: int, lat: float, lng: float) -> Optional[dict]:
+        """Distanz zu einem bestimmten Objekt (None: unbekannt/inaktiv/ohne GPS)"""
+        snap = self.snapshot(db)
+        i = snap.positions.get(object_id)
+        if i is None:
+            return None
+        distance = float(haversine_m(lat, lng, snap.lat[i], snap.lng[i], snap.cos_lat[i]))
+        return {
+            "object_id": object_id,
+            "name": snap.names[i],
+            "distance_meters": round(distance, 2),
+            "radius_m": int(snap.radius_m[i]),
+            "inside": distance <= snap.radius_m[i]
+        }
+
+    def locate_many(
+        self,
+        db: Session,
+        lats: Sequence[float],
+        lngs: Sequence[float],
+        object_ids: Optional[Sequence[Optional[int]]] = None
+    ) -> dict:
+        """Viele GPS-Punkte auf einmal (z.B. historische Check-ins nachprüfen)
+
+        Liefert Arrays gleicher Länge: nächstes Objekt, dessen Distanz und
+        ob der Punkt in dessen Radius liegt. Mit object_ids (gebuchtes
+        Objekt je Punkt) zusätzlich Distanz/Innerhalb für genau dieses
+        Objekt; NaN/False, wenn es nicht im Index ist.
+        """
+        snap = self.snapshot(db)
+        lats = np.asarray(lats, dtype=np.float64)
+        lngs = np.asarray(lngs, dtype=np.float64)
+        count = len(lats)
+
+        nearest_ids = np.full(count, -1, dtype=np.int64)
+        nearest_distance = np.full(count, np.nan)
+        nearest_inside = np.zeros(count, dtype=bool)
+        expected_distance = np.full(count, np.nan)
+        expected_inside = np.zeros(count, dtype=bool)
+
+        if object_ids is not None:
+            expected_pos = np.array(
+                [snap.positions.get(oid, -1) if oid is not None else -1 for oid in object_ids],
+                dtype=np.int64
+            )
+
+        if len(snap.ids):
+            for start in range(0, count, BATCH_CHUNK):
+                block = slice(start, start + BATCH_CHUNK)
+                distances = haversine_m(
+                    lats[block, None], lngs[block, None],
+                    snap.lat[None, :], snap.lng[None, :], snap.cos_lat[None, :]
+                )
+                rows = np.arange(distances.shape[0])
+                best = distances.argmin(axis=1)
+                nearest_ids[block] = snap.ids[best]
+                nearest_distance[block] = distances[rows, best]
+                nearest_inside[block] = distances[rows, best] <= snap.radius_m[best]
+
+                if object_ids is not None:
+                    pos = expected_pos[block]
+                    known = pos >= 0
+                    expected_distance[block][known] = distances[rows[known], pos[known]]
+                    expected_inside[block][known] = distances[rows[known], pos[known]] <= snap.radius_m[pos[known]]
+
+        result = {
+            "nearest_object_id": nearest_ids,
+            "nearest_distance_m": nearest_distance,
+            "nearest_inside": nearest_inside,
+        }
+        if object_ids is not None:
+            result["object_distance_m"] = expected_distance
+            result["object_inside"] = expected_inside
+        return result
+
+
+geofence = GeofenceIndex()
+
+
+# Objekte geändert -> nach dem commit neu laden
+@event.listens_for(Object, "after_insert")
+@event.listens_for(Object, "after_update")
+@event.listens_for(Object, "after_delete")
+def _object_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info["geofence_dirty"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _session_committed(session):
+    if session.info.pop("geofence_dirty", False):
+        geofence.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _session_rolled_back(session):
+    session.info.pop("geofence_dirty", None)
@@ -0,0 +1,379 @@
+import csv
+import io
+import time as timer
+from datetime import date, datetime, time, timedelta
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Tuple
+from sqlalchemy import (
+    Boolean, Column, DateTime, Index, Integer, MetaData, Table, Text,
+    and_, case, cast, exists, func, insert, literal, or_, select, update
+)
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateTable
+from app.models.models import Employee, Object, TimeEntry, User
+from app.core.import_service import ImportValidationError, MAX_REPORTED, _date, _time, read_rows
+from app.core.rollup_service import rebuild
+
+# Historische Stempelungen in großen Mengen laden (scripts/load_time_entries.py)
+#
+# Ablauf: Datei (Format wie der CSV-Export, siehe report_service.CSV_COLUMNS)
+# zeilenweise lesen und in eine temporäre Staging-Tabelle streamen - unter
+# PostgreSQL per COPY FROM STDIN, sonst (lokale Tests) per executemany.
+# Danach wird mengenbasiert geprüft: Mitarbeiter/Objekt auflösen, schon
+# vorhandene Stempelungen überspringen (gleicher MA + check_in - erneutes
+# Laden derselben Datei ändert nichts), Überschneidungen mit dem Bestand
+# und innerhalb der Datei als Fehler melden. Übernommen wird mit einem
+# INSERT ... SELECT, die Tagessummen mit einem rebuild(). Kein commit -
+# das macht der Aufrufer.
+
+# Länger kann eine einzelne Stempelung nicht sein
+MAX_ENTRY = timedelta(hours=24)
+# Zeilen pro Block beim Streamen in die Staging-Tabelle
+COPY_CHUNK = 10000
+# So schreibt der CSV-Export Stempelungen ohne Objekt
+UNKNOWN_OBJECT = 'unbekannt'
+DEFAULT_SERVICE_TYPE = 'Unterhaltsreinigung'
+DEFAULT_HOURLY_RATE = 15.0
+
+_metadata = MetaData()
+staging = Table(
+    'import_time_entries', _metadata,
+    Column('line', Integer),
+    Column('reference', Text),          # Personalnummer oder E-Mail
+    Column('employee_name', Text),
+    Column('object_name', Text),
+    Column('check_in', DateTime),
+    Column('check_out', DateTime),
+    Column('earliest', DateTime),       # check_in - MAX_ENTRY
+    Column('service_type', Text),
+    Column('notes', Text),
+    Column('employee_id', Integer),
+    Column('object_id', Integer),
+    Column('existing', Boolean),
+    Column('error', Text),
+    Index('ix_import_time_entries_employee_check_in', 'employee_id', 'check_in'),
+    prefixes=['TEMPORARY'],
+    postgresql_on_commit='DROP',
+)
+COPY_COLUMNS = (
+    'line', 'reference', 'employee_name', 'object_name', 'check_in', 'check_out', 'earliest', 'service_type', 'notes'
+)
+
+
+# ----- Lesen -----
+
+def _moment(value, day: Optional[date]) -> datetime:
+    """Zeitstempel aus Datum + Uhrzeit ("07:30") oder vollständigem Wert"""
+    if isinstance(value, datetime):
+        return value.replace(microsecond=0)
+    if isinstance(value, time):
+        if day is None:
+            raise ImportValidationError("Datum fehlt")
+        return datetime.combine(day, value.replace(microsecond=0))
+    text = str(value).strip()
+    if len(text) <= 8:
+        if day is None:
+            raise ImportValidationError("Datum fehlt")
+        return datetime.combine(day, _time(text))
+    for fmt in ('%d.%m.%Y %H:%M', '%d.%m.%Y %H:%M:%S'):
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+    try:
+        return datetime.fromisoformat(text).replace(tzinfo=None, microsecond=0)
+    except ValueError:
+        raise ImportValidationError(f"Ungültiger Zeitpunkt: {value!r}")
+
+
+def _staging_row(line: int, row: dict) -> tuple:
+    if 'check_in' not in row or 'check_out' not in row:
+        raise ImportValidationError("Einstempelung und Ausstempelung erforderlich")
+    day = _date(row['date']) if 'date' in row else None
+    check_in = _moment(row['check_in'], day)
+    check_out = _moment(row['check_out'], day or check_in.date())
+    if check_out <= check_in and not isinstance(row['check_out'], datetime) and len(str(row['check_out']).strip()) <= 8:
+        check_out += timedelta(days=1)   # Nachtschicht: nur Uhrzeiten angegeben
+    if check_out <= check_in:
+        raise ImportValidationError("Ausstempelung liegt vor der Einstempelung")
+    if check_out - check_in > MAX_ENTRY:
+        raise ImportValidationError("Stempelung länger als 24 Stunden")
+
+    reference = row.get('personal_nr') or row.get('email')
+    name = row.get('employee')
+    if reference is None and name is not None and ('@' in str(name) or not str(name).strip().count(' ')):
+        reference, name = name, None   # "Mitarbeiter" enthält E-Mail/Personalnummer
+    if reference is None and name is None:
+        raise ImportValidationError("Mitarbeiter fehlt (Personalnummer, E-Mail oder Name)")
+    return (
+        line,
+        str(reference).strip() if reference is not None else None,
+        str(name).strip() if name is not None else None,
+        str(row['object']).strip() if 'object' in row else None,
+        check_in,
+        check_out,
+        check_in - MAX_ENTRY,
+        str(row['service_type']).strip() if 'service_type' in row else None,
+        str(row['notes']) if 'notes' in row else None,
+    )
+
+
+def _staging_rows(rows: Iterable[Tuple[int, dict]], errors: List[dict], stats: dict) -> Iterator[tuple]:
+    """Gültig geformte Zeilen für die Staging-Tabelle; Formatfehler landen in errors"""
+    for line, row in rows:
+        stats['rows'] += 1
+        try:
+            yield _staging_row(line, row)
+        except ImportValidationError as e:
+            stats['invalid'] += 1
+            if len(errors) < MAX_REPORTED:
+                errors.append({'line': line, 'error': str(e)})
+
+
+class _CsvStream:
+    """Dateiähnliches Objekt für copy_expert: erzeugt CSV-Text blockweise"""
+
+    def __init__(self, rows: Iterator[tuple]):
+        self._rows = rows
+        self._buffer = ''
+
+    def _fill(self, size: int) -> None:
+        out = io.StringIO()
+        writer = csv.writer(out, lineterminator='\n')
+        while len(self._buffer) + out.tell() < size:
+            chunk = [row for _, row in zip(range(COPY_CHUNK), self._rows)]
+            if not chunk:
+                break
+            writer.writerows(
+                tuple('' if value is None else value.isoformat(sep=' ') if isinstance(value, datetime) else value
+                      for value in row)
+                for row in chunk
+            )
+        self._buffer += out.getvalue()
+
+    def read(self, size: int = -1) -> str:
+        if size is None or size < 0:
+            self._fill(float('inf'))
+            size = len(self._buffer)
+        else:
+            self._fill(size)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def readline(self, size: int = -1) -> str:
+        if '\n' not in self._buffer:
+            self._fill(len(self._buffer) + 1)
+        end = self._buffer.find('\n') + 1 or len(self._buffer)
+        data, self._buffer = self._buffer[:end], self._buffer[end:]
+        return data
+
+
+def _load_staging(db: Session, rows: Iterator[tuple]) -> None:
+    connection = db.connection()
+    staging.drop(connection, checkfirst=True)
+    connection.execute(CreateTable(staging))   # Index erst nach dem Laden
+    if connection.dialect.name == 'postgresql':
+        # Eine COPY-Anweisung für die ganze Datei, ohne Roundtrip pro Zeile
+        cursor = connection.connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {staging.name} ({', '.join(COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                _CsvStream(rows)
+            )
+        finally:
+            cursor.close()
+    else:
+        while True:
+            chunk = [dict(zip(COPY_COLUMNS, row)) for _, row in zip(range(COPY_CHUNK), rows)]
+            if not chunk:
+                break
+            connection.execute(insert(staging), chunk)
+    for index in staging.indexes:
+        index.create(connection)
+    if connection.dialect.name == 'postgresql':
+        connection.exec_driver_sql(f"ANALYZE {staging.name}")
+
+
+# ----- Prüfen -----
+
+def _resolve(db: Session) -> None:
+    """Mitarbeiter und Objekte per UPDATE ... FROM zuordnen"""
+    s = staging.c
+    db.execute(update(staging).where(
+        func.lower(s.reference) == func.lower(User.email),
+        Employee.user_id == User.id
+    ).values(employee_id=Employee.id))
+    db.execute(update(staging).where(
+        s.employee_id == None,
+        s.reference == Employee.personal_nr
+    ).values(employee_id=Employee.id))
+    # Name nur, wenn er eindeutig ist
+    full_name = Employee.first_name + ' ' + Employee.last_name
+    names = select(
+        full_name.label('name'), func.min(Employee.id).label('id')
+    ).group_by(full_name).having(func.count(Employee.id) == 1).subquery('names')
+    db.execute(update(staging).where(
+        s.employee_id == None,
+        s.reference == None,
+        func.lower(s.employee_name) == func.lower(names.c.name)
+    ).values(employee_id=names.c.id))
+
+    objects = select(
+        func.lower(func.trim(Object.name)).label('name'), func.min(Object.id).label('id')
+    ).group_by(func.lower(func.trim(Object.name))).having(func.count(Object.id) == 1).subquery('objects')
+    db.execute(update(staging).where(
+        func.lower(s.object_name) == objects.c.name
+    ).values(object_id=objects.c.id))
+
+
+def _validate(db: Session) -> None:
+    s = staging.c
+
+    def mark(message, *criteria):
+        db.execute(update(staging).where(s.error == None, *criteria).values(error=message))
+
+    mark(literal('Mitarbeiter ') + func.coalesce(s.reference, s.employee_name) + ' nicht gefunden',
+         s.employee_id == None)
+    mark(literal('Objekt ') + s.object_name + ' nicht gefunden oder nicht eindeutig',
+         s.object_id == None, s.object_name != None, func.lower(s.object_name) != UNKNOWN_OBJECT)
+
+    # Schon geladen (gleicher Mitarbeiter, gleicher Beginn) -> überspringen
+    db.execute(update(staging).where(s.error == None, exists().where(
+        TimeEntry.employee_id == s.employee_id,
+        TimeEntry.check_in == s.check_in
+    )).values(existing=True))
+
+    # Abgeschlossene Stempelungen dauern höchstens MAX_ENTRY - so bleibt
+    # die Suche ein kurzer Bereich im Index (employee_id, check_in)
+    mark('Überschneidung mit vorhandener Stempelung', s.existing == None, exists().where(
+        TimeEntry.employee_id == s.employee_id,
+        TimeEntry.check_in < s.check_out,
+        or_(
+            TimeEntry.check_out == None,
+            and_(TimeEntry.check_in >= s.earliest, TimeEntry.check_out > s.check_in)
+        )
+    ))
+
+    # Innerhalb der Datei: nach Beginn sortiert darf keine Zeile vor dem
+    # spätesten Ende ihrer Vorgänger anfangen (Fensterfunktion statt Self-Join)
+    window = dict(partition_by=s.employee_id, order_by=(s.check_in, s.line))
+    previous = select(
+        s.line,
+        func.max(s.check_out).over(rows=(None, -1), **window).label('previous_end'),
+        func.lag(s.line).over(**window).label('previous_line')
+    ).where(s.error == None).subquery('previous')
+    # Eine Zeile, die dem Bestand entspricht, kann trotzdem doppelt in der Datei stehen
+    db.execute(update(staging).where(
+        s.line == previous.c.line,
+        s.check_in < previous.c.previous_end
+    ).values(
+        error=literal('Überschneidung mit Zeile ') + cast(previous.c.previous_line, Text),
+        existing=None
+    ))
+
+
+def _ready():
+    return and_(staging.c.error == None, staging.c.existing == None)
+
+
+# ----- Laden -----
+
+def load_time_entries(
+    db: Session,
+    stream: BinaryIO,
+    filename: str,
+    dry_run: bool = True,
+    skip_invalid: bool = False,
+    note: Optional[str] = None
+) -> dict:
+    """Stempelungen aus CSV/XLSX über eine Staging-Tabelle übernehmen
+
+    Ohne skip_invalid wird nur geladen, wenn keine Zeile fehlerhaft ist.
+    Gibt Zähler, die ersten Fehler, die Laufzeiten der Phasen und
+    Zeilen pro Sekunde zurück.
+    """
+    started = timer.perf_counter()
+    timings = {}
+    errors = []
+    stats = {'rows': 0, 'invalid': 0}
+
+    def lap(name, since):
+        timings[name] = round(timer.perf_counter() - since, 3)
+        return timer.perf_counter()
+
+    step = started
+    _load_staging(db, _staging_rows(read_rows(stream, filename), errors, stats))
+    step = lap('copy', step)
+
+    _resolve(db)
+    _validate(db)
+    s = staging.c
+    invalid, existing, ready = db.execute(select(
+        func.count(s.error),
+        func.count(s.existing),
+        func.coalesce(func.sum(case((_ready(), 1), else_=0)), 0)
+    )).one()
+    errors += [
+        {'line': line, 'error': error}
+        for line, error in db.execute(
+            select(s.line, s.error).where(s.error != None).order_by(s.line).limit(MAX_REPORTED)
+        )
+    ]
+    errors = sorted(errors, key=lambda error: error['line'])[:MAX_REPORTED]
+    step = lap('validate', step)
+
+    counts = {
+        'rows': stats['rows'],
+        'invalid': stats['invalid'] + invalid,
+        'existing': existing,
+        'loaded': 0,
+        'rollups': 0,
+    }
+    applied = not dry_run and ready > 0 and (skip_invalid or counts['invalid'] == 0)
+    if applied:
+        note = note or f"[IMPORT {filename}]"
+        service_type = func.coalesce(s.service_type, DEFAULT_SERVICE_TYPE)
+        counts['loaded'] = db.execute(insert(TimeEntry).from_select([
+            TimeEntry.employee_id,
+            TimeEntry.object_id,
+            TimeEntry.check_in,
+            TimeEntry.check_out,
+            TimeEntry.service_type,
+            TimeEntry.hourly_rate,
+            TimeEntry.is_manual_entry,
+            TimeEntry.notes,
+            TimeEntry.created_at,
+        ], select(
+            s.employee_id,
+            s.object_id,
+            s.check_in,
+            s.check_out,
+            service_type,
+            # Stundensatz des Mitarbeiters je Leistungsart (wie beim Stempeln)
+            func.coalesce(case(
+                (service_type == 'Fensterreinigung', Employee.hourly_rate_window),
+                (service_type == 'Grundreinigung', Employee.hourly_rate_basic),
+                else_=Employee.hourly_rate_standard
+            ), DEFAULT_HOURLY_RATE),
+            literal(False),
+            func.coalesce(s.notes, note),
+            literal(datetime.utcnow(), DateTime),
+        ).join_from(
+            staging, Employee, Employee.id == s.employee_id
+        ).where(_ready()).order_by(s.check_in))).rowcount
+        step = lap('merge', step)
+
+        first, last = db.execute(select(func.min(s.check_in), func.max(s.check_in)).where(_ready())).one()
+        employee_ids = db.execute(select(s.employee_id).where(_ready()).distinct()).scalars().all()
+        counts['rollups'] = rebuild(db, first.date(), last.date(), employee_ids)
+        lap('rollups', step)
+
+    total = timer.perf_counter() - started
+    timings['total'] = round(total, 3)
+    return {
+        'dry_run': dry_run,
+        'applied': applied,
+        'counts': counts,
+        'errors': errors,
+        'timings': timings,
+        'rows_per_second': round(stats['rows'] / total) if total > 0 else None,
+    }
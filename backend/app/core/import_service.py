@@ -0,0 +1,449 @@
+import csv
+import io
+from datetime import date, datetime, time
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+from sqlalchemy import and_, delete, insert, or_, update
+from sqlalchemy.orm import Session
+from app.models.models import Customer, Employee, Object, Schedule, User
+from app.core.schedule_service import (
+    ScheduleValidationError, parse_time, parse_weekday, shift_hours
+)
+
+# Dienstplan- und Kunden/Objekt-Import aus CSV oder XLSX
+#
+# Ablauf für beide Importe: Datei zeilenweise lesen, jede Zeile gegen
+# vorab geladene Nachschlagetabellen (Mitarbeiter per E-Mail/Personalnummer,
+# Objekte/Kunden per Name) prüfen, mit dem Bestand vergleichen und den
+# Unterschied als Vorschau liefern. Geschrieben wird nur ohne Fehler und
+# nur mit dry_run=False: INSERTs und UPDATEs per executemany, kein commit -
+# das macht der Aufrufer. Stempelungen werden nie angefasst.
+
+MAX_IMPORT_ROWS = 100000
+# So viele Fehler/Beispielzeilen kommen höchstens in die Antwort
+MAX_REPORTED = 100
+
+# Spaltenüberschriften (klein geschrieben) -> Feld
+HEADER_ALIASES = {
+    'mitarbeiter': 'employee', 'employee': 'employee',
+    'email': 'email', 'e-mail': 'email',
+    'personalnummer': 'personal_nr', 'personal_nr': 'personal_nr', 'personal-nr': 'personal_nr', 'pnr': 'personal_nr',
+    'objekt': 'object', 'object': 'object',
+    'wochentag': 'weekday', 'weekday': 'weekday', 'tag': 'weekday',
+    'datum': 'date', 'date': 'date',
+    'beginn': 'start_time', 'start': 'start_time', 'start_time': 'start_time', 'von': 'start_time',
+    'ende': 'end_time', 'end': 'end_time', 'end_time': 'end_time', 'bis': 'end_time',
+    'sollstunden': 'planned_hours', 'stunden': 'planned_hours', 'planned_hours': 'planned_hours',
+    'status': 'status',
+    'kunde': 'customer', 'customer': 'customer',
+    'adresse': 'address', 'address': 'address',
+    'lat': 'gps_lat', 'gps_lat': 'gps_lat', 'breitengrad': 'gps_lat',
+    'lng': 'gps_lng', 'lon': 'gps_lng', 'gps_lng': 'gps_lng', 'längengrad': 'gps_lng',
+    'radius': 'radius_m', 'radius_m': 'radius_m',
+    'reinigungsart': 'cleaning_type', 'cleaning_type': 'cleaning_type',
+    # Stempelungen (scripts/load_time_entries.py, Format wie der CSV-Export)
+    'einstempelung': 'check_in', 'check_in': 'check_in', 'kommen': 'check_in',
+    'ausstempelung': 'check_out', 'check_out': 'check_out', 'gehen': 'check_out',
+    'leistungsart': 'service_type', 'service_type': 'service_type',
+    'bemerkung': 'notes', 'notiz': 'notes', 'notes': 'notes',
+}
+
+SCHEDULE_STATUSES = ('normal', 'urlaub', 'krank', 'vertretung')
+
+
+class ImportValidationError(ValueError):
+    pass
+
+
+# ----- Lesen -----
+
+def _header(names) -> List[Optional[str]]:
+    return [HEADER_ALIASES.get(str(name).strip().lower()) if name is not None else None for name in names]
+
+
+def _record(header, values) -> Optional[dict]:
+    record = {}
+    for field, value in zip(header, values):
+        if field is None:
+            continue
+        if isinstance(value, str):
+            value = value.strip()
+        if value not in (None, ''):
+            record[field] = value
+    return record or None
+
+
+def read_rows(stream: BinaryIO, filename: str) -> Iterator[Tuple[int, dict]]:
+    """(Zeilennummer, Felder) aus CSV (; oder ,) bzw. XLSX, Zeile für Zeile
+
+    Unbekannte Spalten und leere Zeilen werden übersprungen.
+    """
+    if filename.lower().endswith(('.xlsx', '.xlsm')):
+        from openpyxl import load_workbook
+        workbook = load_workbook(stream, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = _header(next(rows, ()))
+            for line, values in enumerate(rows, start=2):
+                record = _record(header, values)
+                if record:
+                    yield line, record
+        finally:
+            workbook.close()
+        return
+
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    first = text.readline()
+    delimiter = ';' if first.count(';') >= first.count(',') else ','
+    header = _header(next(csv.reader([first], delimiter=delimiter), []))
+    for line, values in enumerate(csv.reader(text, delimiter=delimiter), start=2):
+        record = _record(header, values)
+        if record:
+            yield line, record
+
+
+def _limited(rows: Iterable[Tuple[int, dict]]) -> Iterator[Tuple[int, dict]]:
+    for count, row in enumerate(rows, start=1):
+        if count > MAX_IMPORT_ROWS:
+            raise ImportValidationError(f"Maximal {MAX_IMPORT_ROWS} Zeilen pro Import")
+        yield row
+
+
+# ----- Werte umwandeln -----
+
+def _time(value) -> time:
+    if isinstance(value, datetime):
+        return value.time().replace(second=0, microsecond=0)
+    try:
+        return parse_time(value)
+    except ScheduleValidationError as e:
+        raise ImportValidationError(str(e))
+
+
+def _date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = str(value).strip()
+    for fmt in ('%Y-%m-%d', '%d.%m.%Y', '%d.%m.%y'):
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    raise ImportValidationError(f"Ungültiges Datum: {value!r}")
+
+
+def _float(value, field: str) -> float:
+    try:
+        return float(str(value).replace(',', '.'))
+    except ValueError:
+        raise ImportValidationError(f"{field} ungültig: {value!r}")
+
+
+def _counts(diff: Dict[str, list], errors: list) -> dict:
+    counts = {kind: len(items) for kind, items in diff.items()}
+    counts['invalid'] = len(errors)
+    return counts
+
+
+# ----- Dienstplan -----
+
+def _schedule_key(values: dict) -> tuple:
+    """Identität einer Schicht: datiert über das Datum, Vorlage über den Wochentag"""
+    return (
+        values['employee_id'], values['object_id'],
+        values['date'], None if values['date'] else values['weekday'],
+        values['start_time']
+    )
+
+
+def _employee_lookup(db: Session):
+    by_email, by_nr = {}, {}
+    for employee_id, email, personal_nr in db.query(
+        Employee.id, User.email, Employee.personal_nr
+    ).outerjoin(User, User.id == Employee.user_id):
+        if email:
+            by_email[email.lower()] = employee_id
+        if personal_nr:
+            by_nr[personal_nr.strip().lower()] = employee_id
+    return by_email, by_nr
+
+
+def _object_lookup(db: Session) -> Dict[str, Optional[int]]:
+    """Objektname (klein) -> id; None, wenn der Name mehrfach vorkommt"""
+    objects = {}
+    for object_id, name in db.query(Object.id, Object.name):
+        if name:
+            key = name.strip().lower()
+            objects[key] = None if key in objects else object_id
+    return objects
+
+
+def _schedule_values(row: dict, by_email: dict, by_nr: dict, objects: dict) -> dict:
+    reference = row.get('email') or row.get('personal_nr') or row.get('employee')
+    if reference is None:
+        raise ImportValidationError("Mitarbeiter fehlt (E-Mail oder Personalnummer)")
+    reference = str(reference).strip().lower()
+    employee_id = by_email.get(reference) if '@' in reference else by_nr.get(reference)
+    if employee_id is None:
+        raise ImportValidationError(f"Mitarbeiter {reference!r} nicht gefunden")
+
+    name = row.get('object')
+    if name is None:
+        raise ImportValidationError("Objekt fehlt")
+    key = str(name).strip().lower()
+    if key not in objects:
+        raise ImportValidationError(f"Objekt {name!r} nicht gefunden")
+    if objects[key] is None:
+        raise ImportValidationError(f"Objektname {name!r} ist nicht eindeutig")
+
+    if 'start_time' not in row or 'end_time' not in row:
+        raise ImportValidationError("Beginn und Ende erforderlich")
+    start_time, end_time = _time(row['start_time']), _time(row['end_time'])
+
+    day = _date(row['date']) if 'date' in row else None
+    if day is not None:
+        weekday = day.weekday()
+    elif 'weekday' in row:
+        try:
+            weekday = parse_weekday(row['weekday'])
+        except ScheduleValidationError as e:
+            raise ImportValidationError(str(e))
+    else:
+        raise ImportValidationError("Wochentag oder Datum erforderlich")
+
+    status = str(row.get('status', 'normal')).strip().lower()
+    if status not in SCHEDULE_STATUSES:
+        raise ImportValidationError(f"Ungültiger Status: {status!r}")
+
+    planned_hours = (
+        _float(row['planned_hours'], 'Sollstunden') if 'planned_hours' in row
+        else shift_hours(start_time, end_time)
+    )
+    return {
+        'employee_id': employee_id,
+        'object_id': objects[key],
+        'weekday': weekday,
+        'date': day,
+        'start_time': start_time,
+        'end_time': end_time,
+        'planned_hours': planned_hours,
+        'status': status,
+    }
+
+
+def _describe(values: dict) -> dict:
+    return {
+        'employee_id': values['employee_id'],
+        'object_id': values['object_id'],
+        'weekday': values['weekday'],
+        'date': values['date'].isoformat() if values['date'] else None,
+        'start_time': values['start_time'].strftime('%H:%M'),
+        'end_time': values['end_time'].strftime('%H:%M'),
+        'planned_hours': values['planned_hours'],
+        'status': values['status'],
+    }
+
+
+def import_schedules(
+    db: Session,
+    rows: Iterable[Tuple[int, dict]],
+    replace: bool = False,
+    dry_run: bool = True
+) -> dict:
+    """Dienstplan importieren: Vorlagen (Wochentag) und datierte Schichten (Datum)
+
+    Schichten werden über Mitarbeiter, Objekt, Wochentag bzw. Datum und
+    Beginn zugeordnet; geändert werden Ende, Sollstunden und Status.
+    replace=True entfernt zusätzlich die Schichten der Mitarbeiter aus der
+    Datei, die dort nicht mehr vorkommen (Vorlagen, datierte nur im
+    Datumsbereich der Datei). Vertretungen bleiben immer unberührt.
+    Drei Lese-Abfragen, egal wie groß die Datei ist.
+    """
+    by_email, by_nr = _employee_lookup(db)
+    objects = _object_lookup(db)
+
+    errors, incoming = [], {}
+    for line, row in _limited(rows):
+        try:
+            values = _schedule_values(row, by_email, by_nr, objects)
+        except ImportValidationError as e:
+            errors.append({'line': line, 'error': str(e)})
+            continue
+        key = _schedule_key(values)
+        if key in incoming:
+            errors.append({'line': line, 'error': f"Doppelt (wie Zeile {incoming[key][0]})"})
+            continue
+        incoming[key] = (line, values)
+
+    diff = {'insert': [], 'update': [], 'unchanged': [], 'delete': []}
+    if incoming:
+        employee_ids = {values['employee_id'] for _, values in incoming.values()}
+        dates = [values['date'] for _, values in incoming.values() if values['date']]
+        in_range = and_(Schedule.date >= min(dates), Schedule.date <= max(dates)) if dates else False
+        existing = {}
+        query = db.query(Schedule).filter(
+            Schedule.employee_id.in_(employee_ids),
+            Schedule.replacement_for == None,
+            or_(Schedule.date == None, in_range)
+        )
+        for schedule in query:
+            existing[_schedule_key({
+                'employee_id': schedule.employee_id, 'object_id': schedule.object_id,
+                'date': schedule.date, 'weekday': schedule.weekday, 'start_time': schedule.start_time,
+            })] = schedule
+
+        for key, (line, values) in incoming.items():
+            current = existing.pop(key, None)
+            if current is None:
+                diff['insert'].append(values)
+            elif (current.end_time, current.planned_hours, current.status or 'normal') != (
+                values['end_time'], values['planned_hours'], values['status']
+            ):
+                diff['update'].append({'id': current.id, **values})
+            else:
+                diff['unchanged'].append(values)
+        if replace:
+            diff['delete'] = [
+                {'id': s.id, 'employee_id': s.employee_id, 'object_id': s.object_id, 'weekday': s.weekday,
+                 'date': s.date, 'start_time': s.start_time, 'end_time': s.end_time,
+                 'planned_hours': s.planned_hours, 'status': s.status or 'normal'}
+                for s in existing.values()
+            ]
+
+    applied = not dry_run and not errors
+    if applied:
+        if diff['insert']:
+            db.execute(insert(Schedule), diff['insert'])
+        if diff['update']:
+            # ORM-Bulk-UPDATE nach Primärschlüssel -> executemany
+            db.execute(update(Schedule), [
+                {'id': item['id'], 'end_time': item['end_time'],
+                 'planned_hours': item['planned_hours'], 'status': item['status']}
+                for item in diff['update']
+            ])
+        if diff['delete']:
+            db.execute(
+                delete(Schedule).where(Schedule.id.in_([item['id'] for item in diff['delete']])),
+                execution_options={'synchronize_session': False}
+            )
+
+    return {
+        'dry_run': dry_run,
+        'applied': applied,
+        'counts': _counts(diff, errors),
+        'errors': errors[:MAX_REPORTED],
+        'preview': {
+            kind: [
+                {'id': item.get('id'), **_describe(item)} if kind != 'insert' else _describe(item)
+                for item in items[:MAX_REPORTED]
+            ]
+            for kind, items in diff.items() if kind != 'unchanged'
+        },
+    }
+
+
+# ----- Kunden und Objekte -----
+
+OBJECT_FIELDS = ('address', 'gps_lat', 'gps_lng', 'radius_m', 'cleaning_type')
+
+
+def _object_values(row: dict) -> dict:
+    if 'customer' not in row or 'object' not in row:
+        raise ImportValidationError("Kunde und Objekt erforderlich")
+    values = {
+        'customer': str(row['customer']).strip(),
+        'name': str(row['object']).strip(),
+    }
+    if 'address' in row:
+        values['address'] = str(row['address'])
+    for field in ('gps_lat', 'gps_lng'):
+        if field in row:
+            values[field] = _float(row[field], field)
+    if 'radius_m' in row:
+        values['radius_m'] = int(_float(row['radius_m'], 'Radius'))
+    if 'cleaning_type' in row:
+        values['cleaning_type'] = str(row['cleaning_type'])
+    if not -90 <= values.get('gps_lat', 0) <= 90 or not -180 <= values.get('gps_lng', 0) <= 180:
+        raise ImportValidationError("Koordinaten außerhalb des gültigen Bereichs")
+    return values
+
+
+def import_objects(db: Session, rows: Iterable[Tuple[int, dict]], dry_run: bool = True) -> dict:
+    """Kunden und Objekte anlegen bzw. aktualisieren (Zuordnung über den Namen)
+
+    Fehlende Kunden werden angelegt; vorhandene Objekte bekommen Adresse,
+    Koordinaten, Radius und Reinigungsart aus der Datei. Gelöscht wird nichts.
+    """
+    customers = {name.strip().lower(): customer_id for customer_id, name in db.query(Customer.id, Customer.name) if name}
+    objects = {}
+    for obj in db.query(Object.id, Object.name, Object.customer_id, *(getattr(Object, f) for f in OBJECT_FIELDS)):
+        if obj.name:
+            key = obj.name.strip().lower()
+            objects[key] = None if key in objects else obj
+
+    errors, incoming = [], {}
+    for line, row in _limited(rows):
+        try:
+            values = _object_values(row)
+        except ImportValidationError as e:
+            errors.append({'line': line, 'error': str(e)})
+            continue
+        key = values['name'].lower()
+        if key in incoming:
+            errors.append({'line': line, 'error': f"Doppelt (wie Zeile {incoming[key][0]})"})
+        elif key in objects and objects[key] is None:
+            errors.append({'line': line, 'error': f"Objektname {values['name']!r} ist nicht eindeutig"})
+        else:
+            incoming[key] = (line, values)
+
+    new_customers = sorted({
+        values['customer'] for _, values in incoming.values() if values['customer'].lower() not in customers
+    })
+    diff = {'insert': [], 'update': [], 'unchanged': []}
+    for key, (line, values) in incoming.items():
+        current = objects.get(key)
+        if current is None:
+            diff['insert'].append(values)
+            continue
+        changes = {f: values[f] for f in OBJECT_FIELDS if f in values and getattr(current, f) != values[f]}
+        customer_id = customers.get(values['customer'].lower())
+        if customer_id != current.customer_id:
+            changes['customer'] = values['customer']
+        if changes:
+            diff['update'].append({'id': current.id, 'name': current.name, **changes})
+        else:
+            diff['unchanged'].append(values)
+
+    applied = not dry_run and not errors
+    if applied:
+        if new_customers:
+            created = db.execute(
+                insert(Customer).returning(Customer.id, sort_by_parameter_order=True),
+                [{'name': name} for name in new_customers]
+            ).scalars().all()
+            customers.update({name.lower(): customer_id for name, customer_id in zip(new_customers, created)})
+        if diff['insert']:
+            db.execute(insert(Object), [
+                {'customer_id': customers[values['customer'].lower()], 'name': values['name'],
+                 **{f: values[f] for f in OBJECT_FIELDS if f in values}}
+                for values in diff['insert']
+            ])
+        # Nach geänderten Spalten gruppiert, damit executemany greift
+        updates = {}
+        for item in diff['update']:
+            params = {'id': item['id'], **{f: item[f] for f in OBJECT_FIELDS if f in item}}
+            if 'customer' in item:
+                params['customer_id'] = customers[item['customer'].lower()]
+            updates.setdefault(tuple(sorted(params)), []).append(params)
+        for params in updates.values():
+            db.execute(update(Object), params)
+
+    return {
+        'dry_run': dry_run,
+        'applied': applied,
+        'counts': {**_counts(diff, errors), 'new_customers': len(new_customers)},
+        'errors': errors[:MAX_REPORTED],
+        'new_customers': new_customers[:MAX_REPORTED],
+        'preview': {kind: items[:MAX_REPORTED] for kind, items in diff.items() if kind != 'unchanged'},
+    }
@@ -0,0 +1,30 @@
+import os
+from app.core.scheduler import scheduler
+from app.core.warning_engine import run_checks
+from app.core.auto_checkout import auto_checkout
+from app.core.auto_stamp import stamp_category_a
+
+# Zeitgesteuerte Jobs - ersetzen die Cron-Einträge für scripts/auto_*.py
+#
+# Zeiten lassen sich per Umgebungsvariable überschreiben (crontab-Syntax,
+# lokale Zeit). Manuell: POST /api/v1/admin/jobs/<name>/run oder
+# python scripts/run_job.py <name>.
+
+
+@scheduler.job("warnings", os.getenv("CRON_WARNINGS", "*/5 * * * *"), catch_up=False)
+def check_warnings(db, scheduled_for):
+    """Warnungsregeln auswerten (app/core/warning_engine.py)"""
+    return run_checks(db, scheduled_for)
+
+
+@scheduler.job("category_a_stamping", os.getenv("CRON_CATEGORY_A", "*/15 * * * *"))
+def category_a_stamping(db, scheduled_for):
+    """Kategorie A nach Dienstplan stempeln"""
+    return {"stamped": len(stamp_category_a(db, scheduled_for))}
+
+
+@scheduler.job("auto_checkout", os.getenv("CRON_AUTO_CHECKOUT", "59 23 * * *"))
+def auto_checkout_job(db, scheduled_for):
+    """Vergessene Ausstempelungen schließen (Vorschau: POST /admin/auto-checkout?dry_run=true)"""
+    results = auto_checkout(db, scheduled_for)
+    return {"checked_out": len(results), "entries": results}
@@ -0,0 +1,339 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from datetime import date, datetime
+from typing import Callable, Optional
+from sqlalchemy import event, func, inspect
+from sqlalchemy.orm import Session, object_session
+from starlette.concurrency import run_in_threadpool
+from app.db.database import SessionLocal
+from app.db.repository import open_entries_query
+from app.db.sql import duration_seconds
+from app.core.periods import day_period
+from app.models.models import BreakEntry, Employee, Object, TimeEntry, User
+
+# Spätestens nach dieser Zeit neu laden (Stempelungen aus Skripten/anderen Prozessen)
+LIVE_STATUS_MAX_AGE = float(os.getenv("LIVE_STATUS_MAX_AGE", "300"))
+# Kommentarzeile an verbundene Clients, damit Proxys die Verbindung offen lassen
+SSE_KEEPALIVE = 15.0
+# Ungelesene Meldungen pro Client; läuft die Queue voll, bekommt er einen neuen Snapshot
+SUBSCRIBER_QUEUE = 256
+
+_RESYNC = object()
+
+
+def _sse(event_name: str, data) -> str:
+    return f"event: {event_name}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def _offer(queue: asyncio.Queue, message) -> None:
+    # Läuft im Event-Loop des Clients
+    if queue.full():
+        while not queue.empty():
+            queue.get_nowait()
+        message = _RESYNC
+    queue.put_nowait(message)
+
+
+class LiveStatus:
+    """Wer ist gerade eingestempelt, in Pause, an welchem Objekt - im Speicher
+
+    Wird einmal aus der Datenbank geladen und danach aus den commits der
+    eigenen Sessions fortgeschrieben (Mapper-Events unten). Verbundene
+    Admin-Clients bekommen jede Änderung als Diff per Server-Sent Events.
+    Änderungen, die sich nicht inkrementell abbilden lassen (Korrekturen,
+    Löschungen, neue Mitarbeiter/Objekte), markieren den Stand als veraltet.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}            # employee_id -> Stempelung (siehe _entry)
+        self._employees = {}          # employee_id -> (Name, Personalnummer)
+        self._objects = {}            # object_id -> Name
+        self._total_employees = 0
+        self._closed_seconds = 0.0    # abgeschlossene Stempelungen mit check_in heute
+        self._day: Optional[date] = None
+        self._loaded_at = 0.0
+        self._dirty = True
+        self._subscribers = set()     # (Event-Loop, Queue)
+
+    # ----- Laden -----
+
+    def invalidate(self) -> None:
+        self._dirty = True
+
+    @property
+    def stale(self) -> bool:
+        return (
+            self._dirty
+            or self._day != date.today()
+            or time.monotonic() - self._loaded_at > LIVE_STATUS_MAX_AGE
+        )
+
+    def load(self, db: Session) -> None:
+        today = date.today()
+        employees = db.query(
+            Employee.id, Employee.first_name, Employee.last_name, Employee.personal_nr, User.role
+        ).outerjoin(User, User.id == Employee.user_id).all()
+        objects = db.query(Object.id, Object.name).all()
+        open_entries = open_entries_query(db).with_entities(
+            TimeEntry.id, TimeEntry.employee_id, TimeEntry.object_id, TimeEntry.check_in
+        ).all()
+        open_breaks = db.query(BreakEntry.time_entry_id, func.max(BreakEntry.start_time)).join(
+            TimeEntry, TimeEntry.id == BreakEntry.time_entry_id
+        ).filter(
+            TimeEntry.check_out.is_(None),
+            BreakEntry.end_time.is_(None)
+        ).group_by(BreakEntry.time_entry_id).all()
+        closed_seconds = db.query(
+            func.sum(duration_seconds(TimeEntry.check_in, TimeEntry.check_out))
+        ).filter(
+            TimeEntry.check_out.isnot(None),
+            day_period(today).filter(TimeEntry.check_in)
+        ).scalar() or 0.0
+
+        breaks = dict(open_breaks)
+        with self._lock:
+            self._dirty = False
+            self._employees = {
+                e.id: (f"{e.first_name} {e.last_name}", e.personal_nr) for e in employees
+            }
+            self._objects = dict(objects)
+            self._total_employees = sum(1 for e in employees if e.role != "admin")
+            self._entries = {}
+            for entry in open_entries:
+                self._entries[entry.employee_id] = {
+                    "time_entry_id": entry.id,
+                    "object_id": entry.object_id,
+                    "check_in": entry.check_in,
+                    "break_since": breaks.get(entry.id),
+                }
+            self._closed_seconds = float(closed_seconds)
+            self._day = today
+            self._loaded_at = time.monotonic()
+        self._publish(_RESYNC)
+
+    def ensure(self, db: Session) -> None:
+        if self.stale:
+            self.load(db)
+
+    def refresh(self) -> None:
+        """Mit eigener Session neu laden, falls veraltet (aus dem SSE-Stream)"""
+        if not self.stale:
+            return
+        db = SessionLocal()
+        try:
+            self.load(db)
+        finally:
+            db.close()
+
+    # ----- Lesen -----
+
+    def _entry(self, employee_id: int, state: dict, now: datetime) -> dict:
+        name, personal_nr = self._employees.get(employee_id, (f"Mitarbeiter {employee_id}", None))
+        check_in = state["check_in"]
+        return {
+            "employee_id": employee_id,
+            "employee_name": name,
+            "personal_nr": personal_nr,
+            "time_entry_id": state["time_entry_id"],
+            "object_id": state["object_id"],
+            "object_name": self._objects.get(state["object_id"], f"Objekt {state['object_id']}"),
+            "check_in": check_in.isoformat(),
+            "check_in_time": check_in.strftime("%H:%M"),
+            "work_hours": round((now - check_in).total_seconds() / 3600, 1),
+            "is_paused": state["break_since"] is not None,
+            "break_since": state["break_since"].isoformat() if state["break_since"] else None,
+        }
+
+    def entries(self) -> list:
+        now = datetime.utcnow()
+        with self._lock:
+            return sorted(
+                (self._entry(eid, state, now) for eid, state in self._entries.items()),
+                key=lambda e: e["check_in"]
+            )
+
+    def stats(self) -> dict:
+        now = datetime.utcnow()
+        today = day_period(date.today())
+        with self._lock:
+            paused = sum(1 for s in self._entries.values() if s["break_since"] is not None)
+            active = len(self._entries) - paused
+            running = sum(
+                (now - s["check_in"]).total_seconds()
+                for s in self._entries.values() if today.contains(s["check_in"])
+            )
+            total = self._total_employees
+            seconds = self._closed_seconds + running
+        return {
+            "active_employees": active,
+            "paused_employees": paused,
+            "offline_employees": max(total - active - paused, 0),
+            "total_employees": total,
+            "total_hours_today": round(seconds / 3600, 1)
+        }
+
+    def snapshot(self) -> dict:
+        return {"entries": self.entries(), "stats": self.stats()}
+
+    # ----- Fortschreiben -----
+
+    def apply(self, changes: list) -> None:
+        """Nach einem commit gesammelte Änderungen übernehmen und verteilen"""
+        now = datetime.utcnow()
+        today = day_period(date.today())
+        touched = set()
+        with self._lock:
+            for change in changes:
+                kind = change[0]
+                if kind == "reload":
+                    self._dirty = True
+                elif kind == "entry":
+                    _, entry_id, employee_id, object_id, check_in, check_out, was_closed = change
+                    if employee_id is None or check_in is None:
+                        continue
+                    if employee_id not in self._employees or (object_id and object_id not in self._objects):
+                        self._dirty = True
+                    current = self._entries.get(employee_id)
+                    if was_closed:
+                        # Korrektur einer (bisher) abgeschlossenen Stempelung: Tagessumme neu laden
+                        self._dirty = True
+                    if check_out is None:
+                        same = current is not None and current["time_entry_id"] == entry_id
+                        self._entries[employee_id] = {
+                            "time_entry_id": entry_id,
+                            "object_id": object_id,
+                            "check_in": check_in,
+                            "break_since": current["break_since"] if same else None,
+                        }
+                        touched.add(employee_id)
+                        continue
+                    if current is not None and current["time_entry_id"] == entry_id:
+                        del self._entries[employee_id]
+                        touched.add(employee_id)
+                    if not was_closed and today.contains(check_in):
+                        self._closed_seconds += (check_out - check_in).total_seconds()
+                elif kind == "break":
+                    _, time_entry_id, start_time, end_time = change
+                    for employee_id, state in self._entries.items():
+                        if state["time_entry_id"] == time_entry_id:
+                            state["break_since"] = start_time if end_time is None else None
+                            touched.add(employee_id)
+                            break
+            diffs = [
+                {
+                    "employee_id": employee_id,
+                    "entry": (
+                        self._entry(employee_id, self._entries[employee_id], now)
+                        if employee_id in self._entries else None
+                    ),
+                }
+                for employee_id in touched
+            ]
+        if diffs:
+            self._publish({"changes": diffs, "stats": self.stats()})
+
+    # ----- Verteilen -----
+
+    def _publish(self, message) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            loop, queue = subscriber
+            try:
+                loop.call_soon_threadsafe(_offer, queue, message)
+            except RuntimeError:
+                # Event-Loop bereits beendet
+                with self._lock:
+                    self._subscribers.discard(subscriber)
+
+    async def stream(self, is_disconnected: Callable):
+        """SSE-Generator: erst ein Snapshot, dann Diffs ("update") bis zum Abbruch"""
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE)
+        subscriber = (asyncio.get_running_loop(), queue)
+        with self._lock:
+            self._subscribers.add(subscriber)
+        try:
+            yield _sse("snapshot", self.snapshot())
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    if await is_disconnected():
+                        break
+                    if self.stale:
+                        # Neuladen verteilt selbst einen Snapshot an alle
+                        await run_in_threadpool(self.refresh)
+                    yield ": ping\n\n"
+                    continue
+                if message is _RESYNC:
+                    yield _sse("snapshot", self.snapshot())
+                else:
+                    yield _sse("update", message)
+        finally:
+            with self._lock:
+                self._subscribers.discard(subscriber)
+
+
+live_status = LiveStatus()
+
+
+# Stempelungen/Pausen merken, nach dem commit übernehmen
+def _remember(target, change) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("live_changes", []).append(change)
+
+
+def _remember_entry(target, was_closed: bool) -> None:
+    _remember(target, (
+        "entry", target.id, target.employee_id, target.object_id,
+        target.check_in, target.check_out, was_closed
+    ))
+
+
+@event.listens_for(TimeEntry, "after_insert")
+def _entry_inserted(mapper, connection, target):
+    _remember_entry(target, False)
+
+
+@event.listens_for(TimeEntry, "after_update")
+def _entry_changed(mapper, connection, target):
+    # Nur Ausstempeln (check_out vorher nachweislich NULL) zählt inkrementell;
+    # jede andere Änderung an einer abgeschlossenen Stempelung ist eine Korrektur
+    history = inspect(target).attrs.check_out.history
+    before = list(history.deleted) + list(history.unchanged)
+    was_open = bool(before) and all(value is None for value in before)
+    _remember_entry(target, not was_open and (target.check_out is not None or bool(before)))
+
+
+@event.listens_for(BreakEntry, "after_insert")
+@event.listens_for(BreakEntry, "after_update")
+def _break_changed(mapper, connection, target):
+    _remember(target, ("break", target.time_entry_id, target.start_time, target.end_time))
+
+
+@event.listens_for(TimeEntry, "after_delete")
+@event.listens_for(Employee, "after_insert")
+@event.listens_for(Employee, "after_update")
+@event.listens_for(Employee, "after_delete")
+@event.listens_for(Object, "after_insert")
+@event.listens_for(Object, "after_update")
+@event.listens_for(Object, "after_delete")
+def _needs_reload(mapper, connection, target):
+    _remember(target, ("reload",))
+
+
+@event.listens_for(Session, "after_commit")
+def _session_committed(session):
+    changes = session.info.pop("live_changes", None)
+    if changes:
+        live_status.apply(changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _session_rolled_back(session):
+    session.info.pop("live_changes", None)
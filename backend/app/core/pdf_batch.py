@@ -0,0 +1,183 @@
+import json
+import multiprocessing
+import os
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from tempfile import SpooledTemporaryFile
+from types import SimpleNamespace
+from sqlalchemy.orm import Session
+from app.models.models import TimeEntry, Employee, Object
+from app.core.periods import month_period
+from app.core.pdf_generator import generate_monthly_timesheet_pdf
+
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", "0")) or os.cpu_count() or 1
+ZIP_CHUNK_SIZE = 64 * 1024
+
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def load_month_timesheets(db: Session, year: int, month: int) -> list:
+    """Alle abgeschlossenen Einträge des Monats in EINER Abfrage, nach MA gruppiert
+
+    Ergebnis sind einfache Namespaces statt ORM-Objekte, damit sie an
+    die Worker-Prozesse gepickelt werden können (kein Lazy-Loading).
+    """
+    rows = db.query(
+        Employee.id,
+        Employee.personal_nr,
+        Employee.first_name,
+        Employee.last_name,
+        Employee.hourly_rate,
+        TimeEntry.check_in,
+        TimeEntry.check_out,
+        Object.name
+    ).join(
+        Employee, Employee.id == TimeEntry.employee_id
+    ).outerjoin(
+        Object, Object.id == TimeEntry.object_id
+    ).filter(
+        month_period(year, month).filter(TimeEntry.check_in),
+        TimeEntry.check_out != None
+    ).order_by(
+        Employee.id,
+        TimeEntry.check_in
+    ).all()
+
+    timesheets = {}
+    for emp_id, personal_nr, first_name, last_name, hourly_rate, check_in, check_out, object_name in rows:
+        if emp_id not in timesheets:
+            employee = SimpleNamespace(
+                id=emp_id,
+                personal_nr=personal_nr,
+                first_name=first_name,
+                last_name=last_name,
+                hourly_rate=hourly_rate or 0
+            )
+            timesheets[emp_id] = (employee, [])
+        timesheets[emp_id][1].append(SimpleNamespace(
+            check_in=check_in,
+            check_out=check_out,
+            object=SimpleNamespace(name=object_name) if object_name else None
+        ))
+
+    return list(timesheets.values())
+
+
+def _timesheet_filename(employee, year: int, month: int) -> str:
+    return f"Zeitnachweis_{employee.personal_nr}_{employee.last_name}_{year}_{month:02d}.pdf".replace(" ", "_")
+
+
+def _render_timesheet(employee, entries, year: int, month: int):
+    """Worker: ein PDF rendern, Laufzeit mitmessen"""
+    start = time.perf_counter()
+    pdf = generate_monthly_timesheet_pdf(employee, entries, year, month).getvalue()
+    return employee, len(entries), pdf, time.perf_counter() - start
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """Gemeinsamer Prozess-Pool, beim ersten Aufruf angelegt
+
+    spawn statt fork: der Webserver läuft mit Threads, fork wäre dort unsicher.
+    Da spawn jeden Worker neu startet, wird der Pool wiederverwendet.
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None and _pool_workers != workers:
+            _pool.shutdown(wait=True)
+            _pool = None
+        if _pool is None:
+            context = multiprocessing.get_context("spawn")
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+            _pool_workers = workers
+        return _pool
+
+
+def shutdown_pool():
+    """Prozess-Pool beenden (Shutdown der App bzw. Ende des Skripts)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
+
+
+def render_month_pdfs(timesheets: list, year: int, month: int, workers: int = PDF_WORKERS):
+    """Rendert alle PDFs parallel im Prozess-Pool, liefert Ergebnisse sobald fertig"""
+    if workers <= 1 or len(timesheets) <= 1:
+        for employee, entries in timesheets:
+            yield _render_timesheet(employee, entries, year, month)
+        return
+
+    pool = _get_pool(workers)
+    futures = [
+        pool.submit(_render_timesheet, employee, entries, year, month)
+        for employee, entries in timesheets
+    ]
+    try:
+        for future in as_completed(futures):
+            yield future.result()
+    except BrokenProcessPool:
+        # Abgestürzter Worker: Pool verwerfen, der nächste Aufruf legt ihn neu an
+        shutdown_pool()
+        raise
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def build_month_pdf_zip(db: Session, year: int, month: int, workers: int = PDF_WORKERS):
+    """Alle Zeitnachweise eines Monats als ZIP
+
+    Gibt (Datei-Objekt am Anfang, Bericht) zurück. Der Bericht enthält
+    die Laufzeit pro Mitarbeiter und den Gesamtdurchsatz und liegt
+    zusätzlich als bericht.json im ZIP.
+    """
+    start = time.perf_counter()
+    timesheets = load_month_timesheets(db, year, month)
+    query_seconds = time.perf_counter() - start
+
+    output = SpooledTemporaryFile(max_size=16 * 1024 * 1024)
+    employees = []
+    with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as archive:
+        for employee, entry_count, pdf, seconds in render_month_pdfs(timesheets, year, month, workers):
+            archive.writestr(_timesheet_filename(employee, year, month), pdf)
+            employees.append({
+                "personal_nr": employee.personal_nr,
+                "name": f"{employee.first_name} {employee.last_name}",
+                "entries": entry_count,
+                "render_seconds": round(seconds, 4),
+                "bytes": len(pdf)
+            })
+
+        total_seconds = time.perf_counter() - start
+        report = {
+            "year": year,
+            "month": month,
+            "workers": workers,
+            "pdf_count": len(employees),
+            "query_seconds": round(query_seconds, 4),
+            "total_seconds": round(total_seconds, 4),
+            "pdfs_per_second": round(len(employees) / total_seconds, 2) if total_seconds else 0,
+            "employees": sorted(employees, key=lambda e: e["personal_nr"] or "")
+        }
+        archive.writestr("bericht.json", json.dumps(report, ensure_ascii=False, indent=2))
+
+    output.seek(0)
+    return output, report
+
+
+def iter_zip_chunks(fileobj, chunk_size: int = ZIP_CHUNK_SIZE):
+    """ZIP in Blöcken ausliefern (für StreamingResponse)"""
+    try:
+        while True:
+            chunk = fileobj.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        fileobj.close()
@@ -4,48 +4,109 @@ from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph,
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import cm
 from reportlab.lib.enums import TA_CENTER, TA_RIGHT
-from datetime import datetime
+from datetime import datetime, date
 from io import BytesIO
 
+MONTH_NAMES = {
+    1: "Januar", 2: "Februar", 3: "März", 4: "April",
+    5: "Mai", 6: "Juni", 7: "Juli", 8: "August",
+    9: "September", 10: "Oktober", 11: "November", 12: "Dezember"
+}
+
+WEEKDAYS = ['Mo', 'Di', 'Mi', 'Do', 'Fr', 'Sa', 'So']
+
+# ========== LAYOUT-REGISTRY ==========
+# Styles und TableStyles werden pro Prozess EINMAL gebaut und dann für
+# jedes Dokument wiederverwendet (reportlab verändert sie beim Rendern nicht).
+
+_LAYOUT_BUILDERS = {}
+_LAYOUTS = {}
+
+def register_layout(name, builder):
+    """Neues Layout registrieren; builder() liefert ein Dict mit Styles"""
+    _LAYOUT_BUILDERS[name] = builder
+    _LAYOUTS.pop(name, None)
+
+def get_layout(name):
+    """Gecachtes Layout holen, beim ersten Zugriff bauen"""
+    layout = _LAYOUTS.get(name)
+    if layout is None:
+        layout = _LAYOUT_BUILDERS[name]()
+        _LAYOUTS[name] = layout
+    return layout
+
+def clear_layout_cache():
+    """Alle gebauten Layouts verwerfen (z.B. für Benchmarks)"""
+    _LAYOUTS.clear()
+
+def _build_employee_timesheet_layout():
+    styles = getSampleStyleSheet()
+    primary = colors.HexColor('#1e40af')
+    
+    return {
+        "title": ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=18,
+            textColor=primary,
+            alignment=TA_CENTER
+        ),
+        "footer": ParagraphStyle(
+            'Footer',
+            parent=styles['Normal'],
+            fontSize=10,
+            alignment=TA_CENTER,
+            textColor=colors.grey
+        ),
+        "info_table": TableStyle([
+            ('FONT', (0, 0), (-1, -1), 'Helvetica-Bold', 12),
+            ('TEXTCOLOR', (0, 0), (0, -1), colors.black),
+        ]),
+        "entries_table": TableStyle([
+            # Header
+            ('BACKGROUND', (0, 0), (-1, 0), primary),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('FONT', (0, 0), (-1, 0), 'Helvetica-Bold', 10),
+            
+            # Body
+            ('FONT', (0, 1), (-1, -1), 'Helvetica', 9),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            ('ALIGN', (3, 1), (5, -1), 'RIGHT'),
+            
+            # Alternierende Zeilen
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f0f0')]),
+        ]),
+        "summary_table": TableStyle([
+            ('FONT', (0, 0), (0, -1), 'Helvetica-Bold', 11),
+            ('FONT', (1, 0), (1, -1), 'Helvetica-Bold', 11),
+            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+            ('TEXTCOLOR', (0, 0), (-1, 1), primary),
+        ]),
+    }
+
+register_layout("employee_timesheet", _build_employee_timesheet_layout)
+
 def generate_monthly_timesheet_pdf(employee, entries, year, month):
     """Generiert PDF genau wie Drazens Muster"""
     
+    layout = get_layout("employee_timesheet")
     buffer = BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=2*cm)
     
-    # Styles
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=18,
-        textColor=colors.HexColor('#1e40af'),
-        alignment=TA_CENTER
-    )
-    
     elements = []
     
     # Header
-    elements.append(Paragraph("Zeitnachweis - SEDA24", title_style))
+    elements.append(Paragraph("Zeitnachweis - SEDA24", layout["title"]))
     elements.append(Spacer(1, 0.5*cm))
     
     # Mitarbeiter Info
-    month_names = {
-        1: "Januar", 2: "Februar", 3: "März", 4: "April",
-        5: "Mai", 6: "Juni", 7: "Juli", 8: "August",
-        9: "September", 10: "Oktober", 11: "November", 12: "Dezember"
-    }
-    
     info_data = [
         ['Mitarbeiter:', f"{employee.first_name} {employee.last_name}"],
-        ['Monat:', f"{month_names[month]} {year}"],
+        ['Monat:', f"{MONTH_NAMES[month]} {year}"],
     ]
     
     info_table = Table(info_data, colWidths=[4*cm, 10*cm])
-    info_table.setStyle(TableStyle([
-        ('FONT', (0, 0), (-1, -1), 'Helvetica-Bold', 12),
-        ('TEXTCOLOR', (0, 0), (0, -1), colors.black),
-    ]))
+    info_table.setStyle(layout["info_table"])
     elements.append(info_table)
     elements.append(Spacer(1, 0.5*cm))
     
@@ -70,8 +131,7 @@ def generate_monthly_timesheet_pdf(employee, entries, year, month):
             total_lohn += lohn
             
             # Datum formatieren (Di, 01.07.2025)
-            weekdays = ['Mo', 'Di', 'Mi', 'Do', 'Fr', 'Sa', 'So']
-            weekday = weekdays[entry.check_in.weekday()]
+            weekday = WEEKDAYS[entry.check_in.weekday()]
             date_str = f"{weekday}, {entry.check_in.strftime('%d.%m.%Y')}"
             
             # Arbeitszeit (15:00 bis 20:00)
@@ -91,7 +151,7 @@ def generate_monthly_timesheet_pdf(employee, entries, year, month):
     
     # Übertrag-Zeile am Anfang (falls gewünscht)
     table_data.insert(1, [
-        f"{weekdays[0]}, 01.{month:02d}.{year}",
+        f"{WEEKDAYS[date(year, month, 1).weekday()]}, 01.{month:02d}.{year}",
         "Übertrag",
         "-",
         "-",
@@ -101,20 +161,7 @@ def generate_monthly_timesheet_pdf(employee, entries, year, month):
     
     # Tabelle erstellen
     table = Table(table_data, colWidths=[3.5*cm, 4*cm, 4*cm, 2*cm, 2*cm, 3*cm])
-    table.setStyle(TableStyle([
-        # Header
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e40af')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('FONT', (0, 0), (-1, 0), 'Helvetica-Bold', 10),
-        
-        # Body
-        ('FONT', (0, 1), (-1, -1), 'Helvetica', 9),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('ALIGN', (3, 1), (5, -1), 'RIGHT'),
-        
-        # Alternierende Zeilen
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f0f0')]),
-    ]))
+    table.setStyle(layout["entries_table"])
     
     elements.append(table)
     elements.append(Spacer(1, 1*cm))
@@ -128,24 +175,12 @@ def generate_monthly_timesheet_pdf(employee, entries, year, month):
     ]
     
     summary_table = Table(summary_data, colWidths=[5*cm, 4*cm])
-    summary_table.setStyle(TableStyle([
-        ('FONT', (0, 0), (0, -1), 'Helvetica-Bold', 11),
-        ('FONT', (1, 0), (1, -1), 'Helvetica-Bold', 11),
-        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-        ('TEXTCOLOR', (0, 0), (-1, 1), colors.HexColor('#1e40af')),
-    ]))
+    summary_table.setStyle(layout["summary_table"])
     elements.append(summary_table)
     elements.append(Spacer(1, 2*cm))
     
     # Footer
-    footer_style = ParagraphStyle(
-        'Footer',
-        parent=styles['Normal'],
-        fontSize=10,
-        alignment=TA_CENTER,
-        textColor=colors.grey
-    )
-    elements.append(Paragraph("Herzlichen Dank für Ihren Einsatz!", footer_style))
+    elements.append(Paragraph("Herzlichen Dank für Ihren Einsatz!", layout["footer"]))
     
     # PDF generieren
     doc.build(elements)
@@ -0,0 +1,65 @@
+from datetime import date, datetime, time, timedelta
+from typing import NamedTuple
+from sqlalchemy import and_
+
+
+class Period(NamedTuple):
+    """Halboffener Zeitraum [start, end) für Filter auf DateTime-Spalten
+
+    Statt func.date(spalte) == tag wird spalte >= start AND spalte < end
+    erzeugt - so kann PostgreSQL die Indizes auf check_in nutzen.
+    Die Grenzen sind naive Mitternachten und werden so verglichen wie
+    die Zeitstempel gespeichert sind - keine Umrechnung in UTC.
+    """
+    start: datetime
+    end: datetime
+
+    def filter(self, column):
+        return and_(column >= self.start, column < self.end)
+
+    def contains(self, value: datetime) -> bool:
+        return self.start <= value < self.end
+
+
+def _boundary(day: date) -> datetime:
+    """Mitternacht eines Tages als naiver Zeitstempel"""
+    return datetime.combine(day, time.min)
+
+
+def range_period(start_date: date, end_date: date) -> Period:
+    """Beliebiger Zeitraum, end_date inklusive
+
+    end_date = date.max (9999-12-31) hat keinen Folgetag; das Ende wird
+    dann auf datetime.max gesetzt statt mit OverflowError abzubrechen.
+    """
+    if end_date >= date.max:
+        return Period(_boundary(start_date), datetime.max)
+    return Period(_boundary(start_date), _boundary(end_date + timedelta(days=1)))
+
+
+def day_period(day: date) -> Period:
+    """Ein Kalendertag"""
+    return range_period(day, day)
+
+
+def week_period(year: int, week: int) -> Period:
+    """ISO-Kalenderwoche (Montag bis Sonntag)
+
+    year ist das ISO-Jahr (date.isocalendar()), nicht das Kalenderjahr -
+    der 01.01.2027 liegt z.B. in KW 53/2026. ValueError bei ungültiger Woche.
+    """
+    try:
+        monday = date.fromisocalendar(year, week, 1)
+    except ValueError:
+        raise ValueError(f"Ungültige Kalenderwoche: KW {week}/{year}")
+    return range_period(monday, monday + timedelta(days=6))
+
+
+def month_period(year: int, month: int) -> Period:
+    """Kalendermonat"""
+    first_day = date(year, month, 1)
+    if month == 12:
+        next_first = date(year + 1, 1, 1)
+    else:
+        next_first = date(year, month + 1, 1)
+    return range_period(first_day, next_first - timedelta(days=1))
@@ -1,9 +1,16 @@
+import codecs
+import csv
+import io
 from datetime import datetime, timedelta, date
 from sqlalchemy.orm import Session
 from sqlalchemy import func, and_, or_
 import pandas as pd
 from typing import Optional, Dict, List
 from app.models.models import TimeEntry, Employee, Object, Customer, User
+from app.db.sql import duration_seconds
+from app.core.periods import Period, day_period, week_period, month_period
+from app.db.repository import get_open_entry
+from app.core.rollup_service import daily_totals
 
 class ReportService:
     def __init__(self, db: Session):
@@ -15,7 +22,7 @@ class ReportService:
         
         entries = self.db.query(TimeEntry).filter(
             TimeEntry.employee_id == employee_id,
-            func.date(TimeEntry.check_in) == today
+            day_period(today).filter(TimeEntry.check_in)
         ).all()
         
         total_minutes = 0
@@ -35,10 +42,7 @@ class ReportService:
                 })
         
         # Aktuelle offene Stempelung
-        active_entry = self.db.query(TimeEntry).filter(
-            TimeEntry.employee_id == employee_id,
-            TimeEntry.check_out == None
-        ).first()
+        active_entry = get_open_entry(self.db, employee_id)
         
         if active_entry:
             current_duration = (datetime.now() - active_entry.check_in).total_seconds() / 60
@@ -62,24 +66,18 @@ class ReportService:
     
     def get_week_hours(self, employee_id: int, week_number: Optional[int] = None, year: Optional[int] = None) -> Dict:
         """Wochenstunden eines Mitarbeiters"""
-        if not week_number:
-            week_number = datetime.now().isocalendar()[1]
-        if not year:
-            year = datetime.now().year
+        # Woche und Jahr beide aus isocalendar() - um den Jahreswechsel
+        # weicht das ISO-Jahr vom Kalenderjahr ab
+        iso_year, iso_week, _ = datetime.now().isocalendar()
+        week_number = week_number or iso_week
+        year = year or iso_year
         
-        # Montag und Sonntag der Woche berechnen
-        jan1 = date(year, 1, 1)
-        week_start = jan1 + timedelta(days=(week_number-1)*7 - jan1.weekday())
+        # Montag und Sonntag der (ISO-)Woche berechnen
+        period = week_period(year, week_number)
+        week_start = period.start.date()
         week_end = week_start + timedelta(days=6)
         
-        entries = self.db.query(TimeEntry).filter(
-            TimeEntry.employee_id == employee_id,
-            func.date(TimeEntry.check_in) >= week_start,
-            func.date(TimeEntry.check_in) <= week_end,
-            TimeEntry.check_out != None
-        ).all()
-        
-        # Nach Tag gruppieren
+        # Nach Tag gruppieren (Tagessummen: höchstens 7 Zeilen)
         daily_hours = {}
         for day in range(7):
             current_date = week_start + timedelta(days=day)
@@ -90,14 +88,12 @@ class ReportService:
             }
         
         total_minutes = 0
-        for entry in entries:
-            day_name = entry.check_in.strftime("%A")
-            duration = (entry.check_out - entry.check_in).total_seconds() / 60
-            
+        for day, minutes, _, _ in daily_totals(self.db, employee_id, week_start, week_end):
+            day_name = day.strftime("%A")
             if day_name in daily_hours:
-                daily_hours[day_name]["hours"] += duration / 60
-                daily_hours[day_name]["formatted"] = f"{int(duration//60)}:{int(duration%60):02d}"
-                total_minutes += duration
+                daily_hours[day_name]["hours"] = round(minutes / 60, 2)
+                daily_hours[day_name]["formatted"] = f"{int(minutes//60)}:{int(minutes%60):02d}"
+                total_minutes += minutes
         
         # Deutsche Wochentage
         german_days = {
@@ -133,27 +129,15 @@ class ReportService:
         if not year:
             year = datetime.now().year
         
-        # Erster und letzter Tag des Monats
-        month_start = date(year, month, 1)
-        if month == 12:
-            month_end = date(year + 1, 1, 1) - timedelta(days=1)
-        else:
-            month_end = date(year, month + 1, 1) - timedelta(days=1)
-        
-        entries = self.db.query(TimeEntry).filter(
-            TimeEntry.employee_id == employee_id,
-            func.date(TimeEntry.check_in) >= month_start,
-            func.date(TimeEntry.check_in) <= month_end,
-            TimeEntry.check_out != None
-        ).all()
+        # Erster Tag des Monats
+        period = month_period(year, month)
+        month_start = period.start.date()
+        month_end = period.end.date() - timedelta(days=1)
         
-        total_minutes = 0
-        work_days = set()
-        
-        for entry in entries:
-            duration = (entry.check_out - entry.check_in).total_seconds() / 60
-            total_minutes += duration
-            work_days.add(entry.check_in.date())
+        # Tagessummen: höchstens 31 Zeilen statt aller Stempelungen
+        days = daily_totals(self.db, employee_id, month_start, month_end)
+        total_minutes = sum(minutes for _, minutes, _, _ in days)
+        work_days = {day for day, minutes, _, _ in days if minutes}
         
         # Mitarbeiter-Info für Soll-Berechnung
         employee = self.db.query(Employee).filter(Employee.id == employee_id).first()
@@ -181,80 +165,163 @@ class ReportService:
         if not target_date:
             target_date = date.today()
         
-        employees = self.db.query(Employee).all()
-        result = []
+        period = day_period(target_date)
+        
+        # Eine gruppierte Abfrage statt einer Abfrage pro Mitarbeiter/Objekt:
+        # pro (Mitarbeiter, Objekt) eine Zeile mit Summe der Dauer
+        rows = self.db.query(
+            Employee.id,
+            Employee.first_name,
+            Employee.last_name,
+            Employee.personal_nr,
+            Object.name,
+            func.sum(duration_seconds(TimeEntry.check_in, TimeEntry.check_out)),
+        ).outerjoin(
+            TimeEntry, and_(
+                TimeEntry.employee_id == Employee.id,
+                period.filter(TimeEntry.check_in),
+                TimeEntry.check_out != None
+            )
+        ).outerjoin(
+            Object, Object.id == TimeEntry.object_id
+        ).group_by(
+            Employee.id,
+            Employee.first_name,
+            Employee.last_name,
+            Employee.personal_nr,
+            Object.name
+        ).order_by(
+            Employee.id,
+            func.min(TimeEntry.check_in)
+        ).all()
         
-        for emp in employees:
-            entries = self.db.query(TimeEntry).filter(
-                TimeEntry.employee_id == emp.id,
-                func.date(TimeEntry.check_in) == target_date
-            ).all()
-            
-            total_minutes = 0
-            objects_worked = []
-            
-            for entry in entries:
-                if entry.check_out:
-                    duration = (entry.check_out - entry.check_in).total_seconds() / 60
-                    total_minutes += duration
-                    if entry.object and entry.object.name not in objects_worked:
-                        objects_worked.append(entry.object.name)
-            
+        # Zeilen pro Mitarbeiter zusammenführen (Reihenfolge bleibt erhalten)
+        per_employee = {}
+        for emp_id, first_name, last_name, personal_nr, object_name, seconds in rows:
+            emp = per_employee.setdefault(emp_id, {
+                "name": f"{first_name} {last_name}",
+                "personal_nr": personal_nr,
+                "minutes": 0,
+                "objects": []
+            })
+            emp["minutes"] += (seconds or 0) / 60
+            if object_name and object_name not in emp["objects"]:
+                emp["objects"].append(object_name)
+        
+        result = []
+        for emp in per_employee.values():
+            total_minutes = emp["minutes"]
             result.append({
-                "employee_name": f"{emp.first_name} {emp.last_name}",
-                "personal_nr": emp.personal_nr,
+                "employee_name": emp["name"],
+                "personal_nr": emp["personal_nr"],
                 "total_hours": round(total_minutes / 60, 2),
                 "total_formatted": f"{int(total_minutes//60)}:{int(total_minutes%60):02d}",
-                "objects": ", ".join(objects_worked) if objects_worked else "Keine",
+                "objects": ", ".join(emp["objects"]) if emp["objects"] else "Keine",
                 "status": "Anwesend" if total_minutes > 0 else "Abwesend"
             })
         
         return {
             "date": target_date.strftime("%d.%m.%Y"),
             "employees": result,
-            "total_employees": len(employees),
+            "total_employees": len(result),
             "present": len([e for e in result if e["status"] == "Anwesend"])
         }
     
-def export_to_csv(self, month: int, year: int) -> bytes:
-        """CSV-Export für einen Monat - SIMPLE"""
-        try:
-            month_start = date(year, month, 1)
-            if month == 12:
-                month_end = date(year + 1, 1, 1) - timedelta(days=1)
-            else:
-                month_end = date(year, month + 1, 1) - timedelta(days=1)
-            
-            # Header
-            csv_content = "Datum;Mitarbeiter;Objekt;Einstempelung;Ausstempelung;Stunden\n"
-            
-            # Alle Einträge des Monats
-            entries = self.db.query(TimeEntry).filter(
-                func.date(TimeEntry.check_in) >= month_start,
-                func.date(TimeEntry.check_in) <= month_end,
-                TimeEntry.check_out != None
-            ).all()
-            
-            if not entries:
-                csv_content += "Keine Daten vorhanden\n"
-                return csv_content.encode("utf-8-sig")
-            
-            for entry in entries:
-                # Dauer berechnen
-                duration_hours = 0
-                if entry.check_out:
-                    duration_hours = round((entry.check_out - entry.check_in).total_seconds() / 3600, 2)
-                
-                # CSV-Zeile
-                line = f"{entry.check_in.strftime('%d.%m.%Y')};"
-                line += f"MA-{entry.employee_id};"
-                line += f"Objekt-{entry.object_id};"
-                line += f"{entry.check_in.strftime('%H:%M')};"
-                line += f"{entry.check_out.strftime('%H:%M')};"
-                line += f"{duration_hours}\n"
-                csv_content += line
-            
-            return csv_content.encode("utf-8-sig")
-        except Exception as e:
-            error_msg = f"Fehler beim CSV-Export: {str(e)}"
-            return error_msg.encode("utf-8-sig")
+    def iter_export_rows(
+        self,
+        period: Optional[Period] = None,
+        employee_id: Optional[int] = None,
+        customer_id: Optional[int] = None,
+        batch_size: int = 1000
+    ):
+        """Abgeschlossene Einträge als Zeilen, gestreamt
+
+        Eine sortierte Join-Abfrage; yield_per liest über einen
+        serverseitigen Cursor, statt alles in den Speicher zu laden.
+        Alle Filter sind optional.
+        """
+        query = self.db.query(
+            Employee.personal_nr,
+            Employee.first_name,
+            Employee.last_name,
+            Employee.hourly_rate.label("employee_rate"),
+            Object.name.label("object_name"),
+            TimeEntry.check_in,
+            TimeEntry.check_out,
+            TimeEntry.hourly_rate
+        ).join(
+            Employee, Employee.id == TimeEntry.employee_id
+        ).outerjoin(
+            Object, Object.id == TimeEntry.object_id
+        ).filter(
+            TimeEntry.check_out != None
+        )
+        
+        if period:
+            query = query.filter(period.filter(TimeEntry.check_in))
+        if employee_id:
+            query = query.filter(TimeEntry.employee_id == employee_id)
+        if customer_id:
+            query = query.filter(Object.customer_id == customer_id)
+        
+        query = query.order_by(
+            Employee.id,
+            TimeEntry.check_in,
+            TimeEntry.id
+        )
+        
+        return query.yield_per(batch_size)
+    
+    def iter_csv(
+        self,
+        period: Optional[Period] = None,
+        employee_id: Optional[int] = None,
+        customer_id: Optional[int] = None
+    ):
+        """CSV-Export als Generator von Byte-Blöcken (für StreamingResponse)"""
+        rows = self.iter_export_rows(period, employee_id, customer_id)
+        return iter_csv_chunks(rows)
+    
+    def export_to_csv(self, month: int, year: int) -> bytes:
+        """CSV-Export für einen Monat als Ganzes"""
+        return b"".join(self.iter_csv(period=month_period(year, month)))
+
+
+CSV_COLUMNS = ["Datum", "Mitarbeiter", "Personal-Nr", "Objekt", "Einstempelung", "Ausstempelung", "Stunden"]
+
+
+def iter_csv_chunks(rows, rows_per_chunk: int = 500):
+    """Export-Zeilen als UTF-8 CSV (Semikolon, mit BOM für Excel)
+
+    Felder werden über das csv-Modul maskiert; nach rows_per_chunk
+    Zeilen wird der Puffer als Block ausgegeben und geleert.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=";", lineterminator="\n")
+    writer.writerow(CSV_COLUMNS)
+    
+    yield codecs.BOM_UTF8
+    
+    count = 0
+    for row in rows:
+        duration_hours = round((row.check_out - row.check_in).total_seconds() / 3600, 2)
+        writer.writerow([
+            row.check_in.strftime("%d.%m.%Y"),
+            f"{row.first_name} {row.last_name}",
+            row.personal_nr,
+            row.object_name or "Unbekannt",
+            row.check_in.strftime("%H:%M"),
+            row.check_out.strftime("%H:%M"),
+            duration_hours
+        ])
+        count += 1
+        
+        if count % rows_per_chunk == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate(0)
+    
+    if count == 0:
+        writer.writerow(["Keine Daten vorhanden"])
+    
+    yield buffer.getvalue().encode("utf-8")
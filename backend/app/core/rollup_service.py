@@ -0,0 +1,127 @@
+from datetime import date, datetime
+from typing import Iterable, Optional, Tuple
+from sqlalchemy import func, insert, select, literal, DateTime
+from sqlalchemy.orm import Session
+from app.models.models import TimeEntry, DailyEmployeeHours, Employee
+from app.db.sql import duration_seconds
+from app.core.periods import range_period
+
+# Tagessummen in daily_employee_hours
+#
+# Schlüssel ist (employee_id, date, object_id, service_type), das Datum ist
+# der Tag des check_in (wie in allen Berichten). Jede Stelle, die eine
+# Stempelung abschließt oder ändert, ruft refresh_days() VOR dem commit auf,
+# damit Eintrag und Tagessumme in derselben Transaktion landen.
+#
+# Neuberechnungen desselben Mitarbeiters (Event-Bus in jedem Worker, Jobs,
+# Importe) laufen nacheinander: rebuild() nimmt vor dem DELETE je
+# Mitarbeiter einen Transaktions-Advisory-Lock. Ohne ihn sieht das zweite
+# DELETE unter READ COMMITTED die Zeilen des ersten nicht, und beide
+# INSERTs landen.
+
+# Erster Schlüssel der zweiteiligen Advisory-Locks (zweiter: employee_id)
+ROLLUP_LOCK_CLASS = 4210
+
+
+def entry_day(entry) -> Tuple[int, date]:
+    """(Mitarbeiter, Tag) unter dem ein Eintrag gezählt wird"""
+    return entry.employee_id, entry.check_in.date()
+
+
+def _aggregate_select(*criteria):
+    seconds = duration_seconds(TimeEntry.check_in, TimeEntry.check_out)
+    day = func.date(TimeEntry.check_in)
+    return select(
+        TimeEntry.employee_id,
+        TimeEntry.object_id,
+        day,
+        TimeEntry.service_type,
+        func.sum(seconds) / 60.0,
+        func.sum(seconds * func.coalesce(TimeEntry.hourly_rate, 0)) / 3600.0,
+        func.count(TimeEntry.id),
+        literal(datetime.utcnow(), DateTime)
+    ).where(
+        TimeEntry.check_out != None,
+        TimeEntry.employee_id != None,
+        *criteria
+    ).group_by(
+        TimeEntry.employee_id,
+        TimeEntry.object_id,
+        day,
+        TimeEntry.service_type
+    )
+
+
+def _lock_employees(db: Session, employee_ids: Optional[Iterable[int]]) -> None:
+    """Tagessummen der Mitarbeiter bis zum Ende der Transaktion sperren (nur PostgreSQL)"""
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    query = select(func.pg_advisory_xact_lock(ROLLUP_LOCK_CLASS, Employee.id))
+    if employee_ids is not None:
+        query = query.where(Employee.id.in_(employee_ids))
+    # Feste Reihenfolge gegen Deadlocks zwischen zwei Neuberechnungen
+    db.execute(query.order_by(Employee.id)).all()
+
+
+def rebuild(db: Session, start_date: date, end_date: date, employee_ids: Optional[Iterable[int]] = None) -> int:
+    """Tagessummen im Zeitraum (inkl. end_date) aus den Rohdaten neu berechnen
+
+    Mengenbasiert: ein DELETE und ein INSERT ... SELECT, egal wie viele
+    Tage/Mitarbeiter. Gibt die Anzahl geschriebener Zeilen zurück.
+    Kein commit - das macht der Aufrufer.
+    """
+    db.flush()
+    if employee_ids is not None:
+        employee_ids = list(employee_ids)
+    _lock_employees(db, employee_ids)
+
+    delete_query = db.query(DailyEmployeeHours).filter(
+        DailyEmployeeHours.date >= start_date,
+        DailyEmployeeHours.date <= end_date
+    )
+    criteria = [range_period(start_date, end_date).filter(TimeEntry.check_in)]
+    if employee_ids is not None:
+        delete_query = delete_query.filter(DailyEmployeeHours.employee_id.in_(employee_ids))
+        criteria.append(TimeEntry.employee_id.in_(employee_ids))
+    delete_query.delete(synchronize_session=False)
+
+    result = db.execute(
+        insert(DailyEmployeeHours).from_select([
+            DailyEmployeeHours.employee_id,
+            DailyEmployeeHours.object_id,
+            DailyEmployeeHours.date,
+            DailyEmployeeHours.service_type,
+            DailyEmployeeHours.minutes,
+            DailyEmployeeHours.amount,
+            DailyEmployeeHours.entries,
+            DailyEmployeeHours.updated_at,
+        ], _aggregate_select(*criteria))
+    )
+    return result.rowcount
+
+
+def refresh_days(db: Session, days: Iterable[Tuple[int, date]]) -> None:
+    """Tagessummen einzelner (Mitarbeiter, Tag)-Paare aktualisieren"""
+    for employee_id, day in sorted(d for d in set(days) if None not in d):
+        rebuild(db, day, day, [employee_id])
+
+
+def daily_totals(db: Session, employee_id: int, start_date: date, end_date: date):
+    """Summe pro Tag für einen Mitarbeiter - höchstens eine Zeile pro Tag
+
+    Zeilen: (date, minutes, amount, entries), aufsteigend nach Datum.
+    """
+    return db.query(
+        DailyEmployeeHours.date,
+        func.sum(DailyEmployeeHours.minutes),
+        func.sum(DailyEmployeeHours.amount),
+        func.sum(DailyEmployeeHours.entries)
+    ).filter(
+        DailyEmployeeHours.employee_id == employee_id,
+        DailyEmployeeHours.date >= start_date,
+        DailyEmployeeHours.date <= end_date
+    ).group_by(
+        DailyEmployeeHours.date
+    ).order_by(
+        DailyEmployeeHours.date
+    ).all()
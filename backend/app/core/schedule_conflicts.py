@@ -0,0 +1,169 @@
+import math
+import os
+from datetime import date, datetime, timedelta
+from typing import Iterable, List, NamedTuple, Optional
+from sqlalchemy.orm import Session
+from app.models.models import Employee
+from app.core.geofence import geofence, haversine_m
+from app.core.schedule_service import realized_shifts
+
+# Fahrzeit zwischen zwei Objekten: Luftlinie * Umwegfaktor bei Durchschnittstempo
+TRAVEL_SPEED_KMH = float(os.getenv("TRAVEL_SPEED_KMH", "40"))
+TRAVEL_DETOUR_FACTOR = float(os.getenv("TRAVEL_DETOUR_FACTOR", "1.3"))
+
+WEEKDAY_NAMES = ['Montag', 'Dienstag', 'Mittwoch', 'Donnerstag', 'Freitag', 'Samstag', 'Sonntag']
+
+
+class Shift(NamedTuple):
+    schedule_id: Optional[int]
+    employee_id: int
+    object_id: Optional[int]
+    day: date
+    start: datetime
+    end: datetime
+
+
+def make_shift(schedule_id, employee_id, object_id, day: date, start_time, end_time) -> Optional[Shift]:
+    """Schicht mit absoluten Zeitpunkten; Ende <= Beginn heißt über Mitternacht"""
+    if employee_id is None or start_time is None or end_time is None:
+        return None
+    start = datetime.combine(day, start_time)
+    end = datetime.combine(day, end_time)
+    if end <= start:
+        end += timedelta(days=1)
+    return Shift(schedule_id, employee_id, object_id, day, start, end)
+
+
+def travel_minutes(snap, from_object: Optional[int], to_object: Optional[int]) -> Optional[float]:
+    """Geschätzte Fahrzeit in Minuten (None: Objekt ohne GPS/inaktiv)"""
+    if from_object == to_object:
+        return 0.0
+    a = snap.positions.get(from_object)
+    b = snap.positions.get(to_object)
+    if a is None or b is None:
+        return None
+    distance = float(haversine_m(
+        math.degrees(snap.lat[a]), math.degrees(snap.lng[a]),
+        snap.lat[b], snap.lng[b], snap.cos_lat[b]
+    ))
+    return distance * TRAVEL_DETOUR_FACTOR / (TRAVEL_SPEED_KMH * 1000 / 60)
+
+
+def detect_conflicts(shifts: Iterable[Shift], snap) -> List[tuple]:
+    """Überschneidungen und zu knappe Wechsel zwischen Objekten finden
+
+    Eine Sortierung nach (Mitarbeiter, Beginn), dann ein Durchlauf: pro
+    Mitarbeiter wird nur die bisher am spätesten endende Schicht gehalten.
+    Beginnt die nächste vor deren Ende, überschneiden sie sich; sonst muss
+    die Lücke mindestens die Fahrzeit zwischen den Objekten sein.
+    Ergebnis: (Art, frühere Schicht, spätere Schicht, Zusatzangaben).
+    """
+    conflicts = []
+    latest = None
+    for shift in sorted(shifts, key=lambda s: (s.employee_id, s.start, s.end)):
+        if latest is None or latest.employee_id != shift.employee_id:
+            latest = shift
+            continue
+
+        if shift.start < latest.end:
+            conflicts.append(('zeitüberschneidung', latest, shift, {}))
+        else:
+            travel = travel_minutes(snap, latest.object_id, shift.object_id)
+            gap = (shift.start - latest.end).total_seconds() / 60
+            if travel is not None and gap < travel:
+                conflicts.append(('fahrzeit', latest, shift, {
+                    'gap_minutes': round(gap),
+                    'travel_minutes': round(travel)
+                }))
+
+        if shift.end > latest.end:
+            latest = shift
+    return conflicts
+
+
+def _conflict(kind: str, first: Shift, second: Shift, extra: dict) -> dict:
+    return {
+        'type': kind,
+        'employee_id': second.employee_id,
+        'date': second.day.isoformat(),
+        'weekday': WEEKDAY_NAMES[second.day.weekday()],
+        'shift1': _shift_info(first),
+        'shift2': _shift_info(second),
+        **extra
+    }
+
+
+def _shift_info(shift: Shift) -> dict:
+    return {
+        'id': shift.schedule_id,
+        'object': shift.object_id,
+        'date': shift.day.isoformat(),
+        'time': f"{shift.start.strftime('%H:%M')}-{shift.end.strftime('%H:%M')}"
+    }
+
+
+def _as_dicts(db: Session, found: List[tuple]) -> List[dict]:
+    """Konflikte fürs Frontend, Namen mit einer Abfrage nachladen"""
+    conflicts = [_conflict(*c) for c in found]
+    employee_ids = {c['employee_id'] for c in conflicts}
+    if not employee_ids:
+        return conflicts
+    names = {
+        row.id: f"{row.first_name} {row.last_name}"
+        for row in db.query(Employee.id, Employee.first_name, Employee.last_name).filter(
+            Employee.id.in_(employee_ids)
+        )
+    }
+    for conflict in conflicts:
+        conflict['employee'] = names.get(conflict['employee_id'], f"Mitarbeiter {conflict['employee_id']}")
+    return conflicts
+
+
+def _shifts_between(db: Session, start_date: date, end_date: date, employee_ids=None) -> List[Shift]:
+    shifts = []
+    for day, schedule in realized_shifts(db, start_date, end_date, employee_ids):
+        shift = make_shift(
+            schedule.id, schedule.employee_id, schedule.object_id,
+            day, schedule.start_time, schedule.end_time
+        )
+        if shift is not None:
+            shifts.append(shift)
+    return shifts
+
+
+def find_conflicts(db: Session, start_date: date, end_date: date, employee_ids=None) -> List[dict]:
+    """Alle Konflikte mit Schichtbeginn im Zeitraum (inkl. end_date)
+
+    Der Vortag wird mitgeladen, damit Nachtschichten über Mitternacht
+    gegen den ersten Tag geprüft werden.
+    """
+    shifts = _shifts_between(db, start_date - timedelta(days=1), end_date, employee_ids)
+    found = [
+        c for c in detect_conflicts(shifts, geofence.snapshot(db))
+        if c[2].day >= start_date
+    ]
+    return _as_dicts(db, found)
+
+
+def validate_shift(db: Session, candidate: Shift) -> List[dict]:
+    """Konflikte einer einzelnen (geänderten/neuen) Schicht
+
+    Lädt nur den Mitarbeiter am Vortag, Tag und Folgetag; die gespeicherte
+    Fassung derselben Schicht wird durch den Kandidaten ersetzt, auch wenn
+    sie auf einem anderen Tag lag (Schicht verschoben). Liefert nur
+    Konflikte, an denen der Kandidat beteiligt ist.
+    """
+    shifts = [
+        s for s in _shifts_between(
+            db, candidate.day - timedelta(days=1), candidate.day + timedelta(days=1),
+            [candidate.employee_id]
+        )
+        if not (candidate.schedule_id and s.schedule_id == candidate.schedule_id)
+    ]
+    shifts.append(candidate)
+
+    found = [
+        c for c in detect_conflicts(shifts, geofence.snapshot(db))
+        if c[1] is candidate or c[2] is candidate
+    ]
+    return _as_dicts(db, found)
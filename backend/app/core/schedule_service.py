@@ -0,0 +1,355 @@
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import Date, DateTime, Integer, and_, exists, insert, literal, select, union_all, update
+from sqlalchemy.orm import Session, aliased
+from app.models.models import Schedule, Employee, Object
+from app.db.sql import add_days, dialect_insert
+
+WEEKDAY_MAP = {
+    'Montag': 0,
+    'Dienstag': 1,
+    'Mittwoch': 2,
+    'Donnerstag': 3,
+    'Freitag': 4,
+    'Samstag': 5,
+    'Sonntag': 6
+}
+
+# Obergrenze pro Request (Wochenplaner schickt einige hundert Zellen)
+MAX_BULK_ITEMS = 5000
+
+SCHEDULE_FIELDS = (
+    'employee_id', 'object_id', 'weekday', 'start_time', 'end_time',
+    'planned_hours', 'status', 'replacement_for'
+)
+REQUIRED_FOR_INSERT = ('employee_id', 'object_id', 'weekday', 'start_time', 'end_time')
+
+# Höchstens so viele Zielwochen pro Kopiervorgang (zwei Jahre)
+MAX_COPY_WEEKS = 104
+
+
+class ScheduleValidationError(ValueError):
+    pass
+
+
+def parse_time(value) -> time:
+    """'06:00' / '6:00:00' / time -> time"""
+    if isinstance(value, time):
+        return value
+    try:
+        parts = str(value).split(':')
+        return time(int(parts[0]), int(parts[1]))
+    except (ValueError, IndexError):
+        raise ScheduleValidationError(f"Ungültige Uhrzeit: {value!r}")
+
+
+def parse_weekday(value) -> int:
+    """'Montag' oder 0-6 -> 0-6 (Montag=0)"""
+    if isinstance(value, str) and not value.isdigit():
+        if value not in WEEKDAY_MAP:
+            raise ScheduleValidationError(f"Ungültiger Wochentag: {value!r}")
+        return WEEKDAY_MAP[value]
+    try:
+        weekday = int(value)
+    except (TypeError, ValueError):
+        raise ScheduleValidationError(f"Ungültiger Wochentag: {value!r}")
+    if not 0 <= weekday <= 6:
+        raise ScheduleValidationError(f"Ungültiger Wochentag: {value!r}")
+    return weekday
+
+
+def shift_hours(start: time, end: time) -> float:
+    """Dauer einer Schicht in Stunden, über Mitternacht hinweg"""
+    minutes = (end.hour * 60 + end.minute) - (start.hour * 60 + start.minute)
+    if minutes <= 0:
+        minutes += 24 * 60
+    return round(minutes / 60, 2)
+
+
+def normalize_schedule(item: dict) -> dict:
+    """Ein Payload-Element prüfen und in Spaltenwerte umwandeln"""
+    values = {}
+    for field in ('employee_id', 'object_id', 'replacement_for'):
+        if field in item:
+            raw = item[field]
+            if raw is None and field == 'replacement_for':
+                values[field] = None
+                continue
+            try:
+                values[field] = int(raw)
+            except (TypeError, ValueError):
+                raise ScheduleValidationError(f"{field} ungültig: {raw!r}")
+    if 'weekday' in item:
+        values['weekday'] = parse_weekday(item['weekday'])
+    if 'start_time' in item:
+        values['start_time'] = parse_time(item['start_time'])
+    if 'end_time' in item:
+        values['end_time'] = parse_time(item['end_time'])
+    if 'planned_hours' in item and item['planned_hours'] is not None:
+        try:
+            values['planned_hours'] = float(item['planned_hours'])
+        except (TypeError, ValueError):
+            raise ScheduleValidationError(f"planned_hours ungültig: {item['planned_hours']!r}")
+    if 'status' in item:
+        values['status'] = item['status'] or 'normal'
+    return values
+
+
+def bulk_upsert_schedules(db: Session, items: List[dict]) -> Dict:
+    """Viele Dienstplan-Änderungen in einer Transaktion schreiben
+
+    Ablauf (unabhängig von der Anzahl der Elemente):
+      1. Payload komplett prüfen und normalisieren
+      2. je eine IN-Abfrage für referenzierte Schichten, Mitarbeiter, Objekte
+      3. UPDATEs per executemany (gruppiert nach geänderten Spalten),
+         INSERTs als ein Mehrzeilen-INSERT mit RETURNING
+    Ungültige Elemente werden übersprungen und im Ergebnis gemeldet,
+    der Rest wird geschrieben. Kein commit - das macht der Aufrufer.
+    """
+    if len(items) > MAX_BULK_ITEMS:
+        raise ScheduleValidationError(f"Maximal {MAX_BULK_ITEMS} Änderungen pro Anfrage")
+
+    results: List[Optional[dict]] = [None] * len(items)
+    parsed = []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            results[index] = {'index': index, 'id': None, 'status': 'invalid', 'error': 'Kein Objekt'}
+            continue
+        try:
+            parsed.append((index, item.get('id'), normalize_schedule(item)))
+        except ScheduleValidationError as e:
+            results[index] = {'index': index, 'id': item.get('id'), 'status': 'invalid', 'error': str(e)}
+
+    # Referenzen in je einer Abfrage prüfen
+    schedule_ids = {sid for _, sid, _ in parsed if sid}
+    employee_ids = {v[f] for _, _, v in parsed for f in ('employee_id', 'replacement_for') if v.get(f)}
+    object_ids = {v['object_id'] for _, _, v in parsed if v.get('object_id')}
+
+    existing = {}
+    if schedule_ids:
+        existing = {
+            row.id: row for row in db.query(
+                Schedule.id, Schedule.start_time, Schedule.end_time
+            ).filter(Schedule.id.in_(schedule_ids))
+        }
+    known_employees = {
+        row.id for row in db.query(Employee.id).filter(Employee.id.in_(employee_ids))
+    } if employee_ids else set()
+    known_objects = {
+        row.id for row in db.query(Object.id).filter(Object.id.in_(object_ids))
+    } if object_ids else set()
+
+    updates = {}      # Spaltensatz -> Parameterliste (executemany)
+    inserts = []      # (index, Werte)
+    for index, schedule_id, values in parsed:
+        error = None
+        if values.get('employee_id') and values['employee_id'] not in known_employees:
+            error = f"Mitarbeiter {values['employee_id']} nicht gefunden"
+        elif values.get('replacement_for') and values['replacement_for'] not in known_employees:
+            error = f"Mitarbeiter {values['replacement_for']} nicht gefunden"
+        elif values.get('object_id') and values['object_id'] not in known_objects:
+            error = f"Objekt {values['object_id']} nicht gefunden"
+        if error:
+            results[index] = {'index': index, 'id': schedule_id, 'status': 'invalid', 'error': error}
+            continue
+
+        if schedule_id:
+            current = existing.get(schedule_id)
+            if current is None:
+                results[index] = {'index': index, 'id': schedule_id, 'status': 'not_found'}
+                continue
+            # Sollstunden mitziehen, wenn sich die Zeiten ändern
+            if ('start_time' in values or 'end_time' in values) and 'planned_hours' not in values:
+                start = values.get('start_time', current.start_time)
+                end = values.get('end_time', current.end_time)
+                if start and end:
+                    values['planned_hours'] = shift_hours(start, end)
+            if values:
+                updates.setdefault(tuple(sorted(values)), []).append({'id': schedule_id, **values})
+            results[index] = {'index': index, 'id': schedule_id, 'status': 'updated'}
+        else:
+            missing = [f for f in REQUIRED_FOR_INSERT if f not in values]
+            if missing:
+                results[index] = {
+                    'index': index, 'id': None, 'status': 'invalid',
+                    'error': f"Für neue Schichten fehlt: {', '.join(missing)}"
+                }
+                continue
+            values.setdefault('planned_hours', shift_hours(values['start_time'], values['end_time']))
+            values.setdefault('status', 'normal')
+            values.setdefault('replacement_for', None)
+            inserts.append((index, values))
+
+    for params in updates.values():
+        # ORM-Bulk-UPDATE nach Primärschlüssel -> executemany
+        db.execute(update(Schedule), params)
+
+    if inserts:
+        new_ids = db.execute(
+            insert(Schedule).returning(Schedule.id, sort_by_parameter_order=True),
+            [values for _, values in inserts]
+        ).scalars().all()
+        for (index, _), new_id in zip(inserts, new_ids):
+            results[index] = {'index': index, 'id': new_id, 'status': 'created'}
+
+    counts = {}
+    for result in results:
+        counts[result['status']] = counts.get(result['status'], 0) + 1
+
+    return {'results': results, 'counts': counts}
+
+
+def week_start(day: date) -> date:
+    """Montag der Woche, in der day liegt"""
+    return day - timedelta(days=day.weekday())
+
+
+def realized_shifts(
+    db: Session,
+    start_date: date,
+    end_date: date,
+    employee_ids: Optional[Iterable[int]] = None
+) -> List[Tuple[date, Schedule]]:
+    """Tatsächlich geplante Schichten pro Tag im Zeitraum (inkl. end_date)
+
+    Datierte Schichten zählen immer. Die Wochenvorlage (date IS NULL) gilt
+    an jedem Tag, außer eine datierte Schicht desselben Mitarbeiters am
+    selben Objekt und Tag ersetzt sie - die übrigen Vorlagen der Woche
+    bleiben. Zwei Abfragen, egal wie lang der Zeitraum ist.
+    Ergebnis: (Tag, Schicht), sortiert nach Tag/Beginn.
+    """
+    instance_query = db.query(Schedule).filter(
+        Schedule.date >= start_date,
+        Schedule.date <= end_date
+    )
+    template_query = db.query(Schedule).filter(Schedule.date == None)
+    if employee_ids is not None:
+        employee_ids = list(employee_ids)
+        instance_query = instance_query.filter(Schedule.employee_id.in_(employee_ids))
+        template_query = template_query.filter(Schedule.employee_id.in_(employee_ids))
+
+    instances = instance_query.all()
+    templates_by_weekday = {}
+    for template in template_query.all():
+        templates_by_weekday.setdefault(template.weekday, []).append(template)
+
+    # Von datierten Schichten ersetzte Vorlagen: (Mitarbeiter, Objekt, Tag)
+    replaced = {(s.employee_id, s.object_id, s.date) for s in instances}
+
+    shifts = [(s.date, s) for s in instances if start_date <= s.date <= end_date]
+    day = start_date
+    while day <= end_date:
+        for template in templates_by_weekday.get(day.weekday(), ()):
+            if (template.employee_id, template.object_id, day) not in replaced:
+                shifts.append((day, template))
+        day += timedelta(days=1)
+
+    shifts.sort(key=lambda item: (item[0], item[1].start_time or time.min, item[1].employee_id or 0))
+    return shifts
+
+
+def copy_weeks(
+    db: Session,
+    source_week: date,
+    target_week: date,
+    weeks: int = 1,
+    repeat: int = 1,
+    every: Optional[int] = None,
+    employee_ids: Optional[Iterable[int]] = None
+) -> int:
+    """Dienstplan-Wochen als datierte Schichten in spätere Wochen kopieren
+
+    Kopiert wird der Block aus `weeks` Wochen ab source_week nach
+    target_week, `repeat`-mal im Abstand von `every` Wochen (Standard:
+    Blocklänge). Beispiel "alle 2 Wochen ab KW36": source_week=KW36,
+    target_week=KW38, every=2, repeat=n.
+
+    Quelle sind die datierten Schichten der Quellwoche plus die
+    Wochenvorlagen, die dort nicht durch eine datierte Schicht am selben
+    Objekt und Tag ersetzt sind (wie realized_shifts). Urlaub/
+    Krank wird als normale Schicht übernommen, Vertretungen nicht.
+    Ein einziges INSERT ... SELECT, bereits vorhandene Schichten bleiben
+    unverändert (ON CONFLICT DO NOTHING). Gibt die Anzahl neuer Schichten
+    zurück. Kein commit - das macht der Aufrufer.
+    """
+    every = every or weeks
+    if weeks < 1 or repeat < 1 or every < 1:
+        raise ScheduleValidationError("weeks, repeat und every müssen mindestens 1 sein")
+    if weeks * repeat > MAX_COPY_WEEKS:
+        raise ScheduleValidationError(f"Maximal {MAX_COPY_WEEKS} Zielwochen pro Kopiervorgang")
+
+    source = week_start(source_week)
+    target = week_start(target_week)
+
+    # Wochenpaare (Quelle -> Ziel) als kleine Konstantentabelle
+    pairs = []
+    for r in range(repeat):
+        for w in range(weeks):
+            source_start = source + timedelta(weeks=w)
+            target_start = target + timedelta(weeks=r * every + w)
+            pairs.append(select(
+                literal(source_start, Date).label('source_start'),
+                literal(source_start + timedelta(days=7), Date).label('source_end'),
+                literal(target_start, Date).label('target_start'),
+                literal((target_start - source_start).days, Integer).label('shift_days')
+            ))
+    week_pairs = union_all(*pairs).subquery('week_pairs') if len(pairs) > 1 else pairs[0].subquery('week_pairs')
+
+    now = datetime.utcnow()
+    criteria = [Schedule.replacement_for == None]
+    if employee_ids is not None:
+        criteria.append(Schedule.employee_id.in_(list(employee_ids)))
+
+    def shift_columns(target_date, weekday):
+        return (
+            Schedule.employee_id,
+            Schedule.object_id,
+            weekday,
+            target_date,
+            Schedule.start_time,
+            Schedule.end_time,
+            Schedule.planned_hours,
+            literal('normal'),
+            literal(now, DateTime)
+        )
+
+    # Datierte Schichten der Quellwoche, um die Wochendifferenz verschoben
+    instances = select(
+        *shift_columns(add_days(Schedule.date, week_pairs.c.shift_days), Schedule.weekday)
+    ).join_from(
+        Schedule, week_pairs,
+        and_(Schedule.date >= week_pairs.c.source_start, Schedule.date < week_pairs.c.source_end)
+    ).where(*criteria)
+
+    # Vorlagen, sofern am Quelltag keine datierte Schicht am selben Objekt sie ersetzt
+    planned = aliased(Schedule)
+    templates = select(
+        *shift_columns(add_days(week_pairs.c.target_start, Schedule.weekday), Schedule.weekday)
+    ).join_from(
+        Schedule, week_pairs, Schedule.date == None
+    ).where(
+        *criteria,
+        Schedule.weekday >= 0,
+        Schedule.weekday <= 6,
+        ~exists().where(
+            planned.employee_id == Schedule.employee_id,
+            planned.object_id == Schedule.object_id,
+            planned.date == add_days(week_pairs.c.source_start, Schedule.weekday)
+        )
+    )
+
+    statement = dialect_insert(db, Schedule).from_select([
+        Schedule.employee_id,
+        Schedule.object_id,
+        Schedule.weekday,
+        Schedule.date,
+        Schedule.start_time,
+        Schedule.end_time,
+        Schedule.planned_hours,
+        Schedule.status,
+        Schedule.updated_at,
+    ], union_all(instances, templates)).on_conflict_do_nothing(
+        index_elements=[Schedule.employee_id, Schedule.object_id, Schedule.date, Schedule.start_time],
+        index_where=Schedule.date != None
+    )
+    return db.execute(statement).rowcount
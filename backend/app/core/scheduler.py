@@ -0,0 +1,320 @@
+import asyncio
+import json
+import logging
+import time
+import traceback
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.db.database import SessionLocal, engine
+from app.db.sql import dialect_insert
+from app.models.models import JobRun
+
+logger = logging.getLogger(__name__)
+
+# Zeitgesteuerte Aufgaben im App-Prozess (statt Cron + einzelner Skripte)
+#
+# Jobs registrieren sich mit @scheduler.job(name, "cron-ausdruck") in
+# app/core/jobs.py und bekommen (db, Sollzeitpunkt). Jeder Lauf landet in
+# job_runs; (job_name, scheduled_for) ist eindeutig, ein PostgreSQL-Advisory-
+# Lock je Job verhindert parallele Läufe über mehrere Worker/Server hinweg.
+# Verpasste Läufe (App war aus) werden beim Start einmal nachgeholt.
+
+# Wie lange ein Nachhol-Lauf höchstens zurückliegen darf
+CATCH_UP_WINDOW = timedelta(days=2)
+
+_FIELDS = (
+    ("Minute", 0, 59),
+    ("Stunde", 0, 23),
+    ("Tag", 1, 31),
+    ("Monat", 1, 12),
+    ("Wochentag", 0, 6),
+)
+
+
+def _parse_field(text: str, name: str, low: int, high: int) -> frozenset:
+    values = set()
+    for part in text.split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            step = int(step_text)
+            if step < 1:
+                raise ValueError(f"Cron: Schrittweite für {name} muss >= 1 sein")
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start, end = (int(v) for v in part.split("-", 1))
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+        if name == "Wochentag":
+            # 7 = Sonntag wie in crontab
+            start, end = min(start, 7), min(end, 7)
+            if start == 7 and end == 7:
+                start = end = 0
+        if start < low or end > (7 if name == "Wochentag" else high) or start > end:
+            raise ValueError(f"Cron: ungültiger Wert '{text}' für {name}")
+        values.update(v % 7 if name == "Wochentag" else v for v in range(start, end + 1, step))
+    return frozenset(values)
+
+
+class CronExpression:
+    """Cron-Ausdruck mit fünf Feldern: Minute Stunde Tag Monat Wochentag
+
+    Wie crontab: *, Listen (1,15), Bereiche (8-18), Schritte (*/5, 8-18/2),
+    Wochentag 0/7 = Sonntag. Sind Tag und Wochentag beide eingeschränkt,
+    reicht einer von beiden. Ausgewertet in lokaler Zeit (datetime.now()).
+    """
+
+    def __init__(self, expression: str):
+        parts = expression.split()
+        if len(parts) != 5:
+            raise ValueError(f"Cron: fünf Felder erwartet, nicht '{expression}'")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            _parse_field(part, *field) for part, field in zip(parts, _FIELDS)
+        )
+        self._any_day = parts[2] == "*"
+        self._any_weekday = parts[4] == "*"
+
+    def __repr__(self) -> str:
+        return f"CronExpression({self.expression!r})"
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_ok = moment.day in self.days
+        # isoweekday: Mo=1 ... So=7 -> crontab So=0
+        weekday_ok = moment.isoweekday() % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def matches(self, moment: datetime) -> bool:
+        return (
+            moment.minute in self.minutes
+            and moment.hour in self.hours
+            and moment.month in self.months
+            and self._day_matches(moment)
+        )
+
+    def next_after(self, moment: datetime) -> datetime:
+        """Erster Zeitpunkt echt nach moment"""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 5)
+        while candidate < limit:
+            if candidate.month not in self.months:
+                year, month = divmod(candidate.month, 12)
+                candidate = candidate.replace(year=candidate.year + year, month=month + 1, day=1, hour=0, minute=0)
+            elif not self._day_matches(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+            elif candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron: '{self.expression}' trifft nie zu")
+
+    def last_until(self, moment: datetime, since: datetime) -> Optional[datetime]:
+        """Letzter Zeitpunkt in (since, moment] - None, wenn keiner"""
+        last = None
+        candidate = self.next_after(since)
+        while candidate <= moment:
+            last = candidate
+            candidate = self.next_after(candidate)
+        return last
+
+
+class Job:
+    def __init__(self, name: str, cron: str, func: Callable, catch_up: bool):
+        self.name = name
+        self.cron = CronExpression(cron)
+        self.func = func
+        self.catch_up = catch_up
+        self.lock_key = zlib.crc32(f"seda24-job:{name}".encode())
+        self.next_run: Optional[datetime] = None
+        self.running = False
+        # Kennzahlen seit Start dieses Prozesses
+        self.runs = 0
+        self.failures = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.last_seconds: Optional[float] = None
+        self.last_status: Optional[str] = None
+
+    def record(self, status: str, seconds: float) -> None:
+        self.runs += 1
+        self.failures += status == "error"
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.last_seconds = seconds
+        self.last_status = status
+
+    def info(self) -> dict:
+        return {
+            "name": self.name,
+            "cron": self.cron.expression,
+            "catch_up": self.catch_up,
+            "next_run": self.next_run,
+            "running": self.running,
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_status": self.last_status,
+            "last_ms": round(self.last_seconds * 1000, 1) if self.last_seconds is not None else None,
+            "avg_ms": round(self.total_seconds / self.runs * 1000, 1) if self.runs else None,
+            "max_ms": round(self.max_seconds * 1000, 1) if self.runs else None,
+        }
+
+
+@contextmanager
+def advisory_lock(key: int):
+    """PostgreSQL-Advisory-Lock auf eigener Verbindung; ohne PostgreSQL immer frei"""
+    if engine.dialect.name != "postgresql":
+        yield True
+        return
+    with engine.connect() as connection:
+        acquired = connection.execute(select(func.pg_try_advisory_lock(key))).scalar()
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                connection.execute(select(func.pg_advisory_unlock(key)))
+            connection.commit()
+
+
+class JobScheduler:
+    def __init__(self):
+        self.jobs: Dict[str, Job] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    def job(self, name: str, cron: str, catch_up: bool = True):
+        """Decorator: func(db, scheduled_for) -> dict|None zu cron-Zeiten ausführen"""
+        def register(func):
+            if name in self.jobs:
+                raise ValueError(f"Job '{name}' ist bereits registriert")
+            self.jobs[name] = Job(name, cron, func, catch_up)
+            return func
+        return register
+
+    @property
+    def running(self) -> bool:
+        return any(not task.done() for task in self._tasks)
+
+    # ----- Ausführen -----
+
+    def _claim(self, db: Session, job: Job, scheduled_for: datetime, trigger: str) -> Optional[int]:
+        statement = dialect_insert(db, JobRun).values(
+            job_name=job.name,
+            scheduled_for=scheduled_for,
+            started_at=datetime.now(),
+            status="running",
+            trigger=trigger,
+        ).on_conflict_do_nothing(
+            index_elements=[JobRun.job_name, JobRun.scheduled_for]
+        ).returning(JobRun.id)
+        run_id = db.execute(statement).scalar()
+        db.commit()
+        return run_id
+
+    def execute(self, job: Job, scheduled_for: datetime, trigger: str = "cron") -> Optional[dict]:
+        """Einen Lauf ausführen und protokollieren (blockierend, im Threadpool)
+
+        Gibt None zurück, wenn der Lauf schon anderswo läuft oder lief.
+        """
+        with advisory_lock(job.lock_key) as acquired:
+            if not acquired:
+                logger.info("Job %s läuft bereits in einem anderen Prozess", job.name)
+                return None
+            db = SessionLocal()
+            try:
+                run_id = self._claim(db, job, scheduled_for, trigger)
+                if run_id is None:
+                    logger.info("Job %s für %s wurde bereits ausgeführt", job.name, scheduled_for)
+                    return None
+                job.running = True
+                started = time.perf_counter()
+                result, error, status = None, None, "ok"
+                try:
+                    result = job.func(db, scheduled_for)
+                except Exception:
+                    db.rollback()
+                    status = "error"
+                    error = traceback.format_exc(limit=5)
+                    logger.exception("Job %s fehlgeschlagen", job.name)
+                seconds = time.perf_counter() - started
+                job.running = False
+                job.record(status, seconds)
+
+                run = db.get(JobRun, run_id)
+                run.finished_at = datetime.now()
+                run.duration_ms = round(seconds * 1000, 1)
+                run.status = status
+                run.result = json.dumps(result, default=str) if result is not None else None
+                run.error = error
+                db.commit()
+                return {"id": run_id, "status": status, "duration_ms": run.duration_ms, "result": result}
+            finally:
+                job.running = False
+                db.close()
+
+    def _missed_run(self, job: Job, last: Optional[datetime], now: datetime) -> Optional[datetime]:
+        if not job.catch_up or last is None:
+            return None
+        return job.cron.last_until(now, max(last, now - CATCH_UP_WINDOW))
+
+    async def _loop(self, job: Job, missed: Optional[datetime]) -> None:
+        if missed is not None:
+            logger.info("Job %s: verpassten Lauf von %s nachholen", job.name, missed)
+            await run_in_threadpool(self.execute, job, missed, "catch_up")
+        due = job.cron.next_after(datetime.now())
+        while True:
+            job.next_run = due
+            await asyncio.sleep(max((due - datetime.now()).total_seconds(), 0))
+            try:
+                await run_in_threadpool(self.execute, job, due)
+            except Exception:
+                # z.B. Datenbank nicht erreichbar - nächster Termin versucht es erneut
+                logger.exception("Job %s konnte nicht gestartet werden", job.name)
+            due = job.cron.next_after(max(due, datetime.now()))
+
+    # ----- Lebenszyklus -----
+
+    def _last_runs(self) -> Dict[str, datetime]:
+        db = SessionLocal()
+        try:
+            return dict(
+                db.query(JobRun.job_name, func.max(JobRun.scheduled_for)).group_by(JobRun.job_name).all()
+            )
+        finally:
+            db.close()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        last_runs = await run_in_threadpool(self._last_runs)
+        now = datetime.now()
+        for job in self.jobs.values():
+            missed = self._missed_run(job, last_runs.get(job.name), now)
+            self._tasks.append(asyncio.create_task(self._loop(job, missed)))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        for job in self.jobs.values():
+            job.next_run = None
+
+    async def run_now(self, name: str) -> Optional[dict]:
+        """Job sofort ausführen (Admin) - unabhängig vom Zeitplan"""
+        job = self.jobs[name]
+        return await run_in_threadpool(self.execute, job, datetime.now(), "manual")
+
+    def info(self) -> List[dict]:
+        return [job.info() for job in self.jobs.values()]
+
+
+scheduler = JobScheduler()
@@ -1,25 +1,81 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 import os
 from dotenv import load_dotenv
 from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
 
 load_dotenv()
 
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES"))
+# Stream-Tokens stehen in der URL (EventSource) und damit in Access-Logs - nur kurz gültig
+STREAM_TOKEN_EXPIRE_SECONDS = int(os.getenv("STREAM_TOKEN_EXPIRE_SECONDS", "60"))
+
+# Kostenfaktor für neue Hashes; ältere, billigere Hashes werden beim Login erneuert
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# bcrypt gibt den GIL frei, daher reicht ein Thread-Pool (Prozesse wären teurer)
+PASSWORD_WORKERS = int(os.getenv("PASSWORD_WORKERS", "0")) or min(4, os.cpu_count() or 1)
+# Maximal wartende Prüfungen zusätzlich zu den laufenden, danach 503
+PASSWORD_QUEUE_LIMIT = int(os.getenv("PASSWORD_QUEUE_LIMIT", "64"))
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS
+)
+
+_password_executor = ThreadPoolExecutor(max_workers=PASSWORD_WORKERS, thread_name_prefix="bcrypt")
+_password_slots = threading.BoundedSemaphore(PASSWORD_WORKERS + PASSWORD_QUEUE_LIMIT)
+
+
+class PasswordPoolBusy(Exception):
+    """Alle Plätze im bcrypt-Pool belegt (Login-Ansturm)"""
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
+async def _run_in_password_pool(fn, *args):
+    if not _password_slots.acquire(blocking=False):
+        raise PasswordPoolBusy()
+    try:
+        future = _password_executor.submit(fn, *args)
+    except Exception:
+        _password_slots.release()
+        raise
+    # Platz erst freigeben, wenn bcrypt wirklich fertig ist (auch bei Abbruch des Requests)
+    future.add_done_callback(lambda _: _password_slots.release())
+    return await asyncio.wrap_future(future)
+
+async def verify_password_async(plain_password, hashed_password):
+    """Passwort im bcrypt-Pool prüfen, ohne Event-Loop oder Worker-Threads zu blockieren
+
+    Gibt (gültig, neuer_hash) zurück; neuer_hash ist gesetzt, wenn der
+    gespeicherte Hash weniger Runden als BCRYPT_ROUNDS hat.
+    Wirft PasswordPoolBusy, wenn die Warteschlange voll ist.
+    """
+    return await _run_in_password_pool(pwd_context.verify_and_update, plain_password, hashed_password)
+
+@lru_cache(maxsize=1)
+def _dummy_hash():
+    return pwd_context.hash("seda24-dummy-passwort")
+
+def _verify_dummy(plain_password):
+    pwd_context.verify(plain_password, _dummy_hash())
+    return False, None
+
+async def dummy_verify(plain_password):
+    """Gleich teure Prüfung für unbekannte E-Mails, damit die Antwortzeit nichts verrät"""
+    return await _run_in_password_pool(_verify_dummy, plain_password)
+
 def get_password_hash(password):
     return pwd_context.hash(password)
 
@@ -30,34 +86,13 @@ def create_access_token(data: dict):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(lambda: None)):
-    """Aktuellen User aus JWT Token holen"""
-    from app.db.database import get_db
-    from app.models.models import User
-    
-    # DB Session holen
-    if db is None:
-        db = next(get_db())
-    
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-    
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
-        raise credentials_exception
-    
-    return user
+def create_stream_token(sub: str, scope: str):
+    """Kurzlebiges Token, das nur der Stream-Endpoint mit diesem scope annimmt"""
+    expire = datetime.utcnow() + timedelta(seconds=STREAM_TOKEN_EXPIRE_SECONDS)
+    return jwt.encode({"sub": sub, "scope": scope, "exp": expire}, SECRET_KEY, algorithm=ALGORITHM)
+
+# Einheitliche Auth-Dependency (User + Employee, gecacht) liegt in app.core.deps
+from app.core.deps import get_current_user, oauth2_scheme  # noqa: E402
 
 def get_current_active_user(current_user = Depends(get_current_user)):
     """Prüft ob User aktiv ist"""
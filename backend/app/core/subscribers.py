@@ -0,0 +1,46 @@
+from app.db.database import SessionLocal
+from app.core.events import (
+    bus, CheckedIn, CheckedOut, ObjectSwitched, CorrectionApproved, EntryBooked
+)
+from app.core.rollup_service import refresh_days
+from app.core.validation_service import ValidationService
+
+# Abonnenten der Stempel-Ereignisse (app/core/events.py)
+#
+# Jeder Abonnent arbeitet mit eigener Session und eigenem commit - der
+# Request ist zu diesem Zeitpunkt längst beantwortet. Der Live-Status hängt
+# direkt an den commits (app/core/live_status.py), nicht am Bus.
+
+
+@bus.subscribe(CheckedOut, ObjectSwitched, EntryBooked, CorrectionApproved)
+def update_daily_rollups(evt):
+    """Tagessummen der betroffenen (Mitarbeiter, Tag)-Paare neu rechnen"""
+    if isinstance(evt, CorrectionApproved):
+        days = evt.days
+    elif isinstance(evt, ObjectSwitched):
+        days = [(evt.employee_id, evt.from_check_in.date())]
+    else:
+        days = [(evt.employee_id, evt.check_in.date())]
+
+    db = SessionLocal()
+    try:
+        refresh_days(db, days)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+@bus.subscribe(CheckedIn, ObjectSwitched)
+def check_planned_object(evt):
+    """Warnung (und Mail), wenn am Objekt gestempelt wird, das heute nicht geplant ist"""
+    object_id = evt.to_object_id if isinstance(evt, ObjectSwitched) else evt.object_id
+    if object_id is None:
+        return
+    db = SessionLocal()
+    try:
+        ValidationService.check_schedule_compliance(db, evt.employee_id, object_id)
+    finally:
+        db.close()
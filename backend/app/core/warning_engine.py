@@ -0,0 +1,138 @@
+import logging
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from app.models.models import TimeEntry, Warning
+from app.db.sql import dialect_insert
+from app.core.periods import range_period
+from app.core.schedule_service import realized_shifts
+from app.core.email_service import EmailService
+
+logger = logging.getLogger(__name__)
+
+# Läuft alle 5 Minuten als Job "warnings" (app/core/jobs.py)
+
+# Erst so lange nach Schichtbeginn gilt ein MA als nicht erschienen
+NO_SHOW_GRACE = timedelta(minutes=30)
+# Offene Stempelung länger als das -> excessive_hours
+LONG_ENTRY = timedelta(hours=10)
+# Summe eines Tages über das -> MAX_TIME_EXCEEDED
+MAX_DAY = timedelta(hours=14)
+
+# Warnungen werden über dedup_key (Unique-Index) genau einmal angelegt:
+#   NO_SHOW:<MA>:<Tag>:<Objekt>:<Beginn>   NO_CHECKOUT:<Eintrag>
+#   excessive_hours:<Eintrag>              MAX_TIME_EXCEEDED:<MA>:<Tag>
+#   WRONG_OBJECT:<MA>:<Tag>:<Objekt>
+
+
+def insert_warnings(db: Session, rows: Iterable[dict]) -> List[dict]:
+    """Warnungen in einem INSERT anlegen, vorhandene dedup_keys überspringen
+
+    rows: employee_id, warning_type, description, dedup_key. Gibt die
+    tatsächlich angelegten Zeilen zurück. Kein commit - das macht der Aufrufer.
+    """
+    rows = [{"created_at": datetime.utcnow(), "is_resolved": False, **row} for row in rows]
+    if not rows:
+        return []
+    statement = dialect_insert(db, Warning).values(rows).on_conflict_do_nothing(
+        index_elements=[Warning.dedup_key]
+    ).returning(Warning.dedup_key)
+    created = {key for (key,) in db.execute(statement)}
+    return [row for row in rows if row["dedup_key"] in created]
+
+
+def evaluate(db: Session, now: Optional[datetime] = None, day: Optional[date] = None) -> List[dict]:
+    """Alle Regeln für einen Tag im Speicher auswerten
+
+    Lädt Schichten (Vorlagen + datierte), die Stempelungen ab dem Vortag
+    samt aller offenen und die dedup_keys der Warnungen - unabhängig von
+    der Zahl der Mitarbeiter. Liefert die noch nicht vorhandenen Warnungen.
+    """
+    now = now or datetime.now()
+    day = day or now.date()
+
+    shifts = realized_shifts(db, day, day)
+    entries = db.query(
+        TimeEntry.id, TimeEntry.employee_id, TimeEntry.check_in, TimeEntry.check_out
+    ).filter(
+        TimeEntry.employee_id != None,
+        or_(
+            range_period(day - timedelta(days=1), day).filter(TimeEntry.check_in),
+            TimeEntry.check_out.is_(None)
+        )
+    ).all()
+    # Ältere, erledigte Warnungen fängt notfalls der Unique-Index ab
+    known = {
+        key for (key,) in db.query(Warning.dedup_key).filter(
+            Warning.dedup_key != None,
+            or_(
+                Warning.is_resolved == False,
+                Warning.created_at >= datetime.combine(day - timedelta(days=1), datetime.min.time())
+            )
+        )
+    }
+
+    found = []
+
+    def add(employee_id, warning_type, key, description):
+        if key not in known:
+            known.add(key)
+            found.append({
+                "employee_id": employee_id,
+                "warning_type": warning_type,
+                "description": description,
+                "dedup_key": key,
+            })
+
+    worked = {}                 # employee_id -> Sekunden am Tag
+    present = set()             # Mitarbeiter mit Stempelung an dem Tag
+    for entry in entries:
+        if entry.check_in.date() == day:
+            present.add(entry.employee_id)
+            end = entry.check_out or now
+            worked[entry.employee_id] = worked.get(entry.employee_id, 0.0) + max((end - entry.check_in).total_seconds(), 0.0)
+        if entry.check_out is None:
+            if entry.check_in.date() < day:
+                add(entry.employee_id, "NO_CHECKOUT", f"NO_CHECKOUT:{entry.id}",
+                    f"Vergessene Ausstempelung vom {entry.check_in.strftime('%d.%m.%Y %H:%M')}")
+            elif now - entry.check_in > LONG_ENTRY:
+                hours = (now - entry.check_in).total_seconds() / 3600
+                add(entry.employee_id, "excessive_hours", f"excessive_hours:{entry.id}",
+                    f"Arbeitet seit über {hours:.1f} Stunden ohne Ausstempelung!")
+
+    for employee_id, seconds in worked.items():
+        if seconds > MAX_DAY.total_seconds():
+            add(employee_id, "MAX_TIME_EXCEEDED", f"MAX_TIME_EXCEEDED:{employee_id}:{day.isoformat()}",
+                f"Maximale Arbeitszeit überschritten! ({seconds / 3600:.1f} Stunden)")
+
+    for shift_day, schedule in shifts:
+        if schedule.employee_id is None or schedule.start_time is None:
+            continue
+        if schedule.status not in (None, "normal", "vertretung"):
+            continue    # Urlaub, krank ...
+        start = datetime.combine(shift_day, schedule.start_time)
+        if now - start < NO_SHOW_GRACE or schedule.employee_id in present:
+            continue
+        add(schedule.employee_id, "NO_SHOW",
+            f"NO_SHOW:{schedule.employee_id}:{shift_day.isoformat()}:{schedule.object_id}:{schedule.start_time.strftime('%H%M')}",
+            f"Mitarbeiter nicht erschienen (Sollte um {schedule.start_time.strftime('%H:%M')} an Objekt {schedule.object_id} beginnen)")
+
+    return found
+
+
+def run_checks(db: Session, now: Optional[datetime] = None) -> Dict[str, int]:
+    """Regeln auswerten, neue Warnungen schreiben (ein INSERT) und committen"""
+    created = insert_warnings(db, evaluate(db, now))
+    db.commit()
+
+    counts = {}
+    for warning in created:
+        counts[warning["warning_type"]] = counts.get(warning["warning_type"], 0) + 1
+        EmailService.send_warning_email(
+            f"Employee {warning['employee_id']}", warning["warning_type"], warning["description"]
+        )
+    if counts:
+        logger.info("Warnungen angelegt: %s", counts)
+    return counts
+
@@ -0,0 +1,19 @@
+from sqlalchemy.orm import Session
+from app.models.models import TimeEntry
+
+
+def open_entries_query(db: Session):
+    """Alle offenen Stempelungen (check_out IS NULL)
+
+    Das Prädikat entspricht genau dem partiellen Index
+    uq_time_entries_open_employee - bitte nicht umformulieren.
+    """
+    return db.query(TimeEntry).filter(TimeEntry.check_out.is_(None))
+
+
+def get_open_entry(db: Session, employee_id: int, for_update: bool = False):
+    """Offene Stempelung eines Mitarbeiters (höchstens eine, per Unique-Index)"""
+    query = open_entries_query(db).filter(TimeEntry.employee_id == employee_id)
+    if for_update:
+        query = query.with_for_update()
+    return query.first()
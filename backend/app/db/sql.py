@@ -0,0 +1,85 @@
+from sqlalchemy import Date, DateTime, Float
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+
+
+class duration_seconds(FunctionElement):
+    """Dauer zwischen zwei Zeitstempeln in Sekunden (SQL-seitig berechnet)"""
+    type = Float()
+    inherit_cache = True
+    name = "duration_seconds"
+
+
+@compiles(duration_seconds)
+def _duration_seconds_default(element, compiler, **kw):
+    start, end = list(element.clauses)
+    return "EXTRACT(EPOCH FROM (%s - %s))" % (
+        compiler.process(end, **kw),
+        compiler.process(start, **kw),
+    )
+
+
+@compiles(duration_seconds, "sqlite")
+def _duration_seconds_sqlite(element, compiler, **kw):
+    # SQLite kennt kein EXTRACT - für lokale Benchmarks/Tests
+    start, end = list(element.clauses)
+    return "ROUND((julianday(%s) - julianday(%s)) * 86400.0, 3)" % (
+        compiler.process(end, **kw),
+        compiler.process(start, **kw),
+    )
+
+
+class add_days(FunctionElement):
+    """Datum plus n Tage (n darf eine Spalte sein)"""
+    type = Date()
+    inherit_cache = True
+    name = "add_days"
+
+
+@compiles(add_days)
+def _add_days_default(element, compiler, **kw):
+    day, days = list(element.clauses)
+    return "(%s + %s)" % (compiler.process(day, **kw), compiler.process(days, **kw))
+
+
+@compiles(add_days, "sqlite")
+def _add_days_sqlite(element, compiler, **kw):
+    day, days = list(element.clauses)
+    return "date(%s, (%s) || ' days')" % (compiler.process(day, **kw), compiler.process(days, **kw))
+
+
+class day_time(FunctionElement):
+    """Datum + Uhrzeit (+ Minuten) als Zeitstempel; alle Teile dürfen Spalten sein"""
+    type = DateTime()
+    inherit_cache = True
+    name = "day_time"
+
+
+@compiles(day_time)
+def _day_time_default(element, compiler, **kw):
+    day, clock, minutes = list(element.clauses)
+    return "(%s + %s + make_interval(mins => %s))" % (
+        compiler.process(day, **kw),
+        compiler.process(clock, **kw),
+        compiler.process(minutes, **kw),
+    )
+
+
+@compiles(day_time, "sqlite")
+def _day_time_sqlite(element, compiler, **kw):
+    # Gleiches Format wie SQLAlchemy DateTime in SQLite (vergleichbar als Text)
+    day, clock, minutes = list(element.clauses)
+    return "strftime('%%Y-%%m-%%d %%H:%%M:%%f000', %s, substr(%s, 1, 8), (%s) || ' minutes')" % (
+        compiler.process(day, **kw),
+        compiler.process(clock, **kw),
+        compiler.process(minutes, **kw),
+    )
+
+
+def dialect_insert(db, table):
+    """INSERT mit ON CONFLICT-Unterstützung passend zur Datenbank der Session"""
+    if db.get_bind().dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+    return insert(table)
@@ -5,6 +5,12 @@ from app.models import models
 from app.api.v1.endpoints import auth, time_entries, breaks, reports, corrections, warnings, quick_booking, admin
 from app.api.v1.endpoints import employees, time_entries
 from app.api.v1.endpoints import auth, admin, employees, customers, time_entries, corrections, hours_management
+from app.api.v1.endpoints import objects
+from app.core.events import bus
+from app.core.scheduler import scheduler
+from app.core import subscribers  # noqa: F401 - registriert die Abonnenten am Bus
+from app.core import jobs  # noqa: F401 - registriert die Jobs am Scheduler
+from app.core.pdf_batch import shutdown_pool
 
 # from app.api.v1.endpoints import employees
 
@@ -27,6 +33,7 @@ app.add_middleware(
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["auth"])
 app.include_router(employees.router, prefix="/api/v1/employees", tags=["employees"])
 app.include_router(time_entries.router, prefix="/api/v1/time-entries", tags=["time-entries"])
+app.include_router(objects.router, prefix="/api/v1/objects", tags=["objects"])
 app.include_router(breaks.router, prefix="/api/v1/breaks", tags=["breaks"])
 app.include_router(reports.router, prefix="/api/v1/reports", tags=["reports"])
 app.include_router(corrections.router, prefix="/api/v1/corrections", tags=["corrections"])
@@ -34,6 +41,17 @@ app.include_router(warnings.router, prefix="/api/v1/warnings", tags=["warnings"]
 app.include_router(quick_booking.router, prefix="/api/v1/quick-booking", tags=["quick-booking"])
 app.include_router(hours_management.router, prefix="/api/v1/hours-management", tags=["hours"])
 
+@app.on_event("startup")
+async def start_background_services():
+    await bus.start()
+    await scheduler.start()
+
+@app.on_event("shutdown")
+async def stop_background_services():
+    await scheduler.stop()
+    await bus.stop()
+    shutdown_pool()
+
 @app.get("/")
 def read_root():
     return {"message": "SEDA24 Zeiterfassung API läuft!"}
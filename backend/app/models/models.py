@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, Boolean, ForeignKey, Enum, Text, Date, Time
+from sqlalchemy import Column, Integer, String, DateTime, Float, Boolean, ForeignKey, Enum, Text, Date, Time, Index
+from sqlalchemy import text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -46,6 +47,7 @@ class Employee(Base):
     is_active = Column(Boolean, default=True)
     tracking_mode = Column(String, default="C")  # A=Auto, B=Button, C=Normal
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     user = relationship("User", back_populates="employee")
     time_entries = relationship("TimeEntry", back_populates="employee")
@@ -67,6 +69,7 @@ class Customer(Base):
     monthly_rate = Column(Float)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     objects = relationship("Object", back_populates="customer")
 
@@ -83,6 +86,7 @@ class Object(Base):
     cleaning_type = Column(String)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     customer = relationship("Customer", back_populates="objects")
     time_entries = relationship("TimeEntry", back_populates="object")
@@ -108,6 +112,45 @@ class TimeEntry(Base):
     employee = relationship("Employee", back_populates="time_entries")
     object = relationship("Object", back_populates="time_entries")
     corrections = relationship("CorrectionRequest", back_populates="time_entry")
+    
+    __table_args__ = (
+        # Bereichsfilter check_in >= start AND check_in < end (siehe app/core/periods.py)
+        Index("ix_time_entries_employee_id_check_in", "employee_id", "check_in"),
+        Index("ix_time_entries_check_in", "check_in"),
+        # Pro Mitarbeiter höchstens eine offene Stempelung
+        Index(
+            "uq_time_entries_open_employee", "employee_id",
+            unique=True,
+            postgresql_where=text("check_out IS NULL"),
+            sqlite_where=text("check_out IS NULL")
+        ),
+    )
+
+class DailyEmployeeHours(Base):
+    """Tagessumme pro Mitarbeiter/Objekt/Leistungsart (gepflegt von app/core/rollup_service.py)"""
+    __tablename__ = "daily_employee_hours"
+    
+    id = Column(Integer, primary_key=True)
+    employee_id = Column(Integer, ForeignKey("employees.id"), nullable=False)
+    object_id = Column(Integer, ForeignKey("objects.id"), nullable=True)
+    date = Column(Date, nullable=False)
+    service_type = Column(String, nullable=True)
+    minutes = Column(Float, default=0.0)
+    amount = Column(Float, default=0.0)        # Summe Stunden * Stundensatz der Einträge
+    entries = Column(Integer, default=0)       # Anzahl abgeschlossener Stempelungen
+    updated_at = Column(DateTime, default=datetime.utcnow)
+    
+    employee = relationship("Employee")
+    object = relationship("Object")
+    
+    __table_args__ = (
+        # COALESCE, damit auch Zeilen ohne Objekt/Leistungsart eindeutig sind
+        Index(
+            "uq_daily_employee_hours_key",
+            "employee_id", "date", text("COALESCE(object_id, 0)"), text("COALESCE(service_type, '')"),
+            unique=True
+        ),
+    )
 
 class Schedule(Base):
     __tablename__ = "schedules"
@@ -116,12 +159,29 @@ class Schedule(Base):
     employee_id = Column(Integer, ForeignKey("employees.id"))
     object_id = Column(Integer, ForeignKey("objects.id"))
     weekday = Column(Integer)
+    date = Column(Date, nullable=True)          # NULL = Wochenvorlage, sonst Schicht an genau diesem Tag
     start_time = Column(Time)
     end_time = Column(Time)
     planned_hours = Column(Float)
+    status = Column(String, default='normal')   # normal, urlaub, krank, vertretung ...
+    replacement_for = Column(Integer, ForeignKey("employees.id"), nullable=True)  # vertretener MA
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)  # ETag, siehe app/core/etag.py
     
-    employee = relationship("Employee")
+    employee = relationship("Employee", foreign_keys=[employee_id])
     object = relationship("Object")
+    
+    __table_args__ = (
+        Index("ix_schedules_date_employee_id", "date", "employee_id"),
+        # Eine datierte Schicht gibt es pro Mitarbeiter/Objekt/Tag/Beginn nur einmal
+        # (Konfliktziel für das Kopieren von Wochen)
+        Index(
+            "uq_schedules_instance",
+            "employee_id", "object_id", "date", "start_time",
+            unique=True,
+            postgresql_where=text("date IS NOT NULL"),
+            sqlite_where=text("date IS NOT NULL")
+        ),
+    )
 
 class BreakEntry(Base):
     __tablename__ = "break_entries"
@@ -146,10 +206,16 @@ class Warning(Base):
     resolved_at = Column(DateTime, nullable=True)
     resolved_by = Column(Integer, ForeignKey("users.id"), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Eindeutig je Anlass (z.B. NO_SHOW:<MA>:<Tag>:...), siehe app/core/warning_engine.py
+    dedup_key = Column(String, nullable=True)
     
     employee = relationship("Employee", back_populates="warnings")
     resolver = relationship("User", foreign_keys=[resolved_by])
 
+    __table_args__ = (
+        Index("ix_warnings_dedup_key", "dedup_key", unique=True),
+    )
+
 class CorrectionRequest(Base):
     __tablename__ = "correction_requests"
     
@@ -180,6 +246,26 @@ class EmployeeObjectHours(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     tracking_mode = Column(String(1), default='C')
 
+class JobRun(Base):
+    """Protokoll der zeitgesteuerten Jobs (app/core/scheduler.py)"""
+    __tablename__ = "job_runs"
+    
+    id = Column(Integer, primary_key=True)
+    job_name = Column(String, nullable=False)
+    scheduled_for = Column(DateTime, nullable=False)   # Sollzeitpunkt laut Cron (lokale Zeit)
+    trigger = Column(String, default="cron")           # cron, catch_up, manual
+    status = Column(String, default="running")         # running, ok, error
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime, nullable=True)
+    duration_ms = Column(Float, nullable=True)
+    result = Column(Text, nullable=True)               # JSON
+    error = Column(Text, nullable=True)
+
+    __table_args__ = (
+        # Jeder Termin höchstens einmal - auch bei mehreren Workern
+        Index("uq_job_runs_job_name_scheduled_for", "job_name", "scheduled_for", unique=True),
+    )
+
 # Am Ende der models.py hinzufügen:
 
 class CustomerHours(Base):
@@ -1,18 +1,26 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 class ObjectBase(BaseModel):
     customer_id: int
     name: str
-    address: str
+    address: Optional[str] = None
     gps_lat: float = Field(..., ge=-90, le=90)
     gps_lng: float = Field(..., ge=-180, le=180)
-    radius_meters: int = 100
+    radius_m: int = 100
 
 class ObjectCreate(ObjectBase):
     pass
 
+class ObjectUpdate(BaseModel):
+    name: Optional[str] = None
+    address: Optional[str] = None
+    gps_lat: Optional[float] = Field(None, ge=-90, le=90)
+    gps_lng: Optional[float] = Field(None, ge=-180, le=180)
+    radius_m: Optional[int] = None
+    is_active: Optional[bool] = None
+
 class ObjectResponse(ObjectBase):
     id: int
     is_active: bool
@@ -31,3 +39,28 @@ class GPSValidationResponse(BaseModel):
     distance_meters: float
     object_name: str
     allowed_radius: int
+
+class GPSFix(BaseModel):
+    lat: float = Field(..., ge=-90, le=90)
+    lng: float = Field(..., ge=-180, le=180)
+    object_id: Optional[int] = None   # gebuchtes Objekt (nur Batch/Nachprüfung)
+
+class LocateRequest(GPSFix):
+    limit: int = Field(5, ge=1, le=50)
+
+class LocatedObject(BaseModel):
+    object_id: int
+    name: str
+    distance_meters: float
+    radius_m: int
+    inside: bool
+
+class LocateBatchRequest(BaseModel):
+    fixes: List[GPSFix] = Field(..., max_length=100000)
+
+class LocateBatchItem(BaseModel):
+    nearest_object_id: Optional[int]
+    nearest_distance_meters: Optional[float]
+    nearest_inside: bool
+    object_distance_meters: Optional[float] = None
+    object_inside: Optional[bool] = None
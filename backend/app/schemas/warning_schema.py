@@ -21,7 +21,7 @@ class ScheduleResponse(ScheduleBase):
 
 class WarningBase(BaseModel):
     warning_type: str
-    message: str
+    description: Optional[str] = None
 
 class WarningCreate(WarningBase):
     employee_id: int
@@ -32,6 +32,7 @@ class WarningResponse(WarningBase):
     is_resolved: bool
     created_at: datetime
     resolved_at: Optional[datetime]
+    dedup_key: Optional[str] = None
     
     class Config:
         from_attributes = True
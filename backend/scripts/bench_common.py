@@ -0,0 +1,58 @@
+"""
+Gemeinsame Helfer für die Benchmark-Skripte in scripts/
+
+Standard ist eine temporäre SQLite-Datenbank, damit die Benchmarks ohne
+Server laufen. Mit BENCH_DATABASE_URL=postgresql://... wird gegen eine
+echte (Test-)Datenbank gemessen - NIEMALS gegen die Produktion!
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BACKEND_DIR)
+
+_tmp_dir = tempfile.mkdtemp(prefix="seda24_bench_")
+BENCH_DATABASE_URL = os.getenv(
+    "BENCH_DATABASE_URL",
+    f"sqlite:///{os.path.join(_tmp_dir, 'bench.db')}"
+)
+# app.db.database baut beim Import eine Engine - auf die Bench-DB umbiegen
+os.environ["DATABASE_URL"] = BENCH_DATABASE_URL
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from app.db.database import Base
+from app.models import models  # noqa: F401 - Tabellen registrieren
+
+
+def make_session_factory(reset=True):
+    """Engine + Session für die Bench-DB, Tabellen frisch angelegt"""
+    engine = create_engine(BENCH_DATABASE_URL)
+    if reset:
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+    return engine, sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+class QueryCounter:
+    """Zählt die SQL-Roundtrips einer Engine"""
+
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args, **kwargs):
+        self.count += 1
+
+    def reset(self):
+        self.count = 0
+
+
+def timed(fn, *args, **kwargs):
+    """Führt fn aus und gibt (Ergebnis, Sekunden) zurück"""
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
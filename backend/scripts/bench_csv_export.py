@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark: CSV-Export alt (String-Verkettung) gegen Generator-Pipeline
+
+Misst Durchsatz (Zeilen/s) und Peak-Speicher (tracemalloc) für
+synthetische Export-Zeilen. Der alte Weg baut den kompletten Text per
+csv_content += line auf und kodiert ihn am Ende; der neue Weg
+(report_service.iter_csv_chunks) gibt Blöcke aus, die sofort
+weitergereicht und verworfen werden - wie bei StreamingResponse.
+
+Aufruf:
+    python scripts/bench_csv_export.py [--sizes 10000 100000 1000000]
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from bench_excel_export import synthetic_rows
+from bench_common import BENCH_DATABASE_URL  # noqa: F401 - setzt DATABASE_URL für den App-Import
+
+from app.core.report_service import iter_csv_chunks
+
+
+def legacy_csv(rows):
+    """Alter export_to_csv-Ablauf (ohne DB-Zugriff)"""
+    csv_content = "Datum;Mitarbeiter;Objekt;Einstempelung;Ausstempelung;Stunden\n"
+    for row in rows:
+        duration_hours = round((row.check_out - row.check_in).total_seconds() / 3600, 2)
+        line = f"{row.check_in.strftime('%d.%m.%Y')};"
+        line += f"{row.first_name} {row.last_name};"
+        line += f"{row.object_name};"
+        line += f"{row.check_in.strftime('%H:%M')};"
+        line += f"{row.check_out.strftime('%H:%M')};"
+        line += f"{duration_hours}\n"
+        csv_content += line
+    return len(csv_content.encode("utf-8-sig"))
+
+
+def streaming_csv(rows):
+    size = 0
+    for chunk in iter_csv_chunks(rows):
+        size += len(chunk)
+    return size
+
+
+def measure(fn, n):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = fn(synthetic_rows(n))
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, seconds, peak
+
+
+def main(sizes):
+    print(f"{'Zeilen':>9} | {'Modus':>8} | {'Zeilen/s':>10} | {'Peak MB':>8} | {'Ausgabe MB':>10}")
+    print("-" * 58)
+    for n in sizes:
+        for name, fn in (("legacy", legacy_csv), ("stream", streaming_csv)):
+            size, seconds, peak = measure(fn, n)
+            print(f"{n:>9} | {name:>8} | {n / seconds:>10.0f} | {peak / 1024 / 1024:>8.1f} | "
+                  f"{size / 1024 / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    args = parser.parse_args()
+    main(args.sizes)
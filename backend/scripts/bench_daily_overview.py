@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Tagesübersicht aller Mitarbeiter (ReportService.get_all_employees_daily)
+
+Vergleicht die alte N+1+M Variante (eine Abfrage pro Mitarbeiter plus
+Lazy-Load pro Objekt) mit der gruppierten Einzelabfrage.
+
+Aufruf:
+    python scripts/bench_daily_overview.py [--sizes 50 500 5000]
+"""
+
+import argparse
+import random
+from datetime import datetime, date, timedelta
+
+from bench_common import make_session_factory, QueryCounter, timed, BENCH_DATABASE_URL
+
+from sqlalchemy import insert, func
+from app.models.models import Employee, Object, Customer, TimeEntry
+from app.core.report_service import ReportService
+
+
+def legacy_get_all_employees_daily(db, target_date):
+    """Alte Implementierung (Stand vor dem Umbau) zum Vergleich"""
+    employees = db.query(Employee).all()
+    result = []
+    for emp in employees:
+        entries = db.query(TimeEntry).filter(
+            TimeEntry.employee_id == emp.id,
+            func.date(TimeEntry.check_in) == target_date
+        ).all()
+        total_minutes = 0
+        objects_worked = []
+        for entry in entries:
+            if entry.check_out:
+                duration = (entry.check_out - entry.check_in).total_seconds() / 60
+                total_minutes += duration
+                if entry.object and entry.object.name not in objects_worked:
+                    objects_worked.append(entry.object.name)
+        result.append({
+            "employee_name": f"{emp.first_name} {emp.last_name}",
+            "total_hours": round(total_minutes / 60, 2),
+            "objects": ", ".join(objects_worked) if objects_worked else "Keine",
+        })
+    return result
+
+
+def seed(SessionLocal, n_employees, target_date, n_objects=50):
+    db = SessionLocal()
+    db.execute(insert(Customer), [{"name": "Bench GmbH"}])
+    db.execute(insert(Object), [
+        {"customer_id": 1, "name": f"Objekt {i}", "gps_lat": 48.8, "gps_lng": 8.2}
+        for i in range(1, n_objects + 1)
+    ])
+    db.execute(insert(Employee), [
+        {"personal_nr": f"B{i:05d}", "first_name": "Bench", "last_name": str(i)}
+        for i in range(1, n_employees + 1)
+    ])
+    entries = []
+    for emp_id in range(1, n_employees + 1):
+        # ~80% anwesend, 1-3 Einsätze pro Tag
+        if random.random() > 0.8:
+            continue
+        start = datetime.combine(target_date, datetime.min.time()) + timedelta(hours=6)
+        for _ in range(random.randint(1, 3)):
+            end = start + timedelta(minutes=random.randint(60, 300))
+            entries.append({
+                "employee_id": emp_id,
+                "object_id": random.randint(1, n_objects),
+                "check_in": start,
+                "check_out": end,
+            })
+            start = end + timedelta(minutes=30)
+    db.execute(insert(TimeEntry), entries)
+    db.commit()
+    db.close()
+    return len(entries)
+
+
+def run(sizes):
+    random.seed(42)
+    target_date = date.today()
+    print(f"Datenbank: {BENCH_DATABASE_URL}")
+    print(f"{'MA':>6} | {'Einträge':>8} | {'alt: Queries':>12} | {'alt: ms':>9} | {'neu: Queries':>12} | {'neu: ms':>9}")
+    print("-" * 72)
+
+    for size in sizes:
+        engine, SessionLocal = make_session_factory()
+        n_entries = seed(SessionLocal, size, target_date)
+        counter = QueryCounter(engine)
+
+        db = SessionLocal()
+        counter.reset()
+        _, legacy_seconds = timed(legacy_get_all_employees_daily, db, target_date)
+        legacy_queries = counter.count
+        db.close()
+
+        db = SessionLocal()
+        counter.reset()
+        report, new_seconds = timed(ReportService(db).get_all_employees_daily, target_date)
+        new_queries = counter.count
+        db.close()
+        assert report["total_employees"] == size
+
+        print(f"{size:>6} | {n_entries:>8} | {legacy_queries:>12} | {legacy_seconds * 1000:>9.1f} | "
+              f"{new_queries:>12} | {new_seconds * 1000:>9.1f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500, 5000])
+    args = parser.parse_args()
+    run(args.sizes)
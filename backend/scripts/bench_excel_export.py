@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Speicherbedarf des Monats-Excel-Exports
+
+Misst den Peak-RSS für den alten Weg (Liste von Dicts -> pandas
+DataFrame -> BytesIO) und den Streaming-Weg (constant_memory
+xlsxwriter -> temporäre Datei -> Blöcke). Jede Messung läuft in einem
+eigenen Prozess, weil ru_maxrss nur wächst.
+
+Die Zeilen werden synthetisch erzeugt (gleiche Form wie
+ReportService.iter_export_rows), damit 1M Einträge ohne Datenbank
+messbar sind.
+
+Aufruf:
+    python scripts/bench_excel_export.py [--sizes 1000 100000 1000000] [--legacy-max 200000]
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BACKEND_DIR)
+
+ExportRow = namedtuple("ExportRow", [
+    "personal_nr", "first_name", "last_name", "employee_rate",
+    "object_name", "check_in", "check_out", "hourly_rate"
+])
+
+
+def synthetic_rows(n):
+    start = datetime(2025, 8, 1, 6, 0)
+    for i in range(n):
+        check_in = start + timedelta(minutes=(i % 40000) * 1)
+        yield ExportRow(
+            f"D{i % 500:03d}", "Bench", str(i % 500), 15.0,
+            f"Objekt {i % 50}", check_in, check_in + timedelta(hours=4), 15.0
+        )
+
+
+def run_streaming(n):
+    from app.core.excel_export import build_timesheet_file, iter_file_chunks
+    path = build_timesheet_file(synthetic_rows(n))
+    size = 0
+    for chunk in iter_file_chunks(path):
+        size += len(chunk)
+    return size
+
+
+def run_legacy(n):
+    import pandas as pd
+    from io import BytesIO
+    excel_data = []
+    for row in synthetic_rows(n):
+        hours = (row.check_out - row.check_in).total_seconds() / 3600
+        excel_data.append({
+            'Personal-Nr': row.personal_nr,
+            'Name': f"{row.first_name} {row.last_name}",
+            'Datum': row.check_in.strftime('%d.%m.%Y'),
+            'Check-In': row.check_in.strftime('%H:%M'),
+            'Check-Out': row.check_out.strftime('%H:%M'),
+            'Stunden': round(hours, 2),
+            'Stundensatz': row.employee_rate,
+            'Lohn': round(hours * row.employee_rate, 2)
+        })
+    df = pd.DataFrame(excel_data)
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
+        df.to_excel(writer, sheet_name='Zeiterfassung', index=False)
+    return len(output.getvalue())
+
+
+def child(mode, n):
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    size = run_streaming(n) if mode == "stream" else run_legacy(n)
+    seconds = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss ist unter Linux in KiB
+    print(json.dumps({"peak_mb": peak / 1024, "delta_mb": (peak - baseline) / 1024,
+                      "seconds": seconds, "bytes": size}))
+
+
+def measure(mode, n):
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", mode, str(n)],
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(sizes, legacy_max):
+    print(f"{'Einträge':>9} | {'Modus':>8} | {'Peak RSS MB':>11} | {'Zuwachs MB':>10} | {'Sekunden':>8} | {'Datei MB':>8}")
+    print("-" * 70)
+    for n in sizes:
+        for mode in ("legacy", "stream"):
+            if mode == "legacy" and n > legacy_max:
+                print(f"{n:>9} | {mode:>8} | {'übersprungen (--legacy-max)':>45}")
+                continue
+            r = measure(mode, n)
+            print(f"{n:>9} | {mode:>8} | {r['peak_mb']:>11.1f} | {r['delta_mb']:>10.1f} | "
+                  f"{r['seconds']:>8.2f} | {r['bytes'] / 1024 / 1024:>8.1f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--child":
+        child(sys.argv[2], int(sys.argv[3]))
+        sys.exit(0)
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument("--legacy-max", type=int, default=200000,
+                        help="Alter Weg nur bis zu dieser Größe (braucht sonst GBs)")
+    args = parser.parse_args()
+    main(args.sizes, args.legacy_max)
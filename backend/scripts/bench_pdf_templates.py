@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Latenz pro Zeitnachweis-PDF mit und ohne Layout-Cache
+
+"kalt" verwirft vor jedem PDF den Layout-Cache (so lief es früher: jedes
+PDF baute getSampleStyleSheet, ParagraphStyles und TableStyles neu),
+"warm" nutzt die einmal gebauten Layouts aus pdf_generator.
+
+Aufruf:
+    python scripts/bench_pdf_templates.py [--rows 60] [--runs 200]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BACKEND_DIR)
+
+from app.core.pdf_generator import generate_monthly_timesheet_pdf, clear_layout_cache, get_layout
+
+
+def synthetic_month(rows):
+    employee = SimpleNamespace(first_name="Bench", last_name="Mitarbeiter", hourly_rate=15.0)
+    start = datetime(2025, 8, 1, 6, 0)
+    entries = []
+    for i in range(rows):
+        check_in = start + timedelta(days=i // 2, hours=(i % 2) * 8)
+        entries.append(SimpleNamespace(
+            check_in=check_in,
+            check_out=check_in + timedelta(hours=4),
+            object=SimpleNamespace(name=f"Objekt {i % 5}")
+        ))
+    return employee, entries
+
+
+def measure(employee, entries, runs, cold):
+    timings = []
+    for _ in range(runs):
+        if cold:
+            clear_layout_cache()
+        start = time.perf_counter()
+        generate_monthly_timesheet_pdf(employee, entries, 2025, 8)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main(rows, runs):
+    employee, entries = synthetic_month(rows)
+    # Aufwärmen: Fonts/Module laden, damit nur der Layout-Aufbau zählt
+    measure(employee, entries, 3, cold=False)
+
+    print(f"{rows} Zeilen pro PDF, {runs} Durchläufe")
+    print(f"{'Modus':>6} | {'Median ms':>9} | {'Mittel ms':>9} | {'p95 ms':>8}")
+    print("-" * 42)
+    results = {}
+    for name, cold in (("kalt", True), ("warm", False)):
+        timings = measure(employee, entries, runs, cold)
+        results[name] = statistics.median(timings)
+        p95 = sorted(timings)[int(len(timings) * 0.95) - 1]
+        print(f"{name:>6} | {results[name]:>9.2f} | {statistics.mean(timings):>9.2f} | {p95:>8.2f}")
+
+    start = time.perf_counter()
+    for _ in range(runs):
+        clear_layout_cache()
+        get_layout("employee_timesheet")
+    build_ms = (time.perf_counter() - start) * 1000 / runs
+
+    saved = results["kalt"] - results["warm"]
+    print(f"\nLayout-Aufbau allein: {build_ms:.3f} ms")
+    print(f"Ersparnis pro PDF: {saved:.2f} ms ({saved / results['kalt'] * 100:.1f} %)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=60)
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+    main(args.rows, args.runs)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark: "Objekte im Umkreis" - Gitter-Index gegen lineare Suche
+
+Synthetische Objekte über Deutschland verteilt (16 wie heute, bis zu
+100.000 für Franchise-Regionen). Gemessen wird die Zeit pro Abfrage
+für einen GPS-Punkt an einem zufälligen Objekt:
+
+    python-loop  skalare Haversine über alle Objekte (alter calculate_distance-Weg)
+    numpy-scan   vektorisierte Haversine über alle Objekte (GeofenceIndex.locate)
+    grid         Gitterzellen um den Punkt, Haversine nur für Kandidaten (GeofenceIndex.nearby)
+
+Aufruf:
+    python scripts/bench_spatial_index.py [--sizes 16 1000 10000 100000] [--queries 2000]
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bench_common import BENCH_DATABASE_URL  # noqa: F401 - setzt DATABASE_URL für den App-Import
+from app.core.geofence import build_snapshot, grid_candidates, haversine_m
+
+# Grob Deutschland
+LAT_RANGE = (47.3, 55.0)
+LNG_RANGE = (5.9, 15.0)
+
+
+def calculate_distance(lat1, lon1, lat2, lon2):
+    R = 6371000
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    delta_phi = math.radians(lat2 - lat1)
+    delta_lambda = math.radians(lon2 - lon1)
+    a = math.sin(delta_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda / 2) ** 2
+    return R * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+def synthetic_objects(n, rng):
+    return [
+        (i + 1, f"Objekt {i + 1}", rng.uniform(*LAT_RANGE), rng.uniform(*LNG_RANGE), rng.choice((50, 100, 150)))
+        for i in range(n)
+    ]
+
+
+def python_loop(rows, lat, lng):
+    return [r[0] for r in rows if calculate_distance(lat, lng, r[2], r[3]) <= r[4]]
+
+
+def numpy_scan(snap, lat, lng):
+    distances = haversine_m(lat, lng, snap.lat, snap.lng, snap.cos_lat)
+    return snap.ids[distances <= snap.radius_m].tolist()
+
+
+def grid(snap, lat, lng):
+    candidates = grid_candidates(snap, lat, lng, snap.max_radius_m)
+    if candidates is None:
+        candidates = np.arange(len(snap.ids))
+    distances = haversine_m(lat, lng, snap.lat[candidates], snap.lng[candidates], snap.cos_lat[candidates])
+    return snap.ids[candidates[distances <= snap.radius_m[candidates]]].tolist()
+
+
+def timed_per_query(fn, arg, queries):
+    start = time.perf_counter()
+    results = [fn(arg, lat, lng) for lat, lng in queries]
+    return (time.perf_counter() - start) / len(queries) * 1e6, results
+
+
+def main(sizes, query_count, seed):
+    rng = random.Random(seed)
+    print(f"{'Objekte':>8} | {'python-loop µs':>14} | {'numpy-scan µs':>13} | {'grid µs':>8} | {'Aufbau ms':>9}")
+    print("-" * 66)
+    for n in sizes:
+        rows = synthetic_objects(n, rng)
+        start = time.perf_counter()
+        snap = build_snapshot(rows)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        # Punkte 0-120 m neben zufälligen Objekten - wie ein Check-in vor Ort
+        queries = []
+        for _ in range(query_count):
+            obj = rows[rng.randrange(n)]
+            queries.append((obj[2] + rng.uniform(-0.001, 0.001), obj[3] + rng.uniform(-0.001, 0.001)))
+
+        loop_queries = queries[:max(10, query_count // (1 + n // 1000))]
+        loop_us, loop_results = timed_per_query(python_loop, rows, loop_queries)
+        scan_us, scan_results = timed_per_query(numpy_scan, snap, queries)
+        grid_us, grid_results = timed_per_query(grid, snap, queries)
+
+        # Alle drei Wege müssen dieselben Objekte finden
+        assert [sorted(r) for r in scan_results] == [sorted(r) for r in grid_results]
+        assert [sorted(r) for r in loop_results] == [sorted(r) for r in scan_results[:len(loop_results)]]
+
+        print(f"{n:>8} | {loop_us:>14.1f} | {scan_us:>13.1f} | {grid_us:>8.1f} | {build_ms:>9.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[16, 1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    main(args.sizes, args.queries, args.seed)
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+SEDA24 - Zeitnachweise aller Mitarbeiter eines Monats als ZIP
+
+Aufruf:
+    python scripts/generate_month_pdfs.py 2025 8 [--out zeitnachweise.zip] [--workers 4]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.db.database import SessionLocal
+from app.core.pdf_batch import build_month_pdf_zip, shutdown_pool, PDF_WORKERS
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("year", type=int)
+    parser.add_argument("month", type=int)
+    parser.add_argument("--out", default=None)
+    parser.add_argument("--workers", type=int, default=PDF_WORKERS)
+    args = parser.parse_args()
+
+    out = args.out or f"SEDA24_Zeitnachweise_{args.year}_{args.month:02d}.zip"
+
+    db = SessionLocal()
+    try:
+        archive, report = build_month_pdf_zip(db, args.year, args.month, args.workers)
+    finally:
+        db.close()
+        shutdown_pool()
+
+    with open(out, "wb") as f:
+        shutil.copyfileobj(archive, f)
+    archive.close()
+
+    print(f"{'Personal-Nr':<12} {'Name':<30} {'Einträge':>8} {'ms':>8}")
+    print("-" * 62)
+    for emp in report["employees"]:
+        print(f"{emp['personal_nr'] or '-':<12} {emp['name']:<30} {emp['entries']:>8} {emp['render_seconds'] * 1000:>8.1f}")
+    print("-" * 62)
+    print(f"{report['pdf_count']} PDFs mit {report['workers']} Workern in {report['total_seconds']:.2f}s "
+          f"({report['pdfs_per_second']} PDFs/s, Abfrage {report['query_seconds'] * 1000:.1f} ms)")
+    print(f"Gespeichert: {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+SEDA24 - Dienstplan bzw. Kunden/Objekte aus CSV oder XLSX importieren
+
+Ohne --apply wird nur der Unterschied zum Bestand angezeigt. Geschrieben
+wird in einer Transaktion und nur, wenn keine Zeile fehlerhaft ist.
+Stempelungen werden nie gelöscht. Ein laufender Server übernimmt geänderte
+Objekte (Geofence) spätestens nach GEOFENCE_MAX_AGE.
+
+Aufruf:
+    python scripts/import_data.py objects scripts/data/kunden_objekte.csv [--apply]
+    python scripts/import_data.py schedules scripts/data/dienstplan.csv [--replace] [--apply]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.db.database import SessionLocal
+from app.core.import_service import ImportValidationError, import_objects, import_schedules, read_rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("kind", choices=["schedules", "objects"])
+    parser.add_argument("file")
+    parser.add_argument("--apply", action="store_true", help="Änderungen schreiben (sonst nur Vorschau)")
+    parser.add_argument("--replace", action="store_true",
+                        help="Schichten der Mitarbeiter aus der Datei entfernen, die dort fehlen")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        with open(args.file, "rb") as stream:
+            rows = read_rows(stream, args.file)
+            if args.kind == "schedules":
+                result = import_schedules(db, rows, replace=args.replace, dry_run=not args.apply)
+            else:
+                result = import_objects(db, rows, dry_run=not args.apply)
+        if result["applied"]:
+            db.commit()
+        elapsed = time.perf_counter() - started
+
+        print(json.dumps(result["preview"], default=str, indent=2, ensure_ascii=False))
+        for error in result["errors"]:
+            print(f"Zeile {error['line']}: {error['error']}")
+        print(f"Ergebnis: {result['counts']} in {elapsed:.2f}s")
+        if args.apply and not result["applied"]:
+            print("Nichts geschrieben - bitte zuerst die Fehler beheben.")
+            sys.exit(1)
+        if not args.apply:
+            print("Vorschau - mit --apply schreiben.")
+    except ImportValidationError as e:
+        print(f"Datei ungültig: {e}")
+        sys.exit(1)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
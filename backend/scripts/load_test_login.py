@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Lasttest: Login-Ansturm (Schichtbeginn 06:00 / 15:00)
+
+Startet N gleichzeitige Logins gegen einen laufenden Server und fragt
+währenddessen mit einem bereits angemeldeten Konto laufend
+/time-entries/current ab. Ausgegeben werden p50/p95/p99 der Latenzen
+und die Statuscodes (503 = Backpressure des bcrypt-Pools).
+
+Aufruf:
+    python scripts/load_test_login.py --base-url http://localhost:8000 \\
+        --email ma@seda24.de --password geheim [--logins 200] [--pollers 10]
+
+Für mehrere Konten: --accounts datei.csv (Zeilen "email;passwort").
+"""
+
+import argparse
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+
+def request(method, url, body=None, token=None, timeout=60):
+    headers = {"Content-Type": "application/json"}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(url, data=data, headers=headers, method=method)
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            payload = resp.read()
+            status = resp.status
+    except urllib.error.HTTPError as e:
+        payload = e.read()
+        status = e.code
+    except (urllib.error.URLError, TimeoutError):
+        payload = b""
+        status = 0
+    return status, (time.perf_counter() - start) * 1000, payload
+
+
+def login(base_url, email, password):
+    return request("POST", f"{base_url}/api/v1/auth/login", {"email": email, "password": password})
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, int(round(p / 100 * len(values))) - 1))
+    return values[index]
+
+
+def report(name, results):
+    latencies = [ms for _, ms in results]
+    statuses = Counter(status for status, _ in results)
+    print(f"{name:<22} | {len(results):>6} | {percentile(latencies, 50):>8.1f} | "
+          f"{percentile(latencies, 95):>8.1f} | {percentile(latencies, 99):>8.1f} | "
+          f"{dict(sorted(statuses.items()))}")
+
+
+def load_accounts(args):
+    if args.accounts:
+        with open(args.accounts, encoding="utf-8") as f:
+            return [tuple(line.strip().split(";", 1)) for line in f if ";" in line]
+    return [(args.email, args.password)]
+
+
+def main(args):
+    accounts = load_accounts(args)
+
+    status, _, payload = login(args.base_url, *accounts[0])
+    if status != 200:
+        raise SystemExit(f"Login für Abfrage-Konto fehlgeschlagen: {status} {payload[:200]!r}")
+    token = json.loads(payload)["access_token"]
+
+    storm_done = threading.Event()
+    poll_results = []
+    poll_lock = threading.Lock()
+
+    def poller():
+        while not storm_done.is_set():
+            status, ms, _ = request("GET", f"{args.base_url}/api/v1/time-entries/current", token=token)
+            with poll_lock:
+                poll_results.append((status, ms))
+
+    def storm_login(i):
+        email, password = accounts[i % len(accounts)]
+        status, ms, _ = login(args.base_url, email, password)
+        return status, ms
+
+    pollers = [threading.Thread(target=poller, daemon=True) for _ in range(args.pollers)]
+    for t in pollers:
+        t.start()
+    # Kurz "Ruhe-Latenz" sammeln, bevor der Ansturm startet
+    time.sleep(args.warmup)
+    with poll_lock:
+        idle_results = list(poll_results)
+        poll_results.clear()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.logins) as pool:
+        login_results = list(pool.map(storm_login, range(args.logins)))
+    storm_seconds = time.perf_counter() - start
+
+    storm_done.set()
+    for t in pollers:
+        t.join()
+
+    print(f"{args.logins} gleichzeitige Logins in {storm_seconds:.2f} s, {args.pollers} Abfrage-Threads\n")
+    print(f"{'Endpoint':<22} | {'Anz.':>6} | {'p50 ms':>8} | {'p95 ms':>8} | {'p99 ms':>8} | Status")
+    print("-" * 80)
+    report("login", login_results)
+    report("current (Ruhe)", idle_results)
+    report("current (Ansturm)", poll_results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email")
+    parser.add_argument("--password")
+    parser.add_argument("--accounts", help="CSV mit email;passwort pro Zeile")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--pollers", type=int, default=10)
+    parser.add_argument("--warmup", type=float, default=2.0, help="Sekunden Ruhe-Messung vorab")
+    args = parser.parse_args()
+    if not args.accounts and not (args.email and args.password):
+        parser.error("--email/--password oder --accounts angeben")
+    main(args)
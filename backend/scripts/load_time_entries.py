@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+SEDA24 - Historische Stempelungen in großen Mengen laden
+
+Erwartet das Format des CSV-Exports (Datum;Mitarbeiter;Personal-Nr;Objekt;
+Einstempelung;Ausstempelung;Stunden) oder XLSX mit denselben Spalten.
+Die Datei wird per COPY in eine Staging-Tabelle gestreamt, mengenbasiert
+geprüft und mit einem INSERT ... SELECT übernommen; die Tagessummen werden
+in derselben Transaktion neu berechnet. Schon vorhandene Stempelungen
+(gleicher Mitarbeiter, gleiche Einstempelung) werden übersprungen - die
+gleiche Datei zweimal zu laden ändert nichts.
+
+Ohne --apply wird nur geprüft. Jede Datei ist eine eigene Transaktion.
+
+Aufruf:
+    python scripts/load_time_entries.py export_2025_08.csv [weitere.csv ...] [--apply] [--skip-invalid]
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.db.database import SessionLocal
+from app.core.import_service import ImportValidationError
+from app.core.history_import import load_time_entries
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--apply", action="store_true", help="Stempelungen übernehmen (sonst nur prüfen)")
+    parser.add_argument("--skip-invalid", action="store_true",
+                        help="Fehlerhafte Zeilen auslassen statt die Datei abzulehnen")
+    parser.add_argument("--note", default=None, help="Notiz für Zeilen ohne Bemerkung (Standard: [IMPORT datei])")
+    args = parser.parse_args()
+
+    failed = False
+    for path in args.files:
+        db = SessionLocal()
+        try:
+            with open(path, "rb") as stream:
+                result = load_time_entries(
+                    db, stream, os.path.basename(path),
+                    dry_run=not args.apply, skip_invalid=args.skip_invalid, note=args.note
+                )
+            if result["applied"]:
+                db.commit()
+            else:
+                db.rollback()
+
+            print(f"== {path}")
+            for error in result["errors"]:
+                print(f"Zeile {error['line']}: {error['error']}")
+            print(f"Ergebnis: {result['counts']}")
+            print(f"Laufzeit: {result['timings']} -> {result['rows_per_second']} Zeilen/s")
+            if args.apply and not result["applied"] and result["counts"]["invalid"]:
+                print("Nichts geladen - Fehler beheben oder --skip-invalid verwenden.")
+                failed = True
+        except (ImportValidationError, UnicodeDecodeError) as e:
+            db.rollback()
+            print(f"{path}: Datei ungültig: {e}")
+            failed = True
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    if not args.apply:
+        print("Nur geprüft - mit --apply laden.")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
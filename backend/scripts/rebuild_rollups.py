@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+SEDA24 - Tagessummen (daily_employee_hours) aus den Stempelungen neu aufbauen
+
+Für Backfills, nach Datenimporten oder direkten SQL-Korrekturen.
+Ohne Angaben wird der gesamte Zeitraum aller Stempelungen neu berechnet.
+
+Aufruf:
+    python scripts/rebuild_rollups.py [--start 2025-08-01] [--end 2025-08-31] [--employee 12 ...]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import func
+from app.db.database import SessionLocal
+from app.models.models import TimeEntry
+from app.core.rollup_service import rebuild
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--start", type=date.fromisoformat, default=None)
+    parser.add_argument("--end", type=date.fromisoformat, default=None)
+    parser.add_argument("--employee", type=int, nargs="+", default=None)
+    parser.add_argument("--chunk-days", type=int, default=31,
+                        help="Tage pro Transaktion (kleinere Sperren bei großen Backfills)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        first, last = db.query(func.min(TimeEntry.check_in), func.max(TimeEntry.check_in)).one()
+        if first is None:
+            print("Keine Stempelungen vorhanden.")
+            return
+        start = args.start or first.date()
+        end = args.end or last.date()
+
+        started = time.perf_counter()
+        total = 0
+        chunk_start = start
+        while chunk_start <= end:
+            chunk_end = min(end, chunk_start + timedelta(days=args.chunk_days - 1))
+            rows = rebuild(db, chunk_start, chunk_end, args.employee)
+            db.commit()
+            total += rows
+            print(f"{chunk_start} bis {chunk_end}: {rows} Tagessummen")
+            chunk_start = chunk_end + timedelta(days=1)
+
+        print(f"Fertig: {total} Tagessummen in {time.perf_counter() - started:.2f}s")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
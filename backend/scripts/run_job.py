@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+SEDA24 - Einen zeitgesteuerten Job einmal von Hand ausführen
+
+Die Jobs laufen normalerweise im App-Prozess (app/core/jobs.py); Cron wird
+dafür nicht mehr gebraucht. Der Lauf wird wie jeder andere in job_runs
+protokolliert und per Advisory-Lock gegen parallele Läufe geschützt.
+
+Aufruf:
+    python scripts/run_job.py --list
+    python scripts/run_job.py auto_checkout
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.scheduler import scheduler
+from app.core import subscribers  # noqa: F401 - Tagessummen nach Buchungen
+from app.core import jobs  # noqa: F401
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("job", nargs="?", choices=sorted(scheduler.jobs))
+    parser.add_argument("--list", action="store_true", help="Jobs mit Zeitplan anzeigen")
+    args = parser.parse_args()
+
+    if args.list or not args.job:
+        for job in scheduler.jobs.values():
+            print(f"{job.name:24} {job.cron.expression:16} {job.func.__doc__ or ''}")
+        return
+
+    run = scheduler.execute(scheduler.jobs[args.job], datetime.now(), "manual")
+    if run is None:
+        print("Job läuft bereits.")
+        sys.exit(1)
+    print(json.dumps(run, default=str, indent=2, ensure_ascii=False))
+    if run["status"] != "ok":
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+from datetime import date, datetime
+
+import pytest
+
+from app.core.periods import range_period, week_period
+
+
+def test_week_period_uses_iso_year():
+    # 01.01.2027 liegt in KW 53/2026
+    year, week, _ = date(2027, 1, 1).isocalendar()
+    period = week_period(year, week)
+    assert period.start == datetime(2026, 12, 28)
+    assert period.end == datetime(2027, 1, 4)
+    assert period.contains(datetime(2027, 1, 1, 12, 0))
+
+
+def test_week_period_rejects_invalid_week():
+    with pytest.raises(ValueError):
+        week_period(2027, 53)
+    with pytest.raises(ValueError):
+        week_period(2026, 0)
+
+
+def test_range_period_open_end_at_date_max():
+    period = range_period(date.min, date.max)
+    assert period.start == datetime(1, 1, 1)
+    assert period.end == datetime.max
+    assert period.contains(datetime(9999, 12, 31, 23, 59))
@@ -0,0 +1,74 @@
+from datetime import date, time
+
+from app.models.models import Customer, Employee, Object, Schedule, User
+from app.core.geofence import geofence
+from app.core.schedule_conflicts import detect_conflicts, make_shift, validate_shift
+
+MONDAY = date(2025, 9, 1)
+TUESDAY = date(2025, 9, 2)
+
+
+def _setup(db):
+    customer = Customer(name="Kunde")
+    db.add(customer)
+    db.flush()
+    # Rastatt und Karlsruhe: gut 20 km Luftlinie
+    near = Object(customer_id=customer.id, name="Rastatt", gps_lat=48.8589, gps_lng=8.2036, radius_m=100)
+    far = Object(customer_id=customer.id, name="Karlsruhe", gps_lat=49.0069, gps_lng=8.4037, radius_m=100)
+    user = User(email="ma@example.de", password_hash="x", role="mitarbeiter")
+    db.add_all([near, far, user])
+    db.flush()
+    employee = Employee(user_id=user.id, personal_nr="T001", first_name="Test", last_name="MA")
+    db.add(employee)
+    db.commit()
+    return employee, near, far
+
+
+def test_detect_conflicts_overlap_and_travel_time(db):
+    employee, near, far = _setup(db)
+    morning = make_shift(1, employee.id, near.id, MONDAY, time(6, 0), time(10, 0))
+    overlapping = make_shift(2, employee.id, near.id, MONDAY, time(9, 0), time(11, 0))
+    too_close = make_shift(3, employee.id, far.id, MONDAY, time(11, 10), time(13, 0))
+    evening = make_shift(4, employee.id, far.id, MONDAY, time(18, 0), time(20, 0))
+
+    found = detect_conflicts([evening, too_close, morning, overlapping], geofence.snapshot(db))
+
+    assert [(kind, a.schedule_id, b.schedule_id) for kind, a, b, _ in found] == [
+        ('zeitüberschneidung', 1, 2),
+        ('fahrzeit', 2, 3),
+    ]
+    assert found[1][3]['gap_minutes'] == 10
+
+
+def test_detect_conflicts_night_shift_over_midnight(db):
+    employee, near, far = _setup(db)
+    night = make_shift(1, employee.id, near.id, MONDAY, time(22, 0), time(6, 0))
+    early = make_shift(2, employee.id, near.id, TUESDAY, time(5, 0), time(9, 0))
+
+    found = detect_conflicts([early, night], geofence.snapshot(db))
+
+    assert [(kind, a.schedule_id, b.schedule_id) for kind, a, b, _ in found] == [
+        ('zeitüberschneidung', 1, 2)
+    ]
+
+
+def test_validate_shift_moved_to_previous_day_ignores_old_version(db):
+    employee, near, far = _setup(db)
+    stored = Schedule(employee_id=employee.id, object_id=near.id, weekday=TUESDAY.weekday(), date=TUESDAY,
+                      start_time=time(2, 0), end_time=time(6, 0), planned_hours=4.0)
+    db.add(stored)
+    db.commit()
+
+    # Auf Montagnacht verschoben: die alte Dienstagsfassung zählt nicht mehr
+    moved = make_shift(stored.id, employee.id, near.id, MONDAY, time(22, 0), time(4, 0))
+    assert validate_shift(db, moved) == []
+
+    # Eine andere Schicht am Dienstag kollidiert weiterhin
+    other = Schedule(employee_id=employee.id, object_id=near.id, weekday=TUESDAY.weekday(), date=TUESDAY,
+                     start_time=time(3, 0), end_time=time(7, 0), planned_hours=4.0)
+    db.add(other)
+    db.commit()
+    conflicts = validate_shift(db, moved)
+    assert [(c['type'], c['shift1']['id'], c['shift2']['id']) for c in conflicts] == [
+        ('zeitüberschneidung', stored.id, other.id)
+    ]
@@ -0,0 +1,101 @@
+from datetime import date, time, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.db.database import get_db
+from app.core.deps import get_current_user
+from app.models.models import Customer, Employee, Object, Schedule, User
+
+
+@pytest.fixture
+def client(db):
+    app.dependency_overrides[get_db] = lambda: db
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+
+def _login(db, category="A"):
+    customer = Customer(name="Kunde")
+    db.add(customer)
+    db.flush()
+    office = Object(customer_id=customer.id, name="Büro")
+    shop = Object(customer_id=customer.id, name="Laden")
+    user = User(email="ma@example.de", password_hash="x", role="mitarbeiter", category=category)
+    db.add_all([office, shop, user])
+    db.flush()
+    employee = Employee(user_id=user.id, personal_nr="T001", first_name="Test", last_name="MA")
+    db.add(employee)
+    db.commit()
+    app.dependency_overrides[get_current_user] = lambda: user
+    return employee, office, shop
+
+
+def _shift(employee, obj, day, start, weekday=None):
+    return Schedule(employee_id=employee.id, object_id=obj.id,
+                    weekday=day.weekday() if weekday is None else weekday,
+                    date=None if weekday is not None else day,
+                    start_time=time(start, 0), end_time=time(start + 4, 0), planned_hours=4.0)
+
+
+def test_copied_week_does_not_leak_into_today(client, db):
+    employee, office, shop = _login(db)
+    today = date.today()
+    # Vorlage heute im Büro, heute abweichend verschoben, kopierte Woche später im Laden
+    db.add_all([
+        _shift(employee, office, today, 6, weekday=today.weekday()),
+        _shift(employee, office, today, 14),
+        _shift(employee, shop, today + timedelta(days=7), 8),
+    ])
+    db.commit()
+
+    objects = client.get("/api/v1/time-entries/my-objects-today").json()
+    assert [(o["id"], o["start_time"], o["is_scheduled_today"]) for o in objects] == [
+        (office.id, "14:00", True)
+    ]
+    assert client.get("/api/v1/time-entries/has-work-today").json()["has_work"] is True
+
+
+def test_shift_in_another_week_is_no_work_today(client, db):
+    employee, office, shop = _login(db)
+    today = date.today()
+    db.add(_shift(employee, shop, today + timedelta(days=7), 8))
+    db.commit()
+
+    assert client.get("/api/v1/time-entries/has-work-today").json()["has_work"] is False
+    assert client.get("/api/v1/time-entries/my-objects-today").json() == []
+
+
+def test_quick_assign_updates_template_not_dated_shift(client, db):
+    employee, office, shop = _login(db)
+    db.get(User, employee.user_id).role = "admin"
+    copied = _shift(employee, office, date(2025, 9, 8), 6)
+    db.add(copied)
+    db.commit()
+
+    response = client.post("/api/v1/admin/schedules/quick-assign", json={
+        "employee_id": employee.id, "object_id": office.id, "weekday": 0,
+        "start_time": "14:00", "end_time": "18:00"
+    })
+    assert response.status_code == 200
+
+    db.refresh(copied)
+    assert copied.start_time == time(6, 0)
+    template = db.query(Schedule).filter(Schedule.date == None).one()
+    assert (template.weekday, template.start_time) == (0, time(14, 0))
+
+
+def test_schedule_list_returns_templates_only(client, db):
+    employee, office, shop = _login(db)
+    db.get(User, employee.user_id).role = "admin"
+    db.add_all([
+        _shift(employee, office, date(2025, 9, 1), 6, weekday=0),
+        _shift(employee, shop, date(2025, 9, 8), 8),
+    ])
+    db.commit()
+
+    schedules = client.get("/api/v1/admin/schedules").json()
+    assert [(s["object_id"], s["weekday"]) for s in schedules] == [(office.id, 0)]
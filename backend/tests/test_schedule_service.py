@@ -0,0 +1,81 @@
+from datetime import date, time
+
+from app.models.models import Customer, Employee, Object, Schedule, User
+from app.core.schedule_service import copy_weeks, realized_shifts
+
+# KW36/2025 beginnt am 01.09., KW37 am 08.09., KW38 am 15.09.
+KW36 = date(2025, 9, 1)
+KW37 = date(2025, 9, 8)
+KW38 = date(2025, 9, 15)
+
+
+def _setup(db):
+    customer = Customer(name="Kunde")
+    db.add(customer)
+    db.flush()
+    office = Object(customer_id=customer.id, name="Büro")
+    shop = Object(customer_id=customer.id, name="Laden")
+    user = User(email="ma@example.de", password_hash="x", role="mitarbeiter")
+    db.add_all([office, shop, user])
+    db.flush()
+    employee = Employee(user_id=user.id, personal_nr="T001", first_name="Test", last_name="MA")
+    db.add(employee)
+    db.flush()
+    # Vorlage: Montag und Mittwoch im Büro
+    for weekday in (0, 2):
+        db.add(Schedule(employee_id=employee.id, object_id=office.id, weekday=weekday,
+                        start_time=time(6, 0), end_time=time(10, 0), planned_hours=4.0))
+    db.commit()
+    return employee, office, shop
+
+
+def _days(shifts):
+    return sorted((day, schedule.object_id, schedule.start_time) for day, schedule in shifts)
+
+
+def test_dated_shift_keeps_other_templates_of_the_week(db):
+    employee, office, shop = _setup(db)
+    db.add(Schedule(employee_id=employee.id, object_id=shop.id, weekday=5, date=date(2025, 9, 6),
+                    start_time=time(8, 0), end_time=time(12, 0), planned_hours=4.0))
+    db.commit()
+
+    assert _days(realized_shifts(db, KW36, date(2025, 9, 7))) == [
+        (date(2025, 9, 1), office.id, time(6, 0)),
+        (date(2025, 9, 3), office.id, time(6, 0)),
+        (date(2025, 9, 6), shop.id, time(8, 0)),
+    ]
+
+
+def test_dated_shift_replaces_template_at_same_object_and_day(db):
+    employee, office, shop = _setup(db)
+    db.add(Schedule(employee_id=employee.id, object_id=office.id, weekday=0, date=date(2025, 9, 1),
+                    start_time=time(14, 0), end_time=time(18, 0), planned_hours=4.0))
+    db.commit()
+
+    assert _days(realized_shifts(db, KW36, date(2025, 9, 7))) == [
+        (date(2025, 9, 1), office.id, time(14, 0)),
+        (date(2025, 9, 3), office.id, time(6, 0)),
+    ]
+
+
+def test_biweekly_copy_keeps_regular_shifts(db):
+    employee, office, shop = _setup(db)
+    db.add(Schedule(employee_id=employee.id, object_id=shop.id, weekday=5, date=date(2025, 9, 6),
+                    start_time=time(8, 0), end_time=time(12, 0), planned_hours=4.0))
+    db.commit()
+
+    assert copy_weeks(db, KW36, KW38, repeat=2, every=2) == 6
+    db.commit()
+
+    assert _days(realized_shifts(db, KW38, date(2025, 9, 21))) == [
+        (date(2025, 9, 15), office.id, time(6, 0)),
+        (date(2025, 9, 17), office.id, time(6, 0)),
+        (date(2025, 9, 20), shop.id, time(8, 0)),
+    ]
+    # Die Woche dazwischen bleibt bei der Vorlage
+    assert _days(realized_shifts(db, KW37, date(2025, 9, 14))) == [
+        (date(2025, 9, 8), office.id, time(6, 0)),
+        (date(2025, 9, 10), office.id, time(6, 0)),
+    ]
+    # Erneutes Kopieren legt nichts doppelt an
+    assert copy_weeks(db, KW36, KW38, repeat=2, every=2) == 0
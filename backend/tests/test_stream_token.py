@@ -0,0 +1,33 @@
+import pytest
+from fastapi import HTTPException
+
+from app.core.deps import clear_user_cache, user_from_token
+from app.core.security import create_access_token, create_stream_token
+from app.models.models import User
+
+
+@pytest.fixture
+def admin(db):
+    clear_user_cache()
+    user = User(email="admin@example.de", password_hash="x", role="admin")
+    db.add(user)
+    db.commit()
+    return user
+
+
+def test_stream_token_only_valid_for_its_scope(db, admin):
+    token = create_stream_token(admin.email, "live-status")
+
+    assert user_from_token(db, token, "live-status").id == admin.id
+    for scope in (None, "anderer-stream"):
+        with pytest.raises(HTTPException) as error:
+            user_from_token(db, token, scope)
+        assert error.value.status_code == 401
+
+
+def test_login_token_not_accepted_as_stream_token(db, admin):
+    token = create_access_token({"sub": admin.email})
+
+    assert user_from_token(db, token).id == admin.id
+    with pytest.raises(HTTPException):
+        user_from_token(db, token, "live-status")
@@ -10,9 +10,15 @@ const HistoryTab = () => {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const [dateFilter, setDateFilter] = useState('30days'); // 30days, 7days, thisMonth, lastMonth, all
+  const [loadingMore, setLoadingMore] = useState(false);
 
-  const fetchHistory = async () => {
-    setLoading(true);
+  // cursor = next_cursor der letzten Seite; ohne cursor wird neu geladen
+  const fetchHistory = async (cursor = null) => {
+    if (cursor) {
+      setLoadingMore(true);
+    } else {
+      setLoading(true);
+    }
     try {
       const token = localStorage.getItem('token');
       let url = `https://192.168.178.87:8001/api/v1/reports/my/history`;
@@ -43,13 +49,18 @@ const HistoryTab = () => {
           break;
         
         case 'all':
-          // Keine Parameter = alle Daten
+          // Maximaler Zeitraum der API, wird seitenweise nachgeladen
+          params.append('days', '365');
           break;
         
         default:
           params.append('days', '30');
       }
       
+      if (cursor) {
+        params.append('cursor', cursor);
+      }
+      
       if (params.toString()) {
         url += `?${params.toString()}`;
       }
@@ -58,13 +69,23 @@ const HistoryTab = () => {
         headers: { Authorization: `Bearer ${token}` }
       });
       
-      setHistory(response.data);
+      if (cursor) {
+        // Weitere Seite anhängen, Summen stammen von der ersten Seite
+        setHistory(prev => ({
+          ...prev,
+          entries: [...prev.entries, ...response.data.entries],
+          next_cursor: response.data.next_cursor
+        }));
+      } else {
+        setHistory(response.data);
+      }
       setError(null);
     } catch (err) {
       setError('Fehler beim Laden der Historie');
       console.error(err);
     } finally {
       setLoading(false);
+      setLoadingMore(false);
     }
   };
 
@@ -153,8 +174,9 @@ const HistoryTab = () => {
 
   // Daten vorbereiten - entweder entries array oder direkt das array
   const entries = history?.entries || history || [];
-  const totalHours = entries.reduce((sum, entry) => sum + (entry.hours || entry.total_hours || 0), 0);
-  const totalAmount = entries.reduce((sum, entry) => sum + (entry.amount || (entry.total_hours * entry.hourly_rate) || 0), 0);
+  // Summen über den ganzen Zeitraum liefert die API (nicht nur die geladenen Seiten)
+  const totalHours = history?.total_hours ?? entries.reduce((sum, entry) => sum + (entry.hours || entry.total_hours || 0), 0);
+  const totalAmount = history?.total_amount ?? entries.reduce((sum, entry) => sum + (entry.amount || (entry.total_hours * entry.hourly_rate) || 0), 0);
 
   return (
     <div className="space-y-6">
@@ -343,6 +365,19 @@ const HistoryTab = () => {
           )}
         </div>
       </div>
+
+      {/* Weitere Einträge seitenweise nachladen */}
+      {history?.next_cursor && (
+        <div className="flex justify-center">
+          <button
+            onClick={() => fetchHistory(history.next_cursor)}
+            disabled={loadingMore}
+            className="px-4 py-2 rounded-lg text-sm font-medium bg-gray-100 text-gray-700 hover:bg-gray-200 disabled:opacity-50"
+          >
+            {loadingMore ? 'Lädt...' : `Weitere laden${history.total_entries ? ` (${entries.length} von ${history.total_entries})` : ''}`}
+          </button>
+        </div>
+      )}
     </div>
   );
 };
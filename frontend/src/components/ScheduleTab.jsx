@@ -253,6 +253,8 @@ const ScheduleTab = () => {
               <li key={i}>
                 • {conflict.type === 'zeitüberschneidung' 
                     ? `${conflict.employee} hat überlappende Schichten am ${conflict.weekday}`
+                    : conflict.type === 'fahrzeit'
+                    ? `${conflict.employee} schafft den Objektwechsel am ${conflict.weekday} nicht (${conflict.gap_minutes} statt ${conflict.travel_minutes} Min.)`
                     : `${conflict.object} hat keine Zuweisung am ${conflict.weekday}`}
               </li>
             ))}
@@ -14,16 +14,13 @@ const AdminDashboard = () => {
   const [loading, setLoading] = useState(true);
   const [customers, setCustomers] = useState([]);
   
-  const [liveStatus, setLiveStatus] = useState([
-    { employee_name: 'Max Mustermann', object_name: 'Sparkasse Rastatt', check_in_time: '08:15', work_hours: '2.5', is_paused: false },
-    { employee_name: 'Anna Schmidt', object_name: 'Rathaus Gaggenau', check_in_time: '07:30', work_hours: '3.2', is_paused: false }
-  ]);
+  const [liveStatus, setLiveStatus] = useState([]);
   const [stats, setStats] = useState({
-    active_employees: 2,
+    active_employees: 0,
     paused_employees: 0,
-    offline_employees: 8,
-    total_employees: 10,
-    total_hours_today: 5.7
+    offline_employees: 0,
+    total_employees: 0,
+    total_hours_today: 0
   });
   
   // Modal States
@@ -117,15 +114,53 @@ useEffect(() => {
       })
       .catch(error => console.error('Fehler:', error));
   }, []);
+  // Live-Status per Server-Sent Events: erst Snapshot, dann nur Änderungen
   useEffect(() => {
-    // Simuliere Live-Updates
-    const interval = setInterval(() => {
-      setStats(prev => ({
-        ...prev,
-        total_hours_today: prev.total_hours_today + 0.1
-      }));
-    }, 30000);
-    return () => clearInterval(interval);
+    let source = null;
+    let retry = null;
+    let closed = false;
+
+    const connect = async () => {
+      try {
+        // Kurzlebiges Stream-Token statt des Login-Tokens in der URL (Access-Logs)
+        const response = await api.post('/admin/live-status/stream-token');
+        if (closed) return;
+        source = new EventSource(`${api.defaults.baseURL}/admin/live-status/stream?token=${encodeURIComponent(response.data.token)}`);
+      } catch (error) {
+        if (!closed) retry = setTimeout(connect, 5000);
+        return;
+      }
+
+      source.addEventListener('snapshot', (event) => {
+        const data = JSON.parse(event.data);
+        setLiveStatus(data.entries);
+        setStats(data.stats);
+      });
+
+      source.addEventListener('update', (event) => {
+        const data = JSON.parse(event.data);
+        setLiveStatus(prev => {
+          const changed = new Set(data.changes.map(change => change.employee_id));
+          const next = prev.filter(entry => !changed.has(entry.employee_id));
+          data.changes.forEach(change => change.entry && next.push(change.entry));
+          return next.sort((a, b) => a.check_in.localeCompare(b.check_in));
+        });
+        setStats(data.stats);
+      });
+
+      // Bei Abbruch ist das Stream-Token evtl. abgelaufen: mit neuem Token neu verbinden (neuer Snapshot)
+      source.onerror = () => {
+        source.close();
+        if (!closed) retry = setTimeout(connect, 3000);
+      };
+    };
+
+    connect();
+    return () => {
+      closed = true;
+      clearTimeout(retry);
+      if (source) source.close();
+    };
   }, []);
 
   const showToast = (message, type = 'success') => {
@@ -618,7 +653,7 @@ const handleSaveEmployee = async () => {
       <div className="p-6 border-b">
         <h2 className="text-xl font-bold">Live-Übersicht</h2>
         <p className="text-sm text-gray-600 mt-1">
-          Aktueller Status aller Mitarbeiter - Aktualisiert alle 30 Sekunden
+          Aktueller Status aller Mitarbeiter - Live aktualisiert
         </p>
       </div>
       